@@ -10,8 +10,10 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.0/ref/settings/
 """
 
+import os
 from pathlib import Path
 from datetime import timedelta
+from django.core.exceptions import ImproperlyConfigured
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -49,7 +51,9 @@ REST_FRAMEWORK = {
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "PAGE_SIZE": 6,
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        # Construit l'utilisateur à partir des claims du jeton ; remplaçable par
+        # "rest_framework_simplejwt.authentication.JWTAuthentication" pour charger l'utilisateur à chaque requête.
+        "authentication.authentication.StatelessJWTAuthentication",
         "rest_framework.authentication.SessionAuthentication",
     ),
     'DEFAULT_PERMISSION_CLASSES': (
@@ -59,6 +63,8 @@ REST_FRAMEWORK = {
 
 
 MIDDLEWARE = [
+    'project.instrumentation.PerformanceMiddleware',
+    'project.query_detector.QueryDetectorMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -120,6 +126,38 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 
+# Hachage des mots de passe : le hacheur du profil choisi sert aux nouveaux mots de passe, et les mots de passe
+# hachés autrement sont réhachés à la connexion suivante. Les autres hacheurs restent acceptés en vérification.
+PASSWORD_HASHER_PROFILES = {
+    'pbkdf2': 'authentication.hashers.TunedPBKDF2PasswordHasher',
+    'scrypt': 'authentication.hashers.TunedScryptPasswordHasher',
+    'argon2': 'authentication.hashers.TunedArgon2PasswordHasher',  # nécessite argon2-cffi
+}
+PASSWORD_HASHER_PROFILE = os.environ.get('PASSWORD_HASHER_PROFILE', 'pbkdf2')
+if PASSWORD_HASHER_PROFILE not in PASSWORD_HASHER_PROFILES:
+    raise ImproperlyConfigured(
+        f"PASSWORD_HASHER_PROFILE inconnu : {PASSWORD_HASHER_PROFILE!r}. "
+        f"Valeurs possibles : {', '.join(PASSWORD_HASHER_PROFILES)}."
+    )
+PASSWORD_HASHERS = [PASSWORD_HASHER_PROFILES[PASSWORD_HASHER_PROFILE]] + [
+    path for name, path in PASSWORD_HASHER_PROFILES.items() if name != PASSWORD_HASHER_PROFILE
+] + [
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+]
+
+# Coût de chaque hacheur (valeurs par défaut de Django). `python manage.py benchmark_login` mesure son effet.
+PASSWORD_HASHER_COST = {
+    'pbkdf2_iterations': 720_000,
+    'scrypt_work_factor': 2 ** 14,
+    'scrypt_block_size': 8,
+    'scrypt_parallelism': 1,
+    'argon2_time_cost': 2,
+    'argon2_memory_cost': 102_400,
+    'argon2_parallelism': 8,
+}
+
+
 # Internationalization
 # https://docs.djangoproject.com/en/5.0/topics/i18n/
 
@@ -147,7 +185,51 @@ AUTH_USER_MODEL = "authentication.CustomUser"
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=60),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=30),
+    "TOKEN_OBTAIN_SERIALIZER": "authentication.serializers.ClaimsTokenObtainPairSerializer",
 }
 
+# Durée (en secondes) du cache de la version des jetons de chaque utilisateur, vérifiée à chaque requête
+# par StatelessJWTAuthentication. C'est aussi le délai maximal de révocation dans les autres processus.
+TOKEN_VERSION_CACHE_TIMEOUT = 60
+
 
 LOGIN_REDIRECT_URL = '/api/projects/'
+
+# Instrumentation des requêtes (project.instrumentation.PerformanceMiddleware) : SERVER_TIMING ajoute
+# l'en-tête `Server-Timing` (durées totale, SQL et de sérialisation) à chaque réponse.
+PERF_INSTRUMENTATION = {
+    'SERVER_TIMING': False,
+}
+
+# Détecteur de requêtes SQL répétées (N+1) et lentes, par requête HTTP (project.query_detector).
+# À activer en recette ; les tests l'activent via QueryDetectorTestMixin.
+QUERY_DETECTOR = {
+    'ENABLED': False,
+    'N_PLUS_ONE_THRESHOLD': 3,
+    'SLOW_QUERY_MS': 100,
+}
+
+# Durée (en secondes) du cache inter-requêtes des rôles (utilisateur, projet). 0 le désactive.
+MEMBERSHIP_CACHE_TIMEOUT = 0
+
+# Cache des réponses du détail des projets et de la liste des issues, invalidé par les signaux des modèles.
+# Backends : project.response_cache.LocMemResponseCache (un processus)
+# ou project.response_cache.FileResponseCache (OPTIONS : location, max_entries ; partagé entre processus).
+# timeout (en secondes, None : pas d'expiration) borne la durée pendant laquelle un autre processus sert
+# une réponse invalidée dans celui qui a écrit.
+RESPONSE_CACHE = {
+    'BACKEND': 'project.response_cache.LocMemResponseCache',
+    'OPTIONS': {'max_entries': 1000, 'timeout': 60},
+}
+
+# Rétention (en jours) du journal des modifications des projets (/api/projects/<id>/changes/), appliquée par
+# la commande compact_changes. Un client dont le jeton est plus ancien doit refaire une synchronisation complète.
+CHANGE_LOG_RETENTION_DAYS = 30
+
+# Diffusion des événements des issues et commentaires aux flux server-sent events (/api/async/projects/<id>/events/).
+# Backends : project.events.InProcessBroker (abonnés du même processus)
+# ou project.events.LocalBroker (remplaçant local d'un broker externe : messages encodés, remis par un thread).
+EVENT_BROKER = {
+    'BACKEND': 'project.events.InProcessBroker',
+    'OPTIONS': {},
+}
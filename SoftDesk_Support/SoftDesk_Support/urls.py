@@ -17,7 +17,24 @@ from project.views import (
      ProjectDetailViewSet,
      ContributorViewSet,
      IssueViewSet,
-     CommentViewSet
+     CommentViewSet,
+     ProjectExportView,
+     ProjectStatsView,
+     ProjectChangesView,
+     UserIssueListView,
+     UserCommentListView,
+     SearchView,
+     ResponseCacheStatsView,
+     PerformanceStatsView
+)
+from project.async_views import (
+     AsyncProjectListView,
+     AsyncProjectDetailView,
+     AsyncIssueListView,
+     AsyncIssueDetailView,
+     AsyncCommentListView,
+     AsyncCommentDetailView,
+     AsyncProjectEventsView
 )
 from django.contrib.auth.views import LogoutView
 
@@ -57,6 +74,8 @@ urlpatterns = [
     # Issue URLs
     path('api/projects/<str:project_id>/issues/',
          IssueViewSet.as_view({'get': 'list', 'post': 'create'}), name='issues'),
+    path('api/projects/<str:project_id>/issues/bulk/',
+         IssueViewSet.as_view({'post': 'bulk_create', 'patch': 'bulk_update'}), name='issues-bulk'),
     path('api/projects/<str:project_id>/issues/<int:issue_id>/', IssueViewSet.as_view({
         'get': 'retrieve', 'put': 'update', 'patch': 'partial_update', 'delete': 'destroy'}), name='issue'),
 
@@ -66,6 +85,41 @@ urlpatterns = [
     path('api/projects/<str:project_id>/issues/<int:issue_id>/comments/<str:comment_id>/', CommentViewSet.as_view({
          'get': 'retrieve', 'put': 'update', 'patch': 'partial_update', 'delete': 'destroy'}), name='comment'),
 
+    # Export URLs
+    path('api/projects/<str:project_id>/export/<str:export_format>/',
+         ProjectExportView.as_view(), name='project-export'),
+
+    # Current user URLs
+    path('api/me/issues/', UserIssueListView.as_view(), name='my-issues'),
+    path('api/me/comments/', UserCommentListView.as_view(), name='my-comments'),
+
+    # Stats URLs
+    path('api/projects/<str:project_id>/stats/', ProjectStatsView.as_view(), name='project-stats'),
+
+    # Change feed URLs
+    path('api/projects/<str:project_id>/changes/', ProjectChangesView.as_view(), name='project-changes'),
+
+    # Search URLs
+    path('api/search/', SearchView.as_view(), name='search'),
+
+    # Cache URLs
+    path('api/cache/stats/', ResponseCacheStatsView.as_view(), name='cache-stats'),
+
+    # Performance URLs
+    path('api/perf/stats/', PerformanceStatsView.as_view(), name='perf-stats'),
+
+    # Async (ASGI) read URLs
+    path('api/async/projects/', AsyncProjectListView.as_view(), name='async-projects'),
+    path('api/async/projects/<str:project_id>/', AsyncProjectDetailView.as_view(), name='async-project'),
+    path('api/async/projects/<str:project_id>/issues/', AsyncIssueListView.as_view(), name='async-issues'),
+    path('api/async/projects/<str:project_id>/issues/<int:issue_id>/',
+         AsyncIssueDetailView.as_view(), name='async-issue'),
+    path('api/async/projects/<str:project_id>/issues/<int:issue_id>/comments/',
+         AsyncCommentListView.as_view(), name='async-comments'),
+    path('api/async/projects/<str:project_id>/issues/<int:issue_id>/comments/<str:comment_id>/',
+         AsyncCommentDetailView.as_view(), name='async-comment'),
+    path('api/async/projects/<str:project_id>/events/', AsyncProjectEventsView.as_view(), name='async-project-events'),
+
     path('', include(router.urls)),
 ]
 
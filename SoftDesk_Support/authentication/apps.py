@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class AuthenticationConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'authentication'
+
+    def ready(self):
+        import authentication.hashers  # Import nécessaire pour que la vérification système soit enregistrée
+        import authentication.signals  # Import nécessaire pour que les signaux soient enregistrés
@@ -0,0 +1,18 @@
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings
+from .tokens import TOKEN_VERSION_CLAIM, get_token_version, token_user
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    """
+    Authentification JWT sans chargement de l'utilisateur : il est construit à partir des claims du jeton,
+    après vérification de la version des jetons (mise en cache).
+
+    Les jetons émis sans ces claims sont authentifiés comme par JWTAuthentication, en chargeant l'utilisateur.
+    """
+
+    def get_user(self, validated_token):
+        if TOKEN_VERSION_CLAIM not in validated_token:
+            return super().get_user(validated_token)
+        user_id = validated_token[api_settings.USER_ID_CLAIM]
+        return token_user(validated_token, get_token_version(user_id))
@@ -0,0 +1,75 @@
+from django.conf import settings
+from django.contrib.auth.hashers import Argon2PasswordHasher, PBKDF2PasswordHasher, ScryptPasswordHasher, get_hasher
+from django.core.checks import Error, register
+
+
+def hasher_cost(name, default):
+    """
+    Retourne un paramètre de coût du réglage PASSWORD_HASHER_COST, ou la valeur par défaut de Django.
+    """
+    return getattr(settings, 'PASSWORD_HASHER_COST', {}).get(name, default)
+
+
+class TunedPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """
+    PBKDF2-SHA256 dont le nombre d'itérations est lu dans PASSWORD_HASHER_COST['pbkdf2_iterations'].
+    """
+
+    @property
+    def iterations(self):
+        return hasher_cost('pbkdf2_iterations', PBKDF2PasswordHasher.iterations)
+
+
+class TunedScryptPasswordHasher(ScryptPasswordHasher):
+    """
+    scrypt dont les paramètres sont lus dans PASSWORD_HASHER_COST['scrypt_*'].
+    """
+
+    @property
+    def work_factor(self):
+        return hasher_cost('scrypt_work_factor', ScryptPasswordHasher.work_factor)
+
+    @property
+    def block_size(self):
+        return hasher_cost('scrypt_block_size', ScryptPasswordHasher.block_size)
+
+    @property
+    def parallelism(self):
+        return hasher_cost('scrypt_parallelism', ScryptPasswordHasher.parallelism)
+
+
+class TunedArgon2PasswordHasher(Argon2PasswordHasher):
+    """
+    Argon2id dont les paramètres sont lus dans PASSWORD_HASHER_COST['argon2_*'] (nécessite argon2-cffi).
+    """
+
+    @property
+    def time_cost(self):
+        return hasher_cost('argon2_time_cost', Argon2PasswordHasher.time_cost)
+
+    @property
+    def memory_cost(self):
+        return hasher_cost('argon2_memory_cost', Argon2PasswordHasher.memory_cost)
+
+    @property
+    def parallelism(self):
+        return hasher_cost('argon2_parallelism', Argon2PasswordHasher.parallelism)
+
+
+@register()
+def check_preferred_hasher(app_configs, **kwargs):
+    """
+    Vérifie que la bibliothèque du hacheur préféré est installée, pour ne pas échouer à la première connexion.
+    """
+    hasher = get_hasher('default')
+    if hasher.library:
+        try:
+            hasher._load_library()
+        except ValueError as exc:
+            profile = getattr(settings, 'PASSWORD_HASHER_PROFILE', '')
+            return [Error(
+                f"Le profil de hachage '{profile}' est inutilisable : {exc}",
+                hint="Installer la bibliothèque manquante ou choisir un autre PASSWORD_HASHER_PROFILE.",
+                id='authentication.E001',
+            )]
+    return []
@@ -0,0 +1,76 @@
+import os
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext, override_settings
+from authentication.models import CustomUser
+from authentication.serializers import LoginSerializer
+from authentication.tokens import issue_tokens
+
+PASSWORD = 'Benchmark-Pa55word!'
+
+
+class Command(BaseCommand):
+    """
+    Mesure le coût d'une connexion (vérification du mot de passe et émission des jetons) pour chaque profil
+    de hachage, pour dimensionner la capacité de connexion.
+
+    L'utilisateur de test est créé dans une transaction annulée à la fin : la base n'est pas modifiée.
+    """
+    help = "Mesure le débit de connexion par profil de hachage des mots de passe."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--count', type=int, default=20, help="Nombre de connexions mesurées par profil.")
+        parser.add_argument('--profile', action='append', dest='profiles',
+                            help="Profil à mesurer (répétable). Par défaut : tous les profils configurés.")
+
+    def handle(self, *args, **options):
+        profiles = options['profiles'] or list(settings.PASSWORD_HASHER_PROFILES)
+        cores = os.cpu_count() or 1
+        self.stdout.write(
+            f"{'profil':<8} {'ms/connexion':>13} {'requêtes':>9} {'connexions/s/cœur':>18} "
+            f"{f'connexions/s ({cores} cœurs)':>24}"
+        )
+        for profile in profiles:
+            hashers = [settings.PASSWORD_HASHER_PROFILES[profile]] + [
+                path for path in settings.PASSWORD_HASHERS if path != settings.PASSWORD_HASHER_PROFILES[profile]
+            ]
+            with override_settings(PASSWORD_HASHERS=hashers):
+                try:
+                    elapsed, queries = self.measure(options['count'])
+                except ValueError as exc:
+                    self.stdout.write(self.style.WARNING(f"{profile:<8} ignoré : {exc}"))
+                    continue
+            per_login = elapsed / options['count']
+            self.stdout.write(
+                f"{profile:<8} {per_login * 1000:>13.1f} {queries:>9} {1 / per_login:>18.1f} "
+                f"{cores / per_login:>24.1f}"
+            )
+        self.stdout.write(self.style.SUCCESS(
+            "Les hacheurs libèrent le GIL : le débit estimé suppose un worker par cœur, sans autre charge."
+        ))
+
+    def measure(self, count):
+        """
+        Retourne la durée totale de `count` connexions et le nombre de requêtes SQL d'une connexion.
+        """
+        with transaction.atomic():
+            user = CustomUser(username='benchmark_login', date_of_birth='1990-01-01')
+            user.set_password(PASSWORD)
+            user.save()
+            data = {'username': user.username, 'password': PASSWORD}
+
+            start = time.perf_counter()
+            for _ in range(count):
+                serializer = LoginSerializer(data=data)
+                serializer.is_valid(raise_exception=True)
+                issue_tokens(serializer.validated_data['user'])
+            elapsed = time.perf_counter() - start
+
+            with CaptureQueriesContext(connection) as queries:
+                serializer = LoginSerializer(data=data)
+                serializer.is_valid(raise_exception=True)
+                issue_tokens(serializer.validated_data['user'])
+            transaction.set_rollback(True)
+        return elapsed, len(queries)
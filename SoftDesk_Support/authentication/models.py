@@ -51,3 +51,8 @@ class CustomUser(AbstractUser):
         default=timezone.now,
         verbose_name="date de création"
     )
+
+    token_version = models.PositiveIntegerField(
+        default=0,
+        verbose_name="version des jetons"
+    )
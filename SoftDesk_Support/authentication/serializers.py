@@ -1,6 +1,8 @@
 from .models import CustomUser
 from rest_framework import serializers
 from django.contrib.auth import authenticate
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from .tokens import ClaimsRefreshToken
 
 
 class CustomUserListSerializer(serializers.ModelSerializer):
@@ -88,4 +90,11 @@ class RegisterSerializer(serializers.ModelSerializer):
             can_be_contacted=validated_data['can_be_contacted'],
             can_data_be_shared=validated_data['can_data_be_shared']
         )
-        return user
\ No newline at end of file
+        return user
+
+
+class ClaimsTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """
+    Serializer de /api/token/ : émet les mêmes jetons que LoginView, avec les claims de ClaimsRefreshToken.
+    """
+    token_class = ClaimsRefreshToken
@@ -0,0 +1,40 @@
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+from .models import CustomUser
+from .tokens import TOKEN_CLAIM_FIELDS, forget_token_version, revoke_tokens
+
+# Champs dont la modification révoque les jetons de l'utilisateur.
+TOKEN_REVOKING_FIELDS = (*TOKEN_CLAIM_FIELDS, 'is_active')
+
+
+@receiver(pre_save, sender=CustomUser)
+def detect_token_revocation(sender, instance, update_fields=None, **kwargs):
+    """
+    Repère les modifications qui invalident les jetons déjà émis : nouveau mot de passe (set_password,
+    mais pas le réhachage fait à la connexion) ou changement d'un champ embarqué dans les jetons.
+    """
+    instance._revoke_tokens = False
+    if instance._state.adding or instance.pk is None:
+        return
+    if instance._password is not None:
+        instance._revoke_tokens = True
+        return
+    if update_fields is not None and not set(update_fields) & set(TOKEN_REVOKING_FIELDS):
+        return
+    current = CustomUser.objects.filter(pk=instance.pk).values(*TOKEN_REVOKING_FIELDS).first()
+    instance._revoke_tokens = current is not None and any(
+        current[field] != getattr(instance, field) for field in TOKEN_REVOKING_FIELDS
+    )
+
+
+@receiver(post_save, sender=CustomUser)
+def revoke_user_tokens(sender, instance, **kwargs):
+    if getattr(instance, '_revoke_tokens', False):
+        revoke_tokens(instance.pk)
+        instance.refresh_from_db(fields=['token_version'])
+        instance._revoke_tokens = False
+
+
+@receiver(post_delete, sender=CustomUser)
+def forget_deleted_user_tokens(sender, instance, **kwargs):
+    forget_token_version(instance.pk)
@@ -1,3 +1,129 @@
-from django.test import TestCase
+from django.conf import settings
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+from .authentication import StatelessJWTAuthentication
+from .models import CustomUser
+from .tokens import issue_tokens, revoke_tokens
 
-# Create your tests here.
+PASSWORD = 'S3cret-password!'
+FAST_COST = {
+    'pbkdf2_iterations': 1000,
+    'scrypt_work_factor': 2 ** 8,
+    'scrypt_block_size': 8,
+    'scrypt_parallelism': 1,
+}
+
+
+def profile_hashers(profile):
+    """
+    Retourne PASSWORD_HASHERS avec le hacheur du profil en tête.
+    """
+    preferred = settings.PASSWORD_HASHER_PROFILES[profile]
+    return [preferred] + [path for path in settings.PASSWORD_HASHERS if path != preferred]
+
+
+@override_settings(PASSWORD_HASHERS=profile_hashers('pbkdf2'), PASSWORD_HASHER_COST=FAST_COST)
+class LoginTests(APITestCase):
+    """
+    Connexion : une seule requête SQL, et réhachage transparent lorsque le profil de hachage change.
+    """
+
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(username='user', password=PASSWORD, date_of_birth='1990-01-01')
+
+    def login(self):
+        return self.client.post(reverse('login-list'), {'username': 'user', 'password': PASSWORD})
+
+    def test_login_issues_tokens_with_a_single_query(self):
+        with self.assertNumQueries(1):
+            response = self.login()
+        self.assertEqual(response.status_code, 303)
+        self.assertEqual(AccessToken(response.data['access'])['user_id'], self.user.id)
+
+    def test_login_rehashes_password_for_new_profile(self):
+        self.assertTrue(self.user.password.startswith('pbkdf2_sha256$1000$'))
+        with override_settings(PASSWORD_HASHERS=profile_hashers('scrypt')):
+            with self.assertNumQueries(2):
+                self.assertEqual(self.login().status_code, 303)
+            self.user.refresh_from_db()
+            self.assertTrue(self.user.password.startswith('scrypt$'))
+            with self.assertNumQueries(1):
+                self.assertEqual(self.login().status_code, 303)
+
+    def test_login_rehashes_password_for_new_cost(self):
+        with override_settings(PASSWORD_HASHER_COST={**FAST_COST, 'pbkdf2_iterations': 2000}):
+            self.assertEqual(self.login().status_code, 303)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith('pbkdf2_sha256$2000$'))
+
+    def test_wrong_password_is_rejected(self):
+        response = self.client.post(reverse('login-list'), {'username': 'user', 'password': 'wrong'})
+        self.assertEqual(response.status_code, 400)
+
+
+@override_settings(PASSWORD_HASHERS=profile_hashers('pbkdf2'), PASSWORD_HASHER_COST=FAST_COST)
+class StatelessAuthenticationTests(APITestCase):
+    """
+    L'utilisateur est construit à partir des claims du jeton, et les jetons révoqués sont refusés.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.user = CustomUser.objects.create_user(username='user', password=PASSWORD, date_of_birth='1990-01-01')
+        self.url = reverse('users')
+
+    def get(self, access):
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {access}')
+        return self.client.get(self.url)
+
+    def test_claims_token_skips_user_query(self):
+        access = issue_tokens(self.user)['access']
+        self.assertEqual(self.get(access).status_code, 200)  # Version des jetons mise en cache.
+        with self.assertNumQueries(2):
+            self.assertEqual(self.get(access).status_code, 200)
+        # Un jeton sans claims charge l'utilisateur.
+        with self.assertNumQueries(3):
+            self.assertEqual(self.get(AccessToken.for_user(self.user)).status_code, 200)
+
+    def test_token_user_loads_full_model_on_demand(self):
+        token = AccessToken(issue_tokens(self.user)['access'])
+        authentication = StatelessJWTAuthentication()
+        authentication.get_user(token)
+        with self.assertNumQueries(0):
+            user = authentication.get_user(token)
+            self.assertEqual((user.pk, user.username, user.is_staff), (self.user.pk, 'user', False))
+            self.assertEqual(user, self.user)
+        with self.assertNumQueries(1):
+            self.assertEqual(str(user.date_of_birth), '1990-01-01')
+
+    def test_tokens_are_revoked(self):
+        access = issue_tokens(self.user)['access']
+        self.assertEqual(self.get(access).status_code, 200)
+        revoke_tokens(self.user.pk)
+        self.assertEqual(self.get(access).status_code, 401)
+
+    def test_password_and_claim_changes_revoke_tokens(self):
+        for change in ('password', 'is_staff'):
+            with self.subTest(change=change):
+                self.user.refresh_from_db()
+                access = issue_tokens(self.user)['access']
+                self.assertEqual(self.get(access).status_code, 200)
+                if change == 'password':
+                    self.user.set_password('N3w-password!')
+                else:
+                    self.user.is_staff = True
+                self.user.save()
+                self.assertEqual(self.get(access).status_code, 401)
+
+    def test_login_rehash_and_unrelated_changes_keep_tokens(self):
+        access = issue_tokens(self.user)['access']
+        with override_settings(PASSWORD_HASHERS=profile_hashers('scrypt')):
+            self.client.post(reverse('login-list'), {'username': 'user', 'password': PASSWORD})
+        self.user.refresh_from_db()
+        self.user.can_be_contacted = True
+        self.user.save()
+        self.assertTrue(self.user.password.startswith('scrypt$'))
+        self.assertEqual(self.get(access).status_code, 200)
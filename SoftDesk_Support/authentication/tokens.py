@@ -0,0 +1,117 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import router
+from django.db.models import F
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+from .models import CustomUser
+
+# Version des jetons de l'utilisateur, incrémentée pour révoquer tous ses jetons.
+TOKEN_VERSION_CLAIM = 'ver'
+# Champs embarqués dans les jetons : ils suffisent aux permissions de l'API.
+TOKEN_CLAIM_FIELDS = ('username', 'is_staff', 'is_superuser')
+
+
+class ClaimsRefreshToken(RefreshToken):
+    """
+    Jeton de rafraîchissement portant les champs de TOKEN_CLAIM_FIELDS et la version des jetons de l'utilisateur.
+    Le jeton d'accès dérivé en hérite.
+    """
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        for field in TOKEN_CLAIM_FIELDS:
+            token[field] = getattr(user, field)
+        token[TOKEN_VERSION_CLAIM] = user.token_version
+        return token
+
+
+def issue_tokens(user):
+    """
+    Émet le couple de jetons (refresh, access) d'un utilisateur déjà chargé, sans requête supplémentaire :
+    le jeton d'accès est dérivé du jeton de rafraîchissement.
+    """
+    refresh = ClaimsRefreshToken.for_user(user)
+    return {
+        'refresh': str(refresh),
+        'access': str(refresh.access_token),
+    }
+
+
+def _cache_timeout():
+    return getattr(settings, 'TOKEN_VERSION_CACHE_TIMEOUT', 60)
+
+
+def _version_key(user_id):
+    return f'auth:token_version:{user_id}'
+
+
+def _version_queryset(user_id):
+    return CustomUser.objects.filter(pk=user_id).values_list('token_version', flat=True)
+
+
+def get_token_version(user_id):
+    """
+    Retourne la version courante des jetons de l'utilisateur (None s'il n'existe plus),
+    mise en cache TOKEN_VERSION_CACHE_TIMEOUT secondes.
+    """
+    timeout = _cache_timeout()
+    version = cache.get(_version_key(user_id)) if timeout else None
+    if version is None:
+        version = _version_queryset(user_id).first()
+        if version is not None and timeout:
+            cache.set(_version_key(user_id), version, timeout)
+    return version
+
+
+async def aget_token_version(user_id):
+    """
+    Équivalent asynchrone de `get_token_version`.
+    """
+    timeout = _cache_timeout()
+    version = await cache.aget(_version_key(user_id)) if timeout else None
+    if version is None:
+        version = await _version_queryset(user_id).afirst()
+        if version is not None and timeout:
+            await cache.aset(_version_key(user_id), version, timeout)
+    return version
+
+
+def forget_token_version(user_id):
+    cache.delete(_version_key(user_id))
+
+
+def revoke_tokens(user_id):
+    """
+    Révoque tous les jetons émis pour l'utilisateur.
+
+    Le cache de la version n'est vidé que dans ce processus : avec un cache local, les autres processus
+    acceptent les anciens jetons au plus TOKEN_VERSION_CACHE_TIMEOUT secondes de plus.
+    """
+    CustomUser.objects.filter(pk=user_id).update(token_version=F('token_version') + 1)
+    forget_token_version(user_id)
+
+
+def token_user(validated_token, current_version):
+    """
+    Construit l'utilisateur d'un jeton portant les claims de ClaimsRefreshToken, sans requête.
+
+    L'instance est un CustomUser dont seuls les champs embarqués sont chargés : les autres champs sont différés
+    et lus en base au premier accès, lorsqu'une vue a besoin du modèle complet.
+    """
+    if current_version is None:
+        raise AuthenticationFailed("Utilisateur introuvable.", code='user_not_found')
+    if validated_token[TOKEN_VERSION_CLAIM] != current_version:
+        raise AuthenticationFailed("Ce jeton a été révoqué.", code='token_revoked')
+
+    claims = {
+        api_settings.USER_ID_FIELD: validated_token[api_settings.USER_ID_CLAIM],
+        'is_active': True,
+        'token_version': current_version,
+        **{field: validated_token[field] for field in TOKEN_CLAIM_FIELDS},
+    }
+    # from_db attend les valeurs dans l'ordre des champs du modèle.
+    fields = [field.attname for field in CustomUser._meta.concrete_fields if field.attname in claims]
+    return CustomUser.from_db(router.db_for_read(CustomUser), fields, [claims[name] for name in fields])
@@ -12,7 +12,7 @@ from .permissions import (
     IsAdmin,
     IsUser,
 )
-from rest_framework_simplejwt.tokens import RefreshToken
+from .tokens import issue_tokens
 from rest_framework.permissions import AllowAny
 from authentication.serializers import LoginSerializer, RegisterSerializer
 
@@ -33,12 +33,7 @@ class LoginView(viewsets.ViewSet):
     def create(self, request):
         serializer = LoginSerializer(data=request.data)
         if serializer.is_valid():
-            user = serializer.validated_data['user']
-            refresh = RefreshToken.for_user(user)
-            response = Response({
-                'refresh': str(refresh),
-                'access': str(refresh.access_token),
-            })
+            response = Response(issue_tokens(serializer.validated_data['user']))
             # Redirection après la connexion
             response['Location'] = '/api/projects/'
             response.status_code = status.HTTP_303_SEE_OTHER
@@ -51,12 +46,7 @@ class RegisterView(viewsets.ViewSet):
     def create(self, request):
         serializer = RegisterSerializer(data=request.data)
         if serializer.is_valid():
-            user = serializer.save()
-            refresh = RefreshToken.for_user(user)
-            response = Response({
-                'refresh': str(refresh),
-                'access': str(refresh.access_token),
-            }, status=status.HTTP_201_CREATED)
+            response = Response(issue_tokens(serializer.save()), status=status.HTTP_201_CREATED)
             # Redirection après l'inscription
             response['Location'] = '/api/projects/'
             response.status_code = status.HTTP_303_SEE_OTHER
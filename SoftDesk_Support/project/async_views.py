@@ -0,0 +1,276 @@
+import asyncio
+from asgiref.sync import sync_to_async
+from django.core.exceptions import ObjectDoesNotExist, ValidationError as DjangoValidationError
+from django.http import Http404, JsonResponse, StreamingHttpResponse
+from django.views import View
+from rest_framework.exceptions import (
+    APIException, AuthenticationFailed, NotAuthenticated, NotFound, PermissionDenied, ValidationError,
+)
+from rest_framework.filters import OrderingFilter
+from rest_framework.request import Request
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from authentication.models import CustomUser
+from authentication.tokens import TOKEN_VERSION_CLAIM, aget_token_version, token_user
+from .models import Project, Issue, Comment, ChangeHorizon
+from .changes import parse_object_id, read_changes
+from .events import EVENT_TYPES, event_message, format_event, hub
+from .serializers import ProjectListSerializer, ProjectSerializer, IssueSerializer, CommentSerializer
+from .permissions import AsyncIsAuthenticated, AsyncIsContributor, AsyncIsContributorOrAdmin
+from .pagination import AsyncPageNumberPagination
+from .filters import IssueFilterBackend, get_requested_fields
+from .views import IssueViewSet, with_issue_read_relations
+
+
+async def aauthenticate(request):
+    """
+    Authentifie la requête sans bloquer : jeton JWT (utilisateur construit à partir des claims, ou lu avec l'ORM
+    asynchrone pour les jetons qui n'en portent pas), sinon session Django.
+    """
+    jwt_auth = JWTAuthentication()
+    header = jwt_auth.get_header(request)
+    raw_token = jwt_auth.get_raw_token(header) if header is not None else None
+    if raw_token is None:
+        return await request.auser()
+
+    token = jwt_auth.get_validated_token(raw_token)
+    try:
+        user_id = token[jwt_settings.USER_ID_CLAIM]
+    except KeyError:
+        raise NotAuthenticated("Le jeton ne contient pas d'identifiant d'utilisateur reconnaissable.")
+    if TOKEN_VERSION_CLAIM in token:
+        return token_user(token, await aget_token_version(user_id))
+    user = await CustomUser.objects.filter(**{jwt_settings.USER_ID_FIELD: user_id}).afirst()
+    if user is None or not user.is_active:
+        raise NotAuthenticated("Utilisateur introuvable ou inactif.")
+    return user
+
+
+class AsyncAPIView(View):
+    """
+    Vue de lecture asynchrone pour le point d'entrée ASGI.
+
+    Authentification, permissions, requêtes et pagination passent par l'ORM asynchrone ; les serializers
+    ne reçoivent que des objets déjà chargés. Les réponses ont le même format que les vues DRF synchrones.
+    """
+    http_method_names = ['get', 'head', 'options']
+    permission_classes = [AsyncIsAuthenticated]
+
+    async def get(self, request, *args, **kwargs):
+        try:
+            user = await aauthenticate(request)
+            self.request = Request(request)
+            self.request.user = user
+            await self.check_permissions(self.request)
+            return await self.get_response(self.request, *args, **kwargs)
+        except (Http404, ObjectDoesNotExist, DjangoValidationError):
+            return self.handle_exception(NotFound())
+        except APIException as exc:
+            return self.handle_exception(exc)
+
+    async def get_response(self, request, *args, **kwargs):
+        data = await self.get_data(request, *args, **kwargs)
+        return JsonResponse(data, safe=False, json_dumps_params={'ensure_ascii': False})
+
+    async def check_permissions(self, request):
+        for permission in self.permission_classes:
+            if not await permission().has_permission(request, self):
+                if not request.user.is_authenticated:
+                    raise NotAuthenticated()
+                raise PermissionDenied()
+
+    async def get_data(self, request, *args, **kwargs):
+        raise NotImplementedError
+
+    def handle_exception(self, exc):
+        detail = exc.detail if isinstance(exc.detail, (list, dict)) else {'detail': exc.detail}
+        response = JsonResponse(detail, status=exc.status_code, safe=False)
+        if isinstance(exc, (NotAuthenticated, AuthenticationFailed)):
+            response['WWW-Authenticate'] = 'Bearer realm="api"'
+        return response
+
+    async def paginate(self, request, queryset, serializer_class):
+        paginator = AsyncPageNumberPagination()
+        page = await paginator.apaginate_queryset(queryset, request)
+        serializer = serializer_class(page, many=True, context={'request': request})
+        return paginator.get_paginated_data(serializer.data)
+
+
+class AsyncProjectListView(AsyncAPIView):
+    """
+    Liste asynchrone des projets.
+    """
+
+    async def get_data(self, request):
+        queryset = (
+            Project.objects.all()
+            .select_related('author')
+            .prefetch_related('contributors')
+            .order_by('-created_time')
+        )
+        return await self.paginate(request, queryset, ProjectListSerializer)
+
+
+class AsyncProjectDetailView(AsyncAPIView):
+    """
+    Détail asynchrone d'un projet, avec le nombre d'issues et l'aperçu de leurs titres.
+    """
+    permission_classes = [AsyncIsContributorOrAdmin]
+
+    async def get_data(self, request, project_id):
+        project = await (
+            Project.objects
+            .select_related('author')
+            .prefetch_related('contributors')
+            .aget(project_id=project_id)
+        )
+        serializer = ProjectSerializer(project, context={'request': request})
+        project.issue_titles_preview = [issue async for issue in serializer.get_issue_titles_queryset(project)]
+        return serializer.data
+
+
+class AsyncIssueListView(AsyncAPIView):
+    """
+    Liste asynchrone des issues d'un projet, avec les mêmes filtres, tris et champs que IssueViewSet.
+    """
+    permission_classes = [AsyncIsContributor]
+    filter_backends = [IssueFilterBackend, OrderingFilter]
+    ordering_fields = IssueViewSet.ordering_fields
+    ordering = IssueViewSet.ordering
+
+    async def get_data(self, request, project_id):
+        queryset = Issue.objects.filter(project_id=project_id)
+        for backend in self.filter_backends:
+            queryset = backend().filter_queryset(request, queryset, self)
+        queryset = with_issue_read_relations(queryset, get_requested_fields(request))
+        return await self.paginate(request, queryset, IssueSerializer)
+
+
+class AsyncIssueDetailView(AsyncAPIView):
+    """
+    Détail asynchrone d'une issue.
+    """
+    permission_classes = [AsyncIsContributor]
+
+    async def get_data(self, request, project_id, issue_id):
+        queryset = with_issue_read_relations(Issue.objects.all(), get_requested_fields(request))
+        issue = await queryset.aget(project_id=project_id, issue_id=issue_id)
+        return IssueSerializer(issue, context={'request': request}).data
+
+
+class AsyncCommentListView(AsyncAPIView):
+    """
+    Liste asynchrone des commentaires d'une issue.
+    """
+
+    async def get_data(self, request, project_id, issue_id):
+        queryset = Comment.objects.filter(issue_id=issue_id).order_by('created_time', 'pk')
+        return await self.paginate(request, queryset, CommentSerializer)
+
+
+class AsyncCommentDetailView(AsyncAPIView):
+    """
+    Détail asynchrone d'un commentaire.
+    """
+
+    async def get_data(self, request, project_id, issue_id, comment_id):
+        comment = await Comment.objects.aget(issue_id=issue_id, comment_id=comment_id)
+        return CommentSerializer(comment, context={'request': request}).data
+
+
+# Battement du flux d'événements, déposé dans la file de l'abonné.
+KEEPALIVE = object()
+
+
+class AsyncProjectEventsView(AsyncAPIView):
+    """
+    Flux server-sent events des issues et commentaires d'un projet : créations, modifications et suppressions,
+    poussées à la validation de leur transaction.
+
+    L'`id` de chaque événement est le jeton du journal des modifications : à la reconnexion (en-tête
+    `Last-Event-ID` ou `?last_event_id=`), les événements manqués sont rejoués depuis le journal, ou un événement
+    `reset` demande une resynchronisation complète s'ils n'y sont plus. Le flux est fermé après `?timeout=`
+    secondes (MAX_SECONDS au plus, 0 pour seulement rejouer) ; un abonné inactif ne coûte qu'une file
+    et une coroutine en attente, sans connexion à la base.
+    """
+    permission_classes = [AsyncIsContributor]
+    HEARTBEAT_SECONDS = 15
+    MAX_SECONDS = 300
+    RETRY_MS = 3000
+    REPLAY_MAX_EVENTS = 500
+
+    async def get_response(self, request, project_id):
+        last_token = self.get_int_param(request, 'last_event_id', request.headers.get('Last-Event-ID'))
+        timeout = self.get_int_param(request, 'timeout', self.MAX_SECONDS)
+        response = StreamingHttpResponse(
+            self.stream(project_id, last_token, min(timeout, self.MAX_SECONDS)),
+            content_type='text/event-stream',
+        )
+        response['Cache-Control'] = 'no-cache'
+        response['X-Accel-Buffering'] = 'no'
+        return response
+
+    def get_int_param(self, request, name, default):
+        value = request.query_params.get(name, default)
+        if value is None:
+            return None
+        try:
+            value = int(value)
+        except (TypeError, ValueError):
+            value = -1
+        if value < 0:
+            raise ValidationError({name: "Entier positif attendu."})
+        return value
+
+    def replay(self, project_id, since):
+        """
+        Événements postérieurs au jeton `since`, lus dans le journal des modifications ;
+        None s'ils n'y sont plus ou s'ils dépassent REPLAY_MAX_EVENTS.
+        """
+        if since < ChangeHorizon.current():
+            return None
+        changes, _, has_more = read_changes(project_id, since, self.REPLAY_MAX_EVENTS)
+        if has_more:
+            return None
+        return [
+            event_message(project_id, change['type'], parse_object_id(change['type'], change['id']),
+                          change['action'], change['token'])
+            for change in changes
+            if change['type'] in EVENT_TYPES
+        ]
+
+    async def stream(self, project_id, last_token, timeout):
+        # Abonné avant de rejouer le journal : rien n'est perdu entre les deux, les doublons sont écartés par jeton.
+        subscription = hub.subscribe(project_id)
+        timer = None
+        try:
+            yield f"retry: {self.RETRY_MS}\n\n"
+            if last_token is not None:
+                replayed = await sync_to_async(self.replay)(project_id, last_token)
+                if replayed is None:
+                    yield "event: reset\ndata: {}\n\n"
+                    return
+                for message in replayed:
+                    last_token = message['token']
+                    yield format_event(message)
+
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + timeout
+            while (remaining := deadline - loop.time()) > 0:
+                # Un simple minuteur dépose le battement dans la file : l'attente ne crée pas de tâche.
+                timer = loop.call_later(min(remaining, self.HEARTBEAT_SECONDS), subscription.put_nowait, KEEPALIVE)
+                message = await subscription.get()
+                timer.cancel()
+                if message is KEEPALIVE:
+                    yield ": keepalive\n\n"
+                    continue
+                if message is None:
+                    # Abonné trop lent : le client se reconnecte et rejoue depuis son dernier jeton.
+                    return
+                if last_token is None or message['token'] > last_token:
+                    last_token = message['token']
+                    yield format_event(message)
+        finally:
+            if timer is not None:
+                timer.cancel()
+            hub.unsubscribe(project_id, subscription)
@@ -0,0 +1,145 @@
+from django.db import transaction
+from django.db.models import Exists, Max, OuterRef
+from django.dispatch import Signal
+from .models import Project, Contributor, Issue, Comment, Change, ChangeHorizon
+
+# Modèle journalisé -> (type d'objet, champ de l'identifiant public exposé par l'API).
+CHANGE_TYPES = {
+    Project: ('project', 'project_id'),
+    Contributor: ('contributor', 'contributor'),
+    Issue: ('issue', 'issue_id'),
+    Comment: ('comment', 'comment_id'),
+}
+MODELS_BY_TYPE = {object_type: model for model, (object_type, _) in CHANGE_TYPES.items()}
+
+# Envoyé avec les entrées (`entries`) ajoutées au journal, par les signaux des modèles comme par les écritures
+# en masse.
+changes_recorded = Signal()
+
+
+def object_key(instance):
+    """
+    Retourne le type et l'identifiant public (en chaîne) d'un objet journalisé.
+    """
+    object_type, field_name = CHANGE_TYPES[type(instance)]
+    return object_type, str(getattr(instance, type(instance)._meta.get_field(field_name).attname))
+
+
+def parse_object_id(object_type, object_id):
+    """
+    Convertit un identifiant journalisé vers le type du champ public (entier pour les issues et contributeurs).
+    """
+    model = MODELS_BY_TYPE[object_type]
+    return model._meta.get_field(CHANGE_TYPES[model][1]).to_python(object_id)
+
+
+def change_project_id(instance):
+    """
+    Projet auquel rattacher un objet ; pour un commentaire, celui de son issue, chargée une seule fois
+    et gardée sur l'instance pour les autres receivers de la même sauvegarde.
+    """
+    if isinstance(instance, Project):
+        return instance.pk
+    if isinstance(instance, Comment):
+        try:
+            return instance.issue.project_id
+        except Issue.DoesNotExist:
+            return None
+    return instance.project_id
+
+
+def record_change(instance, action, project_id=None):
+    """
+    Journalise une modification de l'objet, dans le journal de son projet ou de `project_id` s'il est donné
+    (ancien projet d'une issue déplacée).
+    """
+    project_id = project_id or change_project_id(instance)
+    if project_id:
+        object_type, object_id = object_key(instance)
+        entry = Change.objects.create(
+            project_id=project_id, object_type=object_type, object_id=object_id, action=action
+        )
+        changes_recorded.send(sender=Change, entries=[entry])
+
+
+def record_changes(object_type, keys, action, batch_size=1000):
+    """
+    Journalise en masse les écritures qui n'émettent pas de signaux (bulk_create, update).
+    `keys` est une suite de couples (project_id, identifiant public).
+    """
+    entries = Change.objects.bulk_create(
+        [Change(project_id=project_id, object_type=object_type, object_id=str(object_id), action=action)
+         for project_id, object_id in keys],
+        batch_size=batch_size,
+    )
+    if entries:
+        changes_recorded.send(sender=Change, entries=entries)
+
+
+def head_token(project_id):
+    """
+    Jeton courant d'un projet : à demander avant un téléchargement complet, puis à présenter comme `since`.
+    """
+    latest = Change.objects.filter(project_id=project_id).aggregate(token=Max('id'))['token']
+    return max(latest or 0, ChangeHorizon.current())
+
+
+def read_changes(project_id, since, limit):
+    """
+    Lit au plus `limit` entrées du journal d'un projet postérieures au jeton `since`, compactées à une seule
+    modification par objet (la dernière lue) : supprimé si la dernière entrée est une suppression, créé si l'objet
+    a été créé depuis le jeton, modifié sinon.
+
+    Retourne les modifications, le jeton à présenter ensuite et s'il reste des entrées à lire.
+    """
+    entries = list(Change.objects.filter(project_id=project_id, id__gt=since).order_by('id')[:limit + 1])
+    has_more = len(entries) > limit
+    entries = entries[:limit]
+
+    latest, created = {}, set()
+    for entry in entries:
+        key = (entry.object_type, entry.object_id)
+        latest.pop(key, None)
+        latest[key] = entry
+        if entry.action == Change.CREATE:
+            created.add(key)
+
+    changes = []
+    for key, entry in latest.items():
+        if entry.action == Change.DELETE:
+            action = Change.DELETE
+        else:
+            action = Change.CREATE if key in created else Change.UPDATE
+        changes.append({'token': entry.id, 'type': entry.object_type, 'id': entry.object_id, 'action': action})
+    return changes, entries[-1].id if entries else since, has_more
+
+
+def compact_changes():
+    """
+    Supprime les entrées remplacées par une entrée plus récente pour le même objet, ainsi que celles des projets
+    supprimés (leur journal n'est plus lisible). Un client garde la même vue : seule la dernière modification
+    d'un objet compte. Retourne le nombre d'entrées supprimées.
+    """
+    superseded = Change.objects.filter(Exists(Change.objects.filter(
+        object_type=OuterRef('object_type'),
+        object_id=OuterRef('object_id'),
+        project_id=OuterRef('project_id'),
+        id__gt=OuterRef('id'),
+    )))
+    deleted, _ = superseded.delete()
+    orphaned, _ = Change.objects.exclude(project_id__in=Project.objects.values('pk')).delete()
+    return deleted + orphaned
+
+
+def purge_changes(before):
+    """
+    Rétention : supprime les entrées antérieures à `before` et avance l'horizon du journal ; les clients dont
+    le jeton est plus ancien doivent refaire une synchronisation complète. Retourne le nombre d'entrées supprimées.
+    """
+    token = Change.objects.filter(created_time__lt=before).aggregate(token=Max('id'))['token']
+    if token is None:
+        return 0
+    with transaction.atomic():
+        ChangeHorizon.advance(token)
+        deleted, _ = Change.objects.filter(id__lte=token).delete()
+    return deleted
@@ -0,0 +1,62 @@
+import hashlib
+from django.core.exceptions import ValidationError
+from django.db.models import Count, Max
+from django.http import Http404
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+
+def collection_validator(queryset):
+    """
+    Résume une collection par (date de dernière modification, nombre de lignes), en une requête d'agrégat.
+    """
+    result = queryset.order_by().aggregate(last_modified=Max('updated_time'), count=Count('pk'))
+    return result['last_modified'], result['count']
+
+
+class ConditionalGetMixin:
+    """
+    Mixin de vue : ETag sur `list` et `retrieve`, Last-Modified sur `retrieve` seulement.
+
+    Les validateurs sont calculés en base par `get_validators()`, après les permissions et avant toute
+    sérialisation ; une requête conditionnelle satisfaite reçoit un 304 sans exécuter les serializers.
+    La date de dernière modification d'une liste ne change pas quand une ligne est supprimée : seul l'ETag,
+    qui inclut le nombre de lignes, valide les listes.
+    """
+
+    def get_validators(self):
+        """
+        Retourne une liste de couples (date de dernière modification, nombre de lignes), ou None.
+        """
+        return None
+
+    def conditional_response(self, request, handler, *args, **kwargs):
+        try:
+            validators = self.get_validators()
+        except (ValidationError, ValueError):
+            # Identifiant mal formé dans l'URL (UUID d'un commentaire par exemple) : comme get_object(), 404.
+            raise Http404
+        if validators is None:
+            return handler(request, *args, **kwargs)
+
+        timestamps = [last_modified for last_modified, _ in validators if last_modified is not None]
+        last_modified = None
+        if self.action == 'retrieve' and timestamps:
+            last_modified = int(max(timestamps).timestamp())
+        signature = repr((request.get_full_path(), [(str(ts), count) for ts, count in validators]))
+        etag = quote_etag(hashlib.md5(signature.encode()).hexdigest())
+
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = handler(request, *args, **kwargs)
+        if response.status_code in (200, 304):
+            response['ETag'] = etag
+            if last_modified is not None:
+                response['Last-Modified'] = http_date(last_modified)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(request, super().list, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(request, super().retrieve, *args, **kwargs)
@@ -0,0 +1,109 @@
+from django.db.models import Count, F, IntegerField, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from .models import Project, Contributor, Issue, Comment, Change
+from .changes import record_changes
+
+# Compteurs dénormalisés : nom du champ -> (modèle compté, clé étrangère vers le porteur, filtre éventuel).
+PROJECT_COUNTERS = {
+    'issue_count': (Issue, 'project', None),
+    'open_issue_count': (Issue, 'project', Q(status__in=Issue.OPEN_STATUSES)),
+    'contributor_count': (Contributor, 'project', None),
+}
+ISSUE_COUNTERS = {
+    'comment_count': (Comment, 'issue', None),
+}
+
+
+def record_counter_changes(model, pks):
+    """
+    Journalise la modification des porteurs de compteurs mis à jour sans signal : les compteurs font partie
+    de leur représentation, un client synchronisé doit les relire.
+    """
+    if model is Project:
+        record_changes('project', [(pk, pk) for pk in pks], Change.UPDATE)
+    else:
+        record_changes('issue', Issue.objects.filter(pk__in=pks).values_list('project_id', 'issue_id'), Change.UPDATE)
+
+
+def adjust_project_counters(project_id, **deltas):
+    """
+    Applique des variations aux compteurs d'un projet en un seul UPDATE atomique (expressions F).
+    Les compteurs font partie de la représentation du projet : sa date de mise à jour est avancée.
+    """
+    changes = {field: F(field) + delta for field, delta in deltas.items() if delta}
+    if changes and Project.objects.filter(pk=project_id).update(updated_time=timezone.now(), **changes):
+        record_counter_changes(Project, [project_id])
+
+
+def adjust_issue_counters(issue_id, project_id=None, **deltas):
+    """
+    Comme adjust_project_counters, pour une issue. `project_id`, s'il est connu, évite de relire son projet
+    pour le journal des modifications.
+    """
+    changes = {field: F(field) + delta for field, delta in deltas.items() if delta}
+    if changes and Issue.objects.filter(pk=issue_id).update(updated_time=timezone.now(), **changes):
+        if project_id is None:
+            record_counter_changes(Issue, [issue_id])
+        else:
+            record_changes('issue', [(project_id, issue_id)], Change.UPDATE)
+
+
+def count_subquery(model, foreign_key, condition=None):
+    """
+    Sous-requête corrélée comptant les lignes de `model` rattachées à la ligne courante (0 s'il n'y en a aucune).
+    """
+    queryset = model.objects.filter(**{foreign_key: OuterRef('pk')})
+    if condition is not None:
+        queryset = queryset.filter(condition)
+    counts = queryset.order_by().values(foreign_key).annotate(total=Count('pk')).values('total')
+    return Coalesce(Subquery(counts, output_field=IntegerField()), Value(0))
+
+
+def recount(model, counters, queryset=None):
+    """
+    Recalcule les compteurs des lignes de `queryset` qui ont dérivé, et retourne le nombre de lignes corrigées
+    par compteur.
+    """
+    queryset = model.objects.all() if queryset is None else queryset
+    actual = {f'actual_{field}': count_subquery(*spec) for field, spec in counters.items()}
+    drifted = queryset.annotate(**actual)
+    drift = Q()
+    for field in counters:
+        drift |= ~Q(**{field: F(f'actual_{field}')})
+    rows = list(drifted.filter(drift).values('pk', *counters, *actual))
+
+    fixed = {field: 0 for field in counters}
+    for row in rows:
+        for field in counters:
+            fixed[field] += row[field] != row[f'actual_{field}']
+    if rows:
+        pks = [row['pk'] for row in rows]
+        model.objects.filter(pk__in=pks).update(
+            updated_time=timezone.now(), **{field: count_subquery(*spec) for field, spec in counters.items()}
+        )
+        record_counter_changes(model, pks)
+    return fixed
+
+
+def reconcile_counters(project_ids=None):
+    """
+    Corrige la dérive des compteurs des projets (et de leurs issues), par exemple après des écritures faites
+    hors de l'ORM. Retourne le nombre de lignes corrigées par compteur.
+    """
+    projects = Project.objects.all()
+    issues = Issue.objects.all()
+    if project_ids is not None:
+        projects = projects.filter(pk__in=project_ids)
+        issues = issues.filter(project_id__in=project_ids)
+    return {**recount(Project, PROJECT_COUNTERS, projects), **recount(Issue, ISSUE_COUNTERS, issues)}
+
+
+def recount_open_issues(project_id):
+    """
+    Recalcule open_issue_count d'un projet en un seul UPDATE, après un changement de statut en masse.
+    """
+    if Project.objects.filter(pk=project_id).update(
+        updated_time=timezone.now(), open_issue_count=count_subquery(*PROJECT_COUNTERS['open_issue_count'])
+    ):
+        record_counter_changes(Project, [project_id])
@@ -0,0 +1,171 @@
+import json
+import queue
+import threading
+from asyncio import Queue, get_running_loop
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.core.signals import setting_changed
+from django.db import transaction
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+from .changes import parse_object_id
+
+# Types d'objets diffusés sur le flux d'événements d'un projet.
+EVENT_TYPES = ('issue', 'comment')
+
+
+def event_message(project_id, object_type, object_id, action, token):
+    return {'token': token, 'project_id': project_id, 'type': object_type, 'id': object_id, 'action': action}
+
+
+def format_event(message):
+    """
+    Encode un événement au format server-sent events ; le jeton du journal des modifications sert d'`id`.
+    """
+    data = json.dumps(message, cls=DjangoJSONEncoder, ensure_ascii=False)
+    return f"id: {message['token']}\nevent: {message['type']}\ndata: {data}\n\n"
+
+
+class EventHub:
+    """
+    Abonnements du processus aux événements des projets.
+
+    Chaque abonné est une file asyncio rattachée à la boucle qui l'a créée : un abonné inactif ne coûte que
+    cette file et la coroutine qui l'attend. Les publications arrivent de n'importe quel thread et sont remises
+    par un seul rappel par boucle. Un abonné dont la file dépasse `max_pending` reçoit None et est désinscrit :
+    il se reconnecte et rejoue les événements manqués depuis le journal.
+    """
+
+    def __init__(self, max_pending=100):
+        self.max_pending = max_pending
+        self._subscribers = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, project_id):
+        subscription = Queue()
+        with self._lock:
+            self._subscribers.setdefault(project_id, {})[subscription] = get_running_loop()
+        return subscription
+
+    def unsubscribe(self, project_id, subscription):
+        with self._lock:
+            subscribers = self._subscribers.get(project_id, {})
+            subscribers.pop(subscription, None)
+            if not subscribers:
+                self._subscribers.pop(project_id, None)
+
+    def dispatch(self, messages):
+        with self._lock:
+            loops = {
+                loop
+                for message in messages
+                for loop in self._subscribers.get(message['project_id'], {}).values()
+            }
+        for loop in loops:
+            try:
+                loop.call_soon_threadsafe(self._deliver, loop, messages)
+            except RuntimeError:
+                # Boucle fermée : ses abonnés ne liront plus rien.
+                self._drop_loop(loop)
+
+    def _deliver(self, loop, messages):
+        for message in messages:
+            with self._lock:
+                subscribers = [
+                    subscription
+                    for subscription, subscription_loop in self._subscribers.get(message['project_id'], {}).items()
+                    if subscription_loop is loop
+                ]
+            for subscription in subscribers:
+                if subscription.qsize() >= self.max_pending:
+                    self.unsubscribe(message['project_id'], subscription)
+                    subscription.put_nowait(None)
+                else:
+                    subscription.put_nowait(message)
+
+    def _drop_loop(self, loop):
+        with self._lock:
+            for project_id, subscribers in list(self._subscribers.items()):
+                for subscription in [key for key, value in subscribers.items() if value is loop]:
+                    del subscribers[subscription]
+                if not subscribers:
+                    del self._subscribers[project_id]
+
+    def __len__(self):
+        with self._lock:
+            return sum(len(subscribers) for subscribers in self._subscribers.values())
+
+
+hub = EventHub()
+
+
+class InProcessBroker:
+    """
+    Remet directement les événements aux abonnés du processus (un seul worker ASGI).
+    """
+
+    def publish(self, messages):
+        hub.dispatch(messages)
+
+
+class LocalBroker:
+    """
+    Remplaçant local d'un broker externe (pub/sub Redis par exemple) : les messages sont encodés en JSON et remis
+    aux abonnés par un thread de réception, comme le ferait l'abonnement à un broker. Un backend réel, partagé
+    entre workers, implémente publish() et appelle hub.dispatch() à la réception.
+    """
+
+    def __init__(self):
+        self._queue = queue.SimpleQueue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def publish(self, messages):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._receive, name='event-broker', daemon=True)
+                self._thread.start()
+        self._queue.put(json.dumps(messages, cls=DjangoJSONEncoder))
+
+    def _receive(self):
+        while True:
+            hub.dispatch(json.loads(self._queue.get()))
+
+
+_event_broker = None
+
+
+def get_event_broker():
+    """
+    Retourne le broker configuré par le réglage EVENT_BROKER, ou None si la diffusion est désactivée.
+    """
+    global _event_broker
+    config = getattr(settings, 'EVENT_BROKER', None)
+    if not config:
+        return None
+    if _event_broker is None:
+        _event_broker = import_string(config['BACKEND'])(**config.get('OPTIONS', {}))
+    return _event_broker
+
+
+@receiver(setting_changed)
+def reset_event_broker(setting, **kwargs):
+    global _event_broker
+    if setting == 'EVENT_BROKER':
+        _event_broker = None
+
+
+def publish_changes(entries):
+    """
+    Publie, à la validation de la transaction en cours, les entrées du journal des modifications qui concernent
+    des issues ou des commentaires : une transaction annulée ne diffuse rien.
+    """
+    broker = get_event_broker()
+    messages = [
+        event_message(entry.project_id, entry.object_type, parse_object_id(entry.object_type, entry.object_id),
+                      entry.action, entry.id)
+        for entry in entries
+        if entry.object_type in EVENT_TYPES
+    ]
+    if broker is not None and messages:
+        transaction.on_commit(lambda: broker.publish(messages))
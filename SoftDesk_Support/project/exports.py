@@ -0,0 +1,76 @@
+import csv
+import json
+from django.core.serializers.json import DjangoJSONEncoder
+from .models import Issue, Comment
+
+EXPORT_CHUNK_SIZE = 2000
+
+ISSUE_FIELDS = [
+    'issue_id', 'title', 'description', 'priority', 'tag', 'status',
+    'author_id', 'assigned_to_id', 'created_time',
+]
+COMMENT_FIELDS = ['comment_id', 'issue_id', 'name', 'description', 'author_id', 'created_time']
+CSV_COLUMNS = [
+    'type', 'issue_id', 'comment_id', 'title', 'name', 'description', 'priority', 'tag', 'status',
+    'author_id', 'assigned_to_id', 'created_time',
+]
+
+
+def iter_project_records(project_id):
+    """
+    Parcourt les issues d'un projet, chacune suivie de ses commentaires, en mémoire constante.
+
+    Issues et commentaires sont lus par deux curseurs triés par issue_id puis fusionnés,
+    sans charger de relation par issue.
+    """
+    issues = (
+        Issue.objects.filter(project_id=project_id)
+        .order_by('issue_id')
+        .values(*ISSUE_FIELDS)
+        .iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    )
+    comments = (
+        Comment.objects.filter(issue__project_id=project_id)
+        .order_by('issue_id', 'created_time', 'id')
+        .values(*COMMENT_FIELDS)
+        .iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    )
+    comment = next(comments, None)
+    for issue in issues:
+        yield {'type': 'issue', **issue}
+        while comment is not None and comment['issue_id'] == issue['issue_id']:
+            yield {'type': 'comment', **comment}
+            comment = next(comments, None)
+
+
+def iter_ndjson(records):
+    """
+    Sérialise chaque enregistrement sur une ligne JSON.
+    """
+    for record in records:
+        yield json.dumps(record, cls=DjangoJSONEncoder) + '\n'
+
+
+class _Echo:
+    """
+    Pseudo-fichier renvoyant la ligne écrite, pour produire le CSV ligne par ligne.
+    """
+
+    def write(self, value):
+        return value
+
+
+def iter_csv(records):
+    """
+    Sérialise les enregistrements en CSV, en commençant par l'en-tête.
+    """
+    writer = csv.DictWriter(_Echo(), fieldnames=CSV_COLUMNS, extrasaction='ignore')
+    yield writer.writerow(dict(zip(CSV_COLUMNS, CSV_COLUMNS)))
+    for record in records:
+        yield writer.writerow(record)
+
+
+EXPORT_FORMATS = {
+    'ndjson': (iter_ndjson, 'application/x-ndjson'),
+    'csv': (iter_csv, 'text/csv'),
+}
@@ -0,0 +1,57 @@
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+from .models import Issue
+
+
+def get_requested_fields(request):
+    """
+    Retourne l'ensemble des champs demandés via `?fields=a,b`, ou None si le paramètre est absent.
+    """
+    if request is None or request.method != 'GET':
+        return None
+    fields = request.query_params.get('fields')
+    if not fields:
+        return None
+    return {field.strip() for field in fields.split(',') if field.strip()}
+
+
+class IssueFilterBackend(BaseFilterBackend):
+    """
+    Filtre les issues par `status`, `priority`, `tag` et `assigned_to`.
+    Chaque paramètre accepte plusieurs valeurs séparées par des virgules.
+    """
+    choice_filters = {
+        'status': Issue.STATUS_CHOICES,
+        'priority': Issue.PRIORITY_CHOICES,
+        'tag': Issue.TAG_CHOICES,
+    }
+
+    def filter_queryset(self, request, queryset, view):
+        errors = {}
+        for param, choices in self.choice_filters.items():
+            values = self.get_values(request, param)
+            if values is None:
+                continue
+            allowed = {value for value, _ in choices}
+            unknown = values - allowed
+            if unknown:
+                errors[param] = f"Valeurs inconnues : {', '.join(sorted(unknown))}."
+                continue
+            queryset = queryset.filter(**{f'{param}__in': values})
+
+        values = self.get_values(request, 'assigned_to')
+        if values is not None:
+            try:
+                queryset = queryset.filter(assigned_to_id__in={int(value) for value in values})
+            except ValueError:
+                errors['assigned_to'] = "Identifiants d'utilisateur attendus."
+
+        if errors:
+            raise ValidationError(errors)
+        return queryset
+
+    def get_values(self, request, param):
+        value = request.query_params.get(param)
+        if not value:
+            return None
+        return {item.strip() for item in value.split(',') if item.strip()}
@@ -0,0 +1,221 @@
+import threading
+import time
+from bisect import bisect_left
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from .query_capture import current_observers, observe_queries
+
+# Bornes supérieures des classes des histogrammes ; une dernière classe reçoit les valeurs au-delà.
+TIME_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+SIZE_BUCKETS = (256, 1024, 4096, 16_384, 65_536, 262_144, 1_048_576)
+
+UNRESOLVED = '<unresolved>'
+
+
+class RequestMetrics:
+    """
+    Mesures d'une requête, alimentées par la capture des requêtes SQL (observateur de project.query_capture)
+    et par TimedSerializerMixin.
+    """
+    __slots__ = ('queries', 'db_time', 'serializer_time', 'serializer_depth')
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.serializer_time = 0.0
+        self.serializer_depth = 0
+
+    def record(self, sql, duration_ms):
+        self.queries += 1
+        self.db_time += duration_ms / 1000
+
+
+def current_metrics():
+    """
+    Mesures de la requête instrumentée en cours, ou None hors de PerformanceMiddleware.
+    """
+    for observer in current_observers():
+        if isinstance(observer, RequestMetrics):
+            return observer
+    return None
+
+
+class TimedSerializerMixin:
+    """
+    Mixin de serializer : chronomètre la représentation des réponses pour PerformanceMiddleware.
+    Seul l'appel le plus externe est compté : un serializer imbriqué ne s'ajoute pas à son parent.
+    """
+
+    def to_representation(self, instance):
+        metrics = current_metrics()
+        if metrics is None:
+            return super().to_representation(instance)
+        metrics.serializer_depth += 1
+        start = time.perf_counter()
+        try:
+            return super().to_representation(instance)
+        finally:
+            metrics.serializer_depth -= 1
+            if not metrics.serializer_depth:
+                metrics.serializer_time += time.perf_counter() - start
+
+
+class Histogram:
+    """
+    Histogramme à classes fixes : enregistrer une valeur coûte une recherche dichotomique et deux additions.
+    """
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0
+
+    def record(self, value):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, fraction):
+        """
+        Retourne la borne supérieure de la classe contenant le percentile (le maximum pour la dernière classe).
+        """
+        if not self.count:
+            return None
+        threshold = fraction * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= threshold:
+                return self.bounds[index] if index < len(self.bounds) else self.max
+        return self.max
+
+    def summary(self):
+        return {
+            'mean': round(self.total / self.count, 3) if self.count else None,
+            'p50': self.percentile(0.5),
+            'p95': self.percentile(0.95),
+            'p99': self.percentile(0.99),
+            'max': round(self.max, 3),
+            'buckets': {
+                **{f'le_{bound}': count for bound, count in zip(self.bounds, self.counts)},
+                'inf': self.counts[-1],
+            },
+        }
+
+
+class EndpointStats:
+    """
+    Histogrammes d'un point de terminaison (nom d'URL résolu).
+    """
+    METRICS = {
+        'wall_ms': TIME_BUCKETS_MS,
+        'db_ms': TIME_BUCKETS_MS,
+        'serializer_ms': TIME_BUCKETS_MS,
+        'queries': QUERY_BUCKETS,
+        'response_bytes': SIZE_BUCKETS,
+    }
+
+    def __init__(self):
+        self.histograms = {name: Histogram(bounds) for name, bounds in self.METRICS.items()}
+        self.status_codes = {}
+
+    def record(self, status_code, values):
+        for name, value in values.items():
+            if value is not None:
+                self.histograms[name].record(value)
+        self.status_codes[status_code] = self.status_codes.get(status_code, 0) + 1
+
+    def summary(self):
+        return {
+            'count': self.histograms['wall_ms'].count,
+            'status_codes': {str(code): count for code, count in sorted(self.status_codes.items())},
+            **{name: histogram.summary() for name, histogram in self.histograms.items()},
+        }
+
+
+class PerformanceRegistry:
+    """
+    Agrégats en mémoire du processus, par nom d'URL.
+    """
+
+    def __init__(self):
+        self._endpoints = {}
+        self._lock = threading.Lock()
+
+    def record(self, url_name, status_code, values):
+        with self._lock:
+            endpoint = self._endpoints.get(url_name)
+            if endpoint is None:
+                endpoint = self._endpoints[url_name] = EndpointStats()
+            endpoint.record(status_code, values)
+
+    def snapshot(self):
+        with self._lock:
+            return {name: endpoint.summary() for name, endpoint in sorted(self._endpoints.items())}
+
+    def reset(self):
+        with self._lock:
+            self._endpoints.clear()
+
+
+registry = PerformanceRegistry()
+
+
+def _server_timing_enabled():
+    return getattr(settings, 'PERF_INSTRUMENTATION', {}).get('SERVER_TIMING', False)
+
+
+class PerformanceMiddleware:
+    """
+    Mesure, pour chaque requête, durée totale, nombre et durée des requêtes SQL, durée de sérialisation
+    et taille de la réponse, agrégées par nom d'URL dans `registry` (exposé par PerformanceStatsView).
+
+    Avec PERF_INSTRUMENTATION['SERVER_TIMING'], ces mesures sont aussi renvoyées dans l'en-tête `Server-Timing`.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        start = time.perf_counter()
+        with observe_queries(RequestMetrics()) as metrics:
+            response = self.get_response(request)
+        self.record(request, response, metrics, time.perf_counter() - start)
+        return response
+
+    async def __acall__(self, request):
+        start = time.perf_counter()
+        with observe_queries(RequestMetrics()) as metrics:
+            response = await self.get_response(request)
+        self.record(request, response, metrics, time.perf_counter() - start)
+        return response
+
+    def record(self, request, response, metrics, wall_time):
+        match = getattr(request, 'resolver_match', None)
+        url_name = (match.url_name if match else None) or UNRESOLVED
+        size = None if getattr(response, 'streaming', False) else len(response.content)
+        wall_ms, db_ms, serializer_ms = wall_time * 1000, metrics.db_time * 1000, metrics.serializer_time * 1000
+        registry.record(url_name, response.status_code, {
+            'wall_ms': wall_ms,
+            'db_ms': db_ms,
+            'serializer_ms': serializer_ms,
+            'queries': metrics.queries,
+            'response_bytes': size,
+        })
+        if _server_timing_enabled():
+            response['Server-Timing'] = (
+                f'total;dur={wall_ms:.1f}, db;dur={db_ms:.1f};desc="{metrics.queries} queries", '
+                f'serialize;dur={serializer_ms:.1f}'
+            )
@@ -0,0 +1,348 @@
+import json
+import logging
+import platform
+import statistics
+import subprocess
+import time
+import tracemalloc
+import django
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, URLResolver, get_resolver, reverse
+from django.utils import timezone
+from authentication.models import CustomUser
+from authentication.tokens import issue_tokens
+from project.changes import head_token
+from project.models import Project, Contributor, Issue, Comment, ChangeHorizon
+
+READ_METHODS = ('GET', 'HEAD')
+
+
+def url_names(patterns=None):
+    """
+    Retourne les noms des URL du projet ; les inclusions avec espace de noms (admin, api-auth) comptent pour
+    un seul nom, `<espace>:*`, couvert par n'importe laquelle de leurs URL.
+    """
+    names = set()
+    for pattern in get_resolver().url_patterns if patterns is None else patterns:
+        if isinstance(pattern, URLResolver):
+            if pattern.namespace:
+                names.add(f'{pattern.namespace}:*')
+            else:
+                names |= url_names(pattern.url_patterns)
+        elif isinstance(pattern, URLPattern) and pattern.name:
+            names.add(pattern.name)
+    return names
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def consume(response):
+    if getattr(response, 'is_async', False):
+        async def collect():
+            return b''.join([chunk async for chunk in response.streaming_content])
+        return async_to_sync(collect)()
+    if getattr(response, 'streaming', False):
+        return b''.join(response.streaming_content)
+    return response.content
+
+
+class Scenario:
+    """
+    Requête mesurée : les écritures sont exécutées dans une transaction annulée, la base reste intacte.
+    """
+
+    def __init__(self, name, method, url_name, kwargs=None, data=None, client='user', query=''):
+        self.name = name
+        self.method = method
+        self.url_name = url_name
+        self.kwargs = kwargs or {}
+        self.data = data
+        self.client = client
+        self.query = query
+
+    @property
+    def covers(self):
+        return f"{self.url_name.split(':')[0]}:*" if ':' in self.url_name else self.url_name
+
+    @property
+    def url(self):
+        url = reverse(self.url_name, kwargs=self.kwargs)
+        return f'{url}?{self.query}' if self.query else url
+
+    def request(self, client):
+        handler = getattr(client, self.method.lower())
+        if self.method in READ_METHODS:
+            return handler(self.url)
+        with transaction.atomic():
+            response = handler(self.url, self.data, content_type='application/json')
+            consume(response)
+            transaction.set_rollback(True)
+        return response
+
+    def run(self, client):
+        start = time.perf_counter()
+        response = self.request(client)
+        consume(response)
+        return response, time.perf_counter() - start
+
+
+class Command(BaseCommand):
+    """
+    Suite de mesures reproductible : chaque URL de SoftDesk_Support/urls.py est appelée par le client de test
+    de Django sur la base courante (voir la commande seed_data), avec latences p50/p95, nombre de requêtes SQL
+    et pic mémoire par scénario. Les résultats sont écrits en JSON pour comparer deux commits.
+    """
+    help = "Mesure latence, requêtes SQL et mémoire de chaque URL de l'API, et écrit les résultats en JSON."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--project', help="Projet mesuré (par défaut, celui qui a le plus d'issues).")
+        parser.add_argument('--password', default='S3cret-password!',
+                            help="Mot de passe de l'auteur du projet, pour les scénarios de connexion.")
+        parser.add_argument('--iterations', type=int, default=20, help="Mesures par scénario.")
+        parser.add_argument('--warmup', type=int, default=2, help="Appels non mesurés avant chaque scénario.")
+        parser.add_argument('--only', action='append', default=[], help="Limite aux scénarios nommés (répétable).")
+        parser.add_argument('--output', help="Fichier JSON où écrire les résultats.")
+        parser.add_argument('--compare', help="Fichier JSON d'une exécution précédente à comparer.")
+
+    def handle(self, *args, **options):
+        fixtures = self.get_fixtures(options)
+        scenarios = self.get_scenarios(fixtures, options)
+        uncovered = sorted(url_names() - {scenario.covers for scenario in scenarios})
+        if options['only']:
+            scenarios = [scenario for scenario in scenarios if scenario.name in options['only']]
+
+        # Les réponses 4xx attendues (permissions, validations) ne sont pas journalisées pendant les mesures.
+        request_logger = logging.getLogger('django.request')
+        level = request_logger.level
+        request_logger.setLevel(logging.ERROR)
+        try:
+            with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver']):
+                clients = self.get_clients(fixtures)
+                results = {}
+                for scenario in scenarios:
+                    results[scenario.name] = self.measure(scenario, clients[scenario.client], options)
+                    self.write_result(scenario.name, results[scenario.name])
+        finally:
+            request_logger.setLevel(level)
+
+        report = {'meta': self.get_meta(fixtures, options, uncovered), 'results': results}
+        if uncovered:
+            self.stdout.write(self.style.WARNING(f"URL sans scénario : {', '.join(uncovered)}"))
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as output:
+                json.dump(report, output, indent=2, ensure_ascii=False)
+            self.stdout.write(self.style.SUCCESS(f"Résultats écrits dans {options['output']}."))
+        if options['compare']:
+            self.compare(options['compare'], results)
+
+    def get_fixtures(self, options):
+        projects = Project.objects.select_related('author').filter(author__isnull=False)
+        if options['project']:
+            project = projects.filter(project_id=options['project']).first()
+        else:
+            project = projects.order_by('-issue_count', 'project_id').first()
+        if project is None:
+            raise CommandError("Aucun projet à mesurer : lancer d'abord la commande seed_data.")
+        user = project.author
+        issues = Issue.objects.filter(project=project).order_by('issue_id')
+        issue = issues.filter(author=user).first() or issues.first()
+        if issue is None:
+            raise CommandError(f"Le projet {project.project_id} n'a aucune issue.")
+        comments = Comment.objects.filter(issue=issue).order_by('pk')
+        return {
+            'project': project,
+            'user': user,
+            'admin': CustomUser.objects.filter(is_superuser=True).order_by('pk').first(),
+            'issue': issue,
+            'own_issue_ids': list(issues.filter(author=user).values_list('issue_id', flat=True)[:10]),
+            'comment': comments.filter(author=user).first() or comments.first(),
+            'contributor': Contributor.objects.filter(project=project).order_by('pk').first(),
+            'outsider': CustomUser.objects.exclude(contributions=project).exclude(pk=user.pk).order_by('pk').first(),
+        }
+
+    def get_clients(self, fixtures):
+        clients = {'anonymous': Client(raise_request_exception=False)}
+        for role in ('user', 'admin'):
+            account = fixtures[role] or fixtures['user']
+            clients[role] = Client(
+                raise_request_exception=False, HTTP_AUTHORIZATION=f"Bearer {issue_tokens(account)['access']}"
+            )
+            clients[role].force_login(account)
+        return clients
+
+    def get_scenarios(self, fixtures, options):
+        project, user, issue, comment = fixtures['project'], fixtures['user'], fixtures['issue'], fixtures['comment']
+        project_kwargs = {'project_id': project.project_id}
+        issue_kwargs = {**project_kwargs, 'issue_id': issue.issue_id}
+        credentials = {'username': user.username, 'password': options['password']}
+        new_user = {
+            'username': 'benchmark_user', 'password': 'B3nch-pass!', 'date_of_birth': '1990-01-01',
+            'can_be_contacted': False, 'can_data_be_shared': False,
+        }
+        new_issue = {'title': 'Benchmark', 'description': 'Benchmark', 'project_id': project.project_id}
+        new_comment = {'name': 'Benchmark', 'description': 'Benchmark', 'author': user.pk}
+        scenarios = [
+            Scenario('root', 'GET', 'root'),
+            Scenario('api-root', 'GET', 'api-root'),
+            Scenario('admin', 'GET', 'admin:index', client='admin'),
+            Scenario('api-auth-login', 'GET', 'rest_framework:login', client='anonymous'),
+            Scenario('logout', 'POST', 'logout', client='anonymous'),
+            Scenario('token-obtain', 'POST', 'token_obtain_pair', data=credentials, client='anonymous'),
+            Scenario('token-refresh', 'POST', 'token_refresh', data={'refresh': issue_tokens(user)['refresh']},
+                     client='anonymous'),
+            Scenario('login', 'POST', 'login-list', data=credentials, client='anonymous'),
+            Scenario('register', 'POST', 'register-list', data=new_user, client='anonymous'),
+            Scenario('users-list', 'GET', 'users'),
+            Scenario('users-create', 'POST', 'users', data=new_user, client='anonymous'),
+            Scenario('user-retrieve', 'GET', 'user', {'id': user.pk}),
+            Scenario('user-update', 'PATCH', 'user', {'id': user.pk}, data={'can_be_contacted': True}),
+            Scenario('user-delete', 'DELETE', 'user', {'id': user.pk}),
+            Scenario('projects-list', 'GET', 'projects'),
+            Scenario('projects-create', 'POST', 'projects', data={
+                'name': 'Benchmark project', 'description': 'Benchmark', 'project_type': 'Backend'}),
+            Scenario('project-retrieve', 'GET', 'project', project_kwargs),
+            Scenario('project-update', 'PUT', 'project', project_kwargs, data={
+                'name': project.name, 'description': 'Benchmark', 'project_type': project.project_type}),
+            Scenario('project-delete', 'DELETE', 'project', project_kwargs),
+            Scenario('contributors-list', 'GET', 'contributors', project_kwargs),
+            Scenario('issues-list', 'GET', 'issues', project_kwargs),
+            Scenario('issues-list-filtered', 'GET', 'issues', project_kwargs, query='status=TO_DO&ordering=-priority'),
+            Scenario('issues-create', 'POST', 'issues', project_kwargs, data=new_issue),
+            Scenario('issues-bulk-create', 'POST', 'issues-bulk', project_kwargs, data=[
+                {'title': f'Benchmark {index}', 'description': 'Benchmark'} for index in range(50)]),
+            Scenario('issues-bulk-update', 'PATCH', 'issues-bulk', project_kwargs, data=[
+                {'issue_id': issue_id, 'status': 'IN_PROGRESS'} for issue_id in fixtures['own_issue_ids']]),
+            Scenario('issue-retrieve', 'GET', 'issue', issue_kwargs),
+            Scenario('issue-update', 'PUT', 'issue', issue_kwargs, data={**new_issue, 'status': 'FINISHED'}),
+            Scenario('issue-delete', 'DELETE', 'issue', issue_kwargs),
+            Scenario('comments-list', 'GET', 'comments', issue_kwargs),
+            Scenario('comments-create', 'POST', 'comments', issue_kwargs, data=new_comment),
+            Scenario('project-export-ndjson', 'GET', 'project-export', {**project_kwargs, 'export_format': 'ndjson'}),
+            Scenario('project-export-csv', 'GET', 'project-export', {**project_kwargs, 'export_format': 'csv'}),
+            Scenario('project-stats', 'GET', 'project-stats', project_kwargs),
+            # Première page du journal encore disponible : jusqu'à PAGE_SIZE entrées et leurs objets.
+            Scenario('project-changes', 'GET', 'project-changes', project_kwargs,
+                     query=f'since={ChangeHorizon.current()}'),
+            Scenario('my-issues', 'GET', 'my-issues'),
+            Scenario('my-comments', 'GET', 'my-comments'),
+            Scenario('search', 'GET', 'search', query='q=rapport'),
+            Scenario('cache-stats', 'GET', 'cache-stats', client='admin'),
+            Scenario('perf-stats', 'GET', 'perf-stats', client='admin'),
+            Scenario('async-projects', 'GET', 'async-projects'),
+            Scenario('async-project', 'GET', 'async-project', project_kwargs),
+            Scenario('async-issues', 'GET', 'async-issues', project_kwargs),
+            Scenario('async-issue', 'GET', 'async-issue', issue_kwargs),
+            Scenario('async-comments', 'GET', 'async-comments', issue_kwargs),
+            # Flux d'événements fermé après la reprise depuis le jeton courant (timeout=0).
+            Scenario('async-project-events', 'GET', 'async-project-events', project_kwargs,
+                     query=f"last_event_id={head_token(fixtures['project'].project_id)}&timeout=0"),
+        ]
+        if fixtures['outsider'] is not None:
+            scenarios.append(Scenario('contributors-create', 'POST', 'contributors', project_kwargs,
+                                      data={'contributor': fixtures['outsider'].pk}))
+        if fixtures['contributor'] is not None:
+            contributor_kwargs = {**project_kwargs, 'contributor_id': fixtures['contributor'].contributor_id}
+            scenarios += [
+                Scenario('contributor-retrieve', 'GET', 'contributor', contributor_kwargs),
+                Scenario('contributor-delete', 'DELETE', 'contributor', contributor_kwargs),
+            ]
+        if comment is not None:
+            comment_kwargs = {**issue_kwargs, 'comment_id': comment.comment_id}
+            scenarios += [
+                Scenario('comment-retrieve', 'GET', 'comment', comment_kwargs),
+                Scenario('comment-update', 'PUT', 'comment', comment_kwargs, data=new_comment),
+                Scenario('comment-delete', 'DELETE', 'comment', comment_kwargs),
+                Scenario('async-comment', 'GET', 'async-comment', comment_kwargs),
+            ]
+        return scenarios
+
+    def measure(self, scenario, client, options):
+        for _ in range(options['warmup']):
+            scenario.run(client)
+
+        latencies, status_codes = [], {}
+        for _ in range(max(1, options['iterations'])):
+            response, elapsed = scenario.run(client)
+            latencies.append(elapsed * 1000)
+            status_codes[str(response.status_code)] = status_codes.get(str(response.status_code), 0) + 1
+
+        with CaptureQueriesContext(connection) as queries:
+            response, _ = scenario.run(client)
+        query_count = len(queries)
+
+        tracemalloc.start()
+        try:
+            scenario.run(client)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        return {
+            'method': scenario.method,
+            'url_name': scenario.url_name,
+            'status_codes': status_codes,
+            'iterations': len(latencies),
+            'p50_ms': round(percentile(latencies, 0.5), 3),
+            'p95_ms': round(percentile(latencies, 0.95), 3),
+            'mean_ms': round(statistics.fmean(latencies), 3),
+            'queries': query_count,
+            'peak_memory_kb': round(peak / 1024, 1),
+            'response_bytes': len(consume(response)),
+        }
+
+    def get_meta(self, fixtures, options, uncovered):
+        try:
+            commit = subprocess.run(
+                ['git', 'rev-parse', 'HEAD'], cwd=settings.BASE_DIR, capture_output=True, text=True, check=True,
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            commit = None
+        return {
+            'commit': commit,
+            'date': timezone.now().isoformat(),
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'database': connection.vendor,
+            'project': fixtures['project'].project_id,
+            'iterations': options['iterations'],
+            'volumes': {
+                'users': CustomUser.objects.count(),
+                'projects': Project.objects.count(),
+                'contributors': Contributor.objects.count(),
+                'issues': Issue.objects.count(),
+                'comments': Comment.objects.count(),
+            },
+            'uncovered_urls': uncovered,
+        }
+
+    def write_result(self, name, result):
+        statuses = ','.join(result['status_codes'])
+        self.stdout.write(
+            f"{name:<26} {statuses:>8} p50 {result['p50_ms']:>8.2f} ms  p95 {result['p95_ms']:>8.2f} ms  "
+            f"{result['queries']:>4} req. SQL  {result['peak_memory_kb']:>9.1f} Ko"
+        )
+
+    def compare(self, path, results):
+        try:
+            with open(path, encoding='utf-8') as previous_file:
+                previous = json.load(previous_file)
+        except (OSError, ValueError) as exc:
+            raise CommandError(f"Impossible de lire {path} : {exc}")
+        self.stdout.write(f"\nComparaison avec {path} (commit {previous['meta'].get('commit')}) :")
+        for name, result in results.items():
+            before = previous['results'].get(name)
+            if before is None:
+                continue
+            delta = (result['p50_ms'] - before['p50_ms']) / before['p50_ms'] * 100 if before['p50_ms'] else 0.0
+            self.stdout.write(
+                f"{name:<26} p50 {before['p50_ms']:>8.2f} → {result['p50_ms']:>8.2f} ms ({delta:+6.1f} %)  "
+                f"req. SQL {before['queries']:>4} → {result['queries']:>4}"
+            )
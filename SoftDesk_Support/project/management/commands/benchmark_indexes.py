@@ -0,0 +1,123 @@
+import random
+import time
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from authentication.models import CustomUser
+from project.models import Project, Contributor, Issue, Comment
+
+# Index composites mesurés (migration 0012_hot_path_indexes) : les autres index, dont ceux de la pagination
+# par curseur (0011), restent en place pendant la mesure de référence.
+BENCHMARKED_INDEXES = {
+    Contributor: ('contributor_user_project_idx',),
+    Issue: ('issue_project_status_idx',),
+}
+
+
+class Command(BaseCommand):
+    """
+    Compare les plans d'exécution des requêtes fréquentes sans puis avec les index composites des chemins chauds.
+
+    Le jeu de données est créé dans une transaction annulée à la fin : la base n'est pas modifiée.
+    """
+    help = "Affiche les plans et durées des requêtes fréquentes, sans puis avec les index composites."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--issues', type=int, default=1_000_000, help="Nombre d'issues à générer.")
+        parser.add_argument('--comments', type=int, default=100_000, help="Nombre de commentaires à générer.")
+        parser.add_argument('--projects', type=int, default=1_000, help="Nombre de projets à générer.")
+        parser.add_argument('--users', type=int, default=200, help="Nombre d'utilisateurs à générer.")
+        parser.add_argument('--repeat', type=int, default=20, help="Nombre d'exécutions par requête mesurée.")
+
+    def handle(self, *args, **options):
+        # SQLite n'ouvre un éditeur de schéma dans une transaction que si les contraintes de clés étrangères
+        # ont été désactivées avant son début.
+        with connection.constraint_checks_disabled(), transaction.atomic():
+            self.seed(options)
+            project_id = Project.objects.values_list('project_id', flat=True).first()
+            issue_id = Comment.objects.values_list('issue_id', flat=True).first()
+            user_id = Contributor.objects.values_list('contributor_id', flat=True).first()
+            queries = [
+                ("Liste des issues d'un projet",
+                 Issue.objects.filter(project_id=project_id).order_by('-created_time', '-pk')[:6]),
+                ("Issues par statut et priorité",
+                 Issue.objects.filter(project_id=project_id, status='TO_DO', priority='HIGH')),
+                ("Liste des commentaires d'une issue",
+                 Comment.objects.filter(issue_id=issue_id).order_by('-created_time', '-pk')[:6]),
+                ("Appartenance à un projet",
+                 Contributor.objects.filter(project_id=project_id, contributor_id=user_id)),
+                ("Projets d'un contributeur",
+                 Contributor.objects.filter(contributor_id=user_id).values('project_id')),
+            ]
+
+            self.set_indexes(enabled=False)
+            self.report("Sans index composites", queries, options['repeat'])
+            self.set_indexes(enabled=True)
+            self.report("Avec index composites", queries, options['repeat'])
+            transaction.set_rollback(True)
+
+    def seed(self, options):
+        start = time.perf_counter()
+        users = CustomUser.objects.bulk_create(
+            CustomUser(username=f'bench_{index}', date_of_birth='1990-01-01') for index in range(options['users'])
+        )
+        projects = Project.objects.bulk_create(
+            Project(
+                project_id=f'benchmark_{index}',
+                name=f'Benchmark {index}',
+                description='Benchmark',
+                project_type='Backend',
+                author=random.choice(users),
+            )
+            for index in range(options['projects'])
+        )
+        Contributor.objects.bulk_create(
+            (Contributor(project=project, contributor=user)
+             for project in projects for user in random.sample(users, 5)),
+            batch_size=5_000,
+        )
+        Issue.objects.bulk_create(
+            (Issue(
+                project=random.choice(projects),
+                author=random.choice(users),
+                title='Issue',
+                description='Benchmark',
+                status=random.choice(Issue.STATUS_CHOICES)[0],
+                priority=random.choice(Issue.PRIORITY_CHOICES)[0],
+            ) for _ in range(options['issues'])),
+            batch_size=5_000,
+        )
+        issue_ids = list(Issue.objects.values_list('issue_id', flat=True)[:max(1, options['comments'] // 10)])
+        Comment.objects.bulk_create(
+            (Comment(issue_id=random.choice(issue_ids), author=random.choice(users), name='Comment',
+                     description='Benchmark')
+             for _ in range(options['comments'])),
+            batch_size=5_000,
+        )
+        with connection.cursor() as cursor:
+            if connection.vendor in ('sqlite', 'postgresql'):
+                cursor.execute('ANALYZE')
+        self.stdout.write(f"Jeu de données généré en {time.perf_counter() - start:.1f} s.")
+
+    def set_indexes(self, enabled):
+        with connection.schema_editor() as editor:
+            for model, names in BENCHMARKED_INDEXES.items():
+                for index in model._meta.indexes:
+                    if index.name not in names:
+                        continue
+                    if enabled:
+                        editor.add_index(model, index)
+                    else:
+                        editor.remove_index(model, index)
+        with connection.cursor() as cursor:
+            if connection.vendor in ('sqlite', 'postgresql'):
+                cursor.execute('ANALYZE')
+
+    def report(self, title, queries, repeat):
+        self.stdout.write(self.style.MIGRATE_HEADING(f"\n== {title}"))
+        for label, queryset in queries:
+            start = time.perf_counter()
+            for _ in range(repeat):
+                list(queryset.all())
+            elapsed = (time.perf_counter() - start) / repeat * 1000
+            self.stdout.write(self.style.SUCCESS(f"{label} : {elapsed:.2f} ms"))
+            self.stdout.write(f"    {queryset.explain()}".replace('\n', '\n    '))
@@ -0,0 +1,41 @@
+import time
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from project.models import Project
+
+
+class Command(BaseCommand):
+    """
+    Mesure le coût de création de projets partageant les mêmes initiales.
+
+    Les projets sont créés dans une transaction annulée à la fin : la base n'est pas modifiée.
+    """
+    help = "Crée N projets aux initiales identiques et affiche le temps de création par lot."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--count', type=int, default=100_000, help="Nombre de projets à créer.")
+        parser.add_argument('--batch', type=int, default=10_000, help="Taille des lots mesurés.")
+        parser.add_argument('--name', default='Benchmark Project', help="Nom commun des projets.")
+
+    def handle(self, *args, **options):
+        count, batch, name = options['count'], options['batch'], options['name']
+        total_start = time.perf_counter()
+
+        with transaction.atomic():
+            batch_start = time.perf_counter()
+            for index in range(1, count + 1):
+                Project.objects.create(name=name, description=name, project_type='Backend')
+                if index % batch == 0 or index == count:
+                    elapsed = time.perf_counter() - batch_start
+                    size = batch if index % batch == 0 else index % batch
+                    self.stdout.write(
+                        f"{index:>10} projets  {elapsed:8.2f} s  {elapsed / size * 1_000_000:8.1f} µs/projet"
+                    )
+                    batch_start = time.perf_counter()
+            last_id = Project.objects.order_by('-created_time').values_list('project_id', flat=True).first()
+            transaction.set_rollback(True)
+
+        total = time.perf_counter() - total_start
+        self.stdout.write(self.style.SUCCESS(
+            f"{count} projets créés en {total:.2f} s (dernier identifiant : {last_id}), transaction annulée."
+        ))
@@ -0,0 +1,25 @@
+from datetime import timedelta
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from project.changes import compact_changes, purge_changes
+
+
+class Command(BaseCommand):
+    """
+    Borne le journal des modifications : compactage (une entrée par objet, projets supprimés écartés) puis
+    rétention des entrées plus anciennes que `--days` jours. À planifier, par exemple chaque nuit.
+    """
+    help = "Compacte le journal des modifications et supprime les entrées qui dépassent la durée de rétention."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=getattr(settings, 'CHANGE_LOG_RETENTION_DAYS', 30),
+                            help="Durée de rétention en jours (CHANGE_LOG_RETENTION_DAYS par défaut).")
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            compacted = compact_changes()
+        purged = purge_changes(timezone.now() - timedelta(days=options['days']))
+        self.stdout.write(f"{compacted} entrée(s) compactée(s), {purged} entrée(s) hors rétention supprimée(s).")
+        self.stdout.write(self.style.SUCCESS("Journal des modifications compacté."))
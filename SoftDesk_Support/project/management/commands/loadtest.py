@@ -0,0 +1,124 @@
+import asyncio
+import statistics
+import time
+from urllib.parse import urlsplit
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework_simplejwt.tokens import AccessToken
+from authentication.models import CustomUser
+
+
+async def _read_response(reader):
+    """
+    Lit une réponse HTTP/1.1 (corps de longueur connue) et retourne (statut, garder la connexion).
+    """
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError("Connexion fermée par le serveur.")
+    status = int(status_line.split()[1])
+    length, keep_alive = 0, True
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        name, value = name.strip().lower(), value.strip().lower()
+        if name == 'content-length':
+            length = int(value)
+        elif name == 'connection' and value == 'close':
+            keep_alive = False
+    await reader.readexactly(length)
+    return status, keep_alive
+
+
+async def _client(url, token, deadline, think_time, latencies, errors):
+    """
+    Client HTTP minimal : une connexion persistante, une requête à la fois jusqu'à l'échéance.
+    """
+    parts = urlsplit(url)
+    host, port = parts.hostname, parts.port or 80
+    target = parts.path + (f'?{parts.query}' if parts.query else '')
+    request = (
+        f"GET {target} HTTP/1.1\r\nHost: {parts.netloc}\r\nAuthorization: Bearer {token}\r\n"
+        "Accept: application/json\r\nConnection: keep-alive\r\n\r\n"
+    ).encode()
+    reader = writer = None
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            if writer is None:
+                reader, writer = await asyncio.open_connection(host, port)
+            writer.write(request)
+            await writer.drain()
+            status, keep_alive = await _read_response(reader)
+        except (OSError, ConnectionError, ValueError, IndexError, asyncio.IncompleteReadError):
+            errors.append('connexion')
+            if writer is not None:
+                writer.close()
+            reader = writer = None
+            await asyncio.sleep(0.05)
+            continue
+        latencies.append(time.perf_counter() - start)
+        if status != 200:
+            errors.append(status)
+        if not keep_alive:
+            writer.close()
+            reader = writer = None
+        if think_time:
+            await asyncio.sleep(think_time)
+    if writer is not None:
+        writer.close()
+
+
+async def _run(url, token, concurrency, duration, think_time):
+    latencies, errors = [], []
+    deadline = time.perf_counter() + duration
+    await asyncio.gather(*(
+        _client(url, token, deadline, think_time, latencies, errors) for _ in range(concurrency)
+    ))
+    return latencies, errors
+
+
+class Command(BaseCommand):
+    """
+    Compare le débit des vues synchrones servies en WSGI et des vues asynchrones servies en ASGI.
+
+    Les deux serveurs sont lancés séparément, par exemple :
+        python manage.py runserver 8000
+        uvicorn SoftDesk_Support.asgi:application --port 8001
+    """
+    help = "Envoie des requêtes GET concurrentes aux points d'entrée WSGI et ASGI et affiche débit et latences."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--wsgi', default='http://127.0.0.1:8000/api/projects/',
+                            help="URL servie par le serveur WSGI (vues synchrones).")
+        parser.add_argument('--asgi', default='http://127.0.0.1:8001/api/async/projects/',
+                            help="URL servie par le serveur ASGI (vues asynchrones).")
+        parser.add_argument('--username', required=True, help="Utilisateur pour lequel le jeton d'accès est émis.")
+        parser.add_argument('--concurrency', type=int, default=50, help="Nombre de clients simultanés.")
+        parser.add_argument('--duration', type=float, default=10.0, help="Durée de chaque mesure (secondes).")
+        parser.add_argument('--think-time', type=float, default=0.0,
+                            help="Pause de chaque client entre deux requêtes (secondes) : simule des clients lents.")
+
+    def handle(self, *args, **options):
+        try:
+            user = CustomUser.objects.get(username=options['username'])
+        except CustomUser.DoesNotExist:
+            raise CommandError(f"Utilisateur inconnu : {options['username']}")
+        token = str(AccessToken.for_user(user))
+
+        self.stdout.write(
+            f"{'cible':<6} {'requêtes':>9} {'erreurs':>8} {'req/s':>9} {'p50 (ms)':>9} {'p95 (ms)':>9}"
+        )
+        for label in ('wsgi', 'asgi'):
+            latencies, errors = asyncio.run(_run(
+                options[label], token, options['concurrency'], options['duration'], options['think_time']
+            ))
+            if len(latencies) >= 2:
+                quantiles = statistics.quantiles(latencies, n=20)
+                p50, p95 = quantiles[9] * 1000, quantiles[18] * 1000
+            else:
+                p50 = p95 = float('nan')
+            self.stdout.write(
+                f"{label:<6} {len(latencies):>9} {len(errors):>8} {len(latencies) / options['duration']:>9.1f} "
+                f"{p50:>9.1f} {p95:>9.1f}"
+            )
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from project.counters import reconcile_counters
+from project.response_cache import get_response_cache
+
+
+class Command(BaseCommand):
+    """
+    Recalcule les compteurs dénormalisés (issues, issues ouvertes, contributeurs, commentaires) qui ont dérivé,
+    par exemple après des écritures SQL directes ou une restauration partielle.
+    """
+    help = "Corrige les compteurs dénormalisés des projets et des issues à partir des lignes existantes."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--project', action='append', dest='projects',
+                            help="Limite la correction à ce projet (répétable).")
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            fixed = reconcile_counters(options['projects'])
+
+        if any(fixed.values()):
+            # Les UPDATE n'émettent pas post_save : les réponses mises en cache sont écartées en bloc.
+            response_cache = get_response_cache()
+            if response_cache is not None:
+                response_cache.clear()
+        for field, count in fixed.items():
+            self.stdout.write(f"{field:<18} {count:>8} ligne(s) corrigée(s)")
+        self.stdout.write(self.style.SUCCESS("Compteurs réconciliés."))
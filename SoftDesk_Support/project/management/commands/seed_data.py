@@ -0,0 +1,153 @@
+import random
+import time
+from datetime import date, timedelta
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from authentication.models import CustomUser
+from project.changes import record_changes
+from project.models import Project, Contributor, Issue, Comment, Change
+from project.response_cache import get_response_cache
+
+WORDS = (
+    'alpha', 'beta', 'gamma', 'delta', 'portail', 'client', 'paiement', 'catalogue', 'mobile', 'tableau',
+    'rapport', 'export', 'import', 'synchro', 'compte', 'facture', 'stock', 'agenda', 'messagerie', 'recherche',
+)
+
+
+def sentence(rng, words):
+    return ' '.join(rng.choice(WORDS) for _ in range(words)).capitalize()
+
+
+class Command(BaseCommand):
+    """
+    Génère un jeu de données synthétique : utilisateurs, projets, contributeurs, issues et commentaires.
+
+    Les lignes sont insérées par bulk_create en paquets ; le mot de passe n'est haché qu'une fois pour tous
+    les utilisateurs. bulk_create n'appelant pas save(), les project_id sont alloués par lot sur les compteurs
+    et les compteurs dénormalisés sont calculés avant l'insertion ; les créations sont journalisées en masse
+    dans le journal des modifications.
+    """
+    help = "Insère des volumes configurables de données synthétiques pour les mesures de performance."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=100, help="Nombre d'utilisateurs.")
+        parser.add_argument('--projects', type=int, default=50, help="Nombre de projets.")
+        parser.add_argument('--contributors', type=int, default=5, help="Contributeurs par projet.")
+        parser.add_argument('--issues', type=int, default=50, help="Issues par projet.")
+        parser.add_argument('--comments', type=int, default=3, help="Commentaires par issue.")
+        parser.add_argument('--batch-size', type=int, default=1000, help="Taille des paquets de bulk_create.")
+        parser.add_argument('--random-seed', type=int, default=0, help="Graine : deux exécutions identiques "
+                                                                       "produisent les mêmes données.")
+        parser.add_argument('--prefix', default='seed', help="Préfixe des noms d'utilisateurs générés.")
+        parser.add_argument('--password', default='S3cret-password!', help="Mot de passe des utilisateurs.")
+
+    def handle(self, *args, **options):
+        if options['users'] < 1:
+            raise CommandError("Il faut au moins un utilisateur.")
+        if options['contributors'] > options['users']:
+            raise CommandError("Le nombre de contributeurs par projet dépasse le nombre d'utilisateurs.")
+        rng = random.Random(options['random_seed'])
+        batch_size = options['batch_size']
+        start = time.perf_counter()
+
+        with transaction.atomic():
+            users = self.create_users(rng, options)
+            user_ids = [user.pk for user in users]
+
+            projects = [
+                Project(
+                    name=sentence(rng, 2),
+                    description=sentence(rng, 8),
+                    project_type=rng.choice(Project.PROJECT_TYPES)[0],
+                    author_id=rng.choice(user_ids),
+                )
+                for _ in range(options['projects'])
+            ]
+            Project.allocate_project_ids(projects)
+
+            members = {}
+            contributors = []
+            for project in projects:
+                members[project.pk] = rng.sample(user_ids, options['contributors'])
+                contributors.extend(
+                    Contributor(project_id=project.pk, contributor_id=user_id) for user_id in members[project.pk]
+                )
+
+            issues = []
+            for project in projects:
+                people = members[project.pk] + [project.author_id]
+                project_issues = [
+                    Issue(
+                        project_id=project.pk,
+                        author_id=rng.choice(people),
+                        assigned_to_id=rng.choice(people + [None]),
+                        title=sentence(rng, 4),
+                        description=sentence(rng, 12),
+                        priority=rng.choice(Issue.PRIORITY_CHOICES)[0],
+                        tag=rng.choice(Issue.TAG_CHOICES)[0],
+                        status=rng.choice(Issue.STATUS_CHOICES)[0],
+                        comment_count=options['comments'],
+                    )
+                    for _ in range(options['issues'])
+                ]
+                project.issue_count = len(project_issues)
+                project.open_issue_count = sum(issue.is_open for issue in project_issues)
+                project.contributor_count = len(members[project.pk])
+                issues.extend(project_issues)
+
+            Project.objects.bulk_create(projects, batch_size=batch_size)
+            Contributor.objects.bulk_create(contributors, batch_size=batch_size)
+            Issue.objects.bulk_create(issues, batch_size=batch_size)
+
+            comments = []
+            for issue in issues:
+                people = members[issue.project_id] + [issue.author_id]
+                comments.extend(
+                    Comment(
+                        issue_id=issue.pk,
+                        author_id=rng.choice(people),
+                        name=sentence(rng, 3),
+                        description=sentence(rng, 10),
+                    )
+                    for _ in range(options['comments'])
+                )
+            Comment.objects.bulk_create(comments, batch_size=batch_size)
+
+            issue_projects = {issue.pk: issue.project_id for issue in issues}
+            for object_type, keys in (
+                ('project', [(project.pk, project.pk) for project in projects]),
+                ('contributor', [(member.project_id, member.contributor_id) for member in contributors]),
+                ('issue', [(issue.project_id, issue.pk) for issue in issues]),
+                ('comment', [(issue_projects[comment.issue_id], comment.comment_id) for comment in comments]),
+            ):
+                record_changes(object_type, keys, Change.CREATE, batch_size=batch_size)
+
+        # bulk_create n'émet pas post_save : les réponses mises en cache sont écartées en bloc.
+        response_cache = get_response_cache()
+        if response_cache is not None:
+            response_cache.clear()
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{len(users)} utilisateurs, {len(projects)} projets, {len(contributors)} contributeurs, "
+            f"{len(issues)} issues et {len(comments)} commentaires créés en {time.perf_counter() - start:.2f} s."
+        ))
+
+    def create_users(self, rng, options):
+        prefix = options['prefix']
+        offset = CustomUser.objects.filter(username__startswith=prefix).count()
+        password = make_password(options['password'])
+        users = [
+            CustomUser(
+                username=f'{prefix}{offset + index}',
+                password=password,
+                email=f'{prefix}{offset + index}@example.com',
+                date_of_birth=date(1970, 1, 1) + timedelta(days=rng.randrange(30 * 365)),
+                can_be_contacted=rng.random() < 0.5,
+                can_data_be_shared=rng.random() < 0.5,
+            )
+            for index in range(options['users'])
+        ]
+        if any(len(user.username) > CustomUser._meta.get_field('username').max_length for user in users):
+            raise CommandError("Préfixe trop long pour le nombre d'utilisateurs demandé.")
+        return CustomUser.objects.bulk_create(users, batch_size=options['batch_size'])
@@ -0,0 +1,182 @@
+import uuid
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Q
+from django.http import Http404
+from django.shortcuts import get_object_or_404
+from .models import Project, Contributor
+
+AUTHOR = 'author'
+CONTRIBUTOR = 'contributor'
+NO_ROLE = ''
+
+
+class Membership:
+    """
+    Rôle d'un utilisateur sur un projet, résolu une seule fois par requête.
+
+    Le projet n'est chargé que lorsqu'il est demandé : un rôle trouvé dans le cache suffit aux permissions.
+    """
+
+    def __init__(self, project_id, role, project=None):
+        self.project_id = project_id
+        self.role = role
+        self._project = project
+
+    @property
+    def project(self):
+        if self._project is None:
+            self._project = get_object_or_404(Project, project_id=self.project_id)
+        return self._project
+
+    @property
+    def is_author(self):
+        return self.role == AUTHOR
+
+    @property
+    def is_member(self):
+        return self.role in (AUTHOR, CONTRIBUTOR)
+
+
+def _cache_timeout():
+    return getattr(settings, 'MEMBERSHIP_CACHE_TIMEOUT', 0)
+
+
+def _version_key(project_id):
+    return f'membership:version:{project_id}'
+
+
+def _role_key(project_id, user_id):
+    return f'membership:role:{project_id}:{user_id}'
+
+
+def member_projects_q(user, project_field='project'):
+    """
+    Filtre les lignes dont le projet (relation `project_field`) a l'utilisateur pour auteur ou contributeur.
+    Les deux conditions sont des recherches indexées : ni les contributeurs ni les projets ne sont parcourus.
+    """
+    return Q(**{f'{project_field}__author': user}) | Q(**{
+        f'{project_field}__in': Contributor.objects.filter(contributor=user).values('project_id'),
+    })
+
+
+def _new_version():
+    return uuid.uuid4().hex
+
+
+def invalidate_membership_cache(project_id):
+    """
+    Invalide tous les rôles mis en cache pour un projet en changeant sa version.
+    Les rôles expirent de toute façon après MEMBERSHIP_CACHE_TIMEOUT secondes.
+    """
+    if _cache_timeout():
+        cache.set(_version_key(project_id), _new_version(), None)
+
+
+def _seed_version(version_key):
+    """
+    Version d'un projet dont la clé manque (jamais écrite, ou évincée du cache) : une valeur aléatoire neuve,
+    qu'aucun rôle déjà en cache ne porte. Une version déjà posée par une requête concurrente est reprise.
+    """
+    version = _new_version()
+    if cache.add(version_key, version, None):
+        return version
+    return cache.get(version_key, version)
+
+
+async def _aseed_version(version_key):
+    version = _new_version()
+    if await cache.aadd(version_key, version, None):
+        return version
+    return await cache.aget(version_key, version)
+
+
+def _resolve(project_id, user):
+    """
+    Charge le projet et détermine le rôle de l'utilisateur, en consultant le cache inter-requêtes s'il est actif.
+    """
+    timeout = _cache_timeout()
+    role_key = _role_key(project_id, user.id)
+    version_key = _version_key(project_id)
+
+    if timeout and user.is_authenticated:
+        cached = cache.get_many([role_key, version_key])
+        version = cached.get(version_key)
+        if version is None:
+            version = _seed_version(version_key)
+        elif role_key in cached and cached[role_key][0] == version:
+            return Membership(project_id, cached[role_key][1])
+
+    project = get_object_or_404(Project, project_id=project_id)
+    if not user.is_authenticated:
+        role = NO_ROLE
+    elif project.author_id == user.id:
+        role = AUTHOR
+    elif Contributor.objects.filter(project_id=project_id, contributor_id=user.id).exists():
+        role = CONTRIBUTOR
+    else:
+        role = NO_ROLE
+
+    if timeout and user.is_authenticated:
+        cache.set(role_key, (version, role), timeout)
+    return Membership(project_id, role, project)
+
+
+def get_membership(request, project_id):
+    """
+    Retourne le rôle de l'utilisateur de la requête sur le projet, mémorisé sur la requête.
+
+    Les classes de permission composées (IsAuthor | IsContributor | ...) et la vue partagent ainsi
+    le même chargement du projet.
+    """
+    memberships = getattr(request, '_memberships', None)
+    if memberships is None:
+        memberships = request._memberships = {}
+    if project_id not in memberships:
+        memberships[project_id] = _resolve(project_id, request.user)
+    return memberships[project_id]
+
+
+async def _aresolve(project_id, user):
+    """
+    Équivalent asynchrone de `_resolve`, pour les vues ASGI : cache et base sont interrogés sans bloquer.
+    """
+    timeout = _cache_timeout()
+    role_key = _role_key(project_id, user.id)
+    version_key = _version_key(project_id)
+
+    if timeout and user.is_authenticated:
+        cached = await cache.aget_many([role_key, version_key])
+        version = cached.get(version_key)
+        if version is None:
+            version = await _aseed_version(version_key)
+        elif role_key in cached and cached[role_key][0] == version:
+            return Membership(project_id, cached[role_key][1])
+
+    project = await Project.objects.filter(project_id=project_id).afirst()
+    if project is None:
+        raise Http404("No Project matches the given query.")
+    if not user.is_authenticated:
+        role = NO_ROLE
+    elif project.author_id == user.id:
+        role = AUTHOR
+    elif await Contributor.objects.filter(project_id=project_id, contributor_id=user.id).aexists():
+        role = CONTRIBUTOR
+    else:
+        role = NO_ROLE
+
+    if timeout and user.is_authenticated:
+        await cache.aset(role_key, (version, role), timeout)
+    return Membership(project_id, role, project)
+
+
+async def aget_membership(request, project_id):
+    """
+    Équivalent asynchrone de `get_membership`, mémorisé de la même façon sur la requête.
+    """
+    memberships = getattr(request, '_memberships', None)
+    if memberships is None:
+        memberships = request._memberships = {}
+    if project_id not in memberships:
+        memberships[project_id] = await _aresolve(project_id, request.user)
+    return memberships[project_id]
@@ -0,0 +1,43 @@
+# Generated by Django 5.0.6 on 2026-10-18 19:17
+
+import re
+
+from django.db import migrations, models
+
+PROJECT_ID_PATTERN = re.compile(r'^(?P<prefix>.+?)(?:_(?P<suffix>\d+))?$')
+
+
+def seed_counters(apps, schema_editor):
+    """
+    Initialise les compteurs à partir des identifiants de projet existants.
+    """
+    Project = apps.get_model('project', 'Project')
+    ProjectIdCounter = apps.get_model('project', 'ProjectIdCounter')
+    counters = {}
+    for project_id in Project.objects.values_list('project_id', flat=True).iterator():
+        match = PROJECT_ID_PATTERN.match(project_id)
+        suffix = match.group('suffix')
+        value = int(suffix) + 1 if suffix else 1
+        prefix = match.group('prefix')
+        counters[prefix] = max(counters.get(prefix, 0), value)
+    ProjectIdCounter.objects.bulk_create(
+        ProjectIdCounter(prefix=prefix, last_value=value) for prefix, value in counters.items()
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('project', '0009_remove_issue_id_alter_comment_author_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProjectIdCounter',
+            fields=[
+                ('prefix', models.CharField(max_length=50, primary_key=True, serialize=False)),
+                ('last_value', models.PositiveBigIntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(seed_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,65 @@
+from django.db import migrations
+
+# Index plein texte SQLite FTS5 à contenu externe, figé à l'état de cette migration : le code de recherche
+# (project.search) peut évoluer sans modifier ce qu'elle crée.
+CREATE_SQL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS project_issue_fts USING fts5("
+    "title, description, content='project_issue', content_rowid='issue_id', "
+    "tokenize='unicode61 remove_diacritics 2')",
+    "INSERT INTO project_issue_fts(project_issue_fts) VALUES ('rebuild')",
+    "CREATE TRIGGER IF NOT EXISTS project_issue_fts_ai AFTER INSERT ON project_issue BEGIN "
+    "INSERT INTO project_issue_fts(rowid, title, description) VALUES (new.issue_id, new.title, new.description); "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS project_issue_fts_ad AFTER DELETE ON project_issue BEGIN "
+    "INSERT INTO project_issue_fts(project_issue_fts, rowid, title, description) "
+    "VALUES ('delete', old.issue_id, old.title, old.description); "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS project_issue_fts_au AFTER UPDATE OF title, description ON project_issue BEGIN "
+    "INSERT INTO project_issue_fts(project_issue_fts, rowid, title, description) "
+    "VALUES ('delete', old.issue_id, old.title, old.description); "
+    "INSERT INTO project_issue_fts(rowid, title, description) VALUES (new.issue_id, new.title, new.description); "
+    "END",
+    "CREATE VIRTUAL TABLE IF NOT EXISTS project_comment_fts USING fts5("
+    "name, description, content='project_comment', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2')",
+    "INSERT INTO project_comment_fts(project_comment_fts) VALUES ('rebuild')",
+    "CREATE TRIGGER IF NOT EXISTS project_comment_fts_ai AFTER INSERT ON project_comment BEGIN "
+    "INSERT INTO project_comment_fts(rowid, name, description) VALUES (new.id, new.name, new.description); "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS project_comment_fts_ad AFTER DELETE ON project_comment BEGIN "
+    "INSERT INTO project_comment_fts(project_comment_fts, rowid, name, description) "
+    "VALUES ('delete', old.id, old.name, old.description); "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS project_comment_fts_au AFTER UPDATE OF name, description ON project_comment BEGIN "
+    "INSERT INTO project_comment_fts(project_comment_fts, rowid, name, description) "
+    "VALUES ('delete', old.id, old.name, old.description); "
+    "INSERT INTO project_comment_fts(rowid, name, description) VALUES (new.id, new.name, new.description); "
+    "END",
+]
+
+DROP_SQL = [
+    f"DROP {kind} IF EXISTS {name}"
+    for table in ('project_issue_fts', 'project_comment_fts')
+    for kind, name in [('TRIGGER', f'{table}_{suffix}') for suffix in ('ai', 'ad', 'au')] + [('TABLE', table)]
+]
+
+
+def run_sql(statements):
+    def run(apps, schema_editor):
+        # FTS5 n'existe que sous SQLite : ailleurs, la recherche se replie sur icontains.
+        if schema_editor.connection.vendor != 'sqlite':
+            return
+        for statement in statements:
+            schema_editor.execute(statement, params=None)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('project', '0012_hot_path_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(run_sql(CREATE_SQL), run_sql(DROP_SQL)),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.0.6 on 2026-10-18 19:33
+
+import project.models
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('project', '0015_issue_comment_updated_time'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='comment',
+            name='author',
+            field=models.ForeignKey(
+                on_delete=models.SET(project.models.get_admin_user),
+                related_name='comment_authors',
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+    ]
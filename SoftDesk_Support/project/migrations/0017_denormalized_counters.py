@@ -0,0 +1,60 @@
+# Generated by Django 5.0.6 on 2026-10-18 19:58
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def count_subquery(model, foreign_key, **filters):
+    counts = (
+        model.objects.filter(**{foreign_key: OuterRef('pk')}, **filters)
+        .order_by().values(foreign_key).annotate(total=Count('pk')).values('total')
+    )
+    return Coalesce(Subquery(counts, output_field=IntegerField()), Value(0))
+
+
+def fill_counters(apps, schema_editor):
+    """
+    Initialise les compteurs à partir des lignes existantes.
+    """
+    Project = apps.get_model('project', 'Project')
+    Contributor = apps.get_model('project', 'Contributor')
+    Issue = apps.get_model('project', 'Issue')
+    Comment = apps.get_model('project', 'Comment')
+    Project.objects.update(
+        issue_count=count_subquery(Issue, 'project'),
+        open_issue_count=count_subquery(Issue, 'project', status__in=('TO_DO', 'IN_PROGRESS')),
+        contributor_count=count_subquery(Contributor, 'project'),
+    )
+    Issue.objects.update(comment_count=count_subquery(Comment, 'issue'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('project', '0016_comment_author_set_admin'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='issue',
+            name='comment_count',
+            field=models.IntegerField(default=0, editable=False, verbose_name='nombre de commentaires'),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='contributor_count',
+            field=models.IntegerField(default=0, editable=False, verbose_name='nombre de contributeurs'),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='issue_count',
+            field=models.IntegerField(default=0, editable=False, verbose_name="nombre d'issues"),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='open_issue_count',
+            field=models.IntegerField(default=0, editable=False, verbose_name="nombre d'issues ouvertes"),
+        ),
+        migrations.RunPython(fill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.0.6 on 2026-10-18 20:03
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def fill_finished_time(apps, schema_editor):
+    """
+    Les issues déjà terminées n'ont pas de date de passage à FINISHED : leur dernière mise à jour en tient lieu.
+    """
+    Issue = apps.get_model('project', 'Issue')
+    Issue.objects.filter(status='FINISHED').update(finished_time=F('updated_time'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('project', '0017_denormalized_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='issue',
+            name='finished_time',
+            field=models.DateTimeField(
+                blank=True, editable=False, null=True, verbose_name='date de passage à FINISHED'
+            ),
+        ),
+        migrations.RunPython(fill_finished_time, migrations.RunPython.noop),
+    ]
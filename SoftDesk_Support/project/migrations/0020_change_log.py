@@ -0,0 +1,48 @@
+# Generated by Django 5.0.6 on 2026-10-18 20:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('project', '0019_user_feed_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChangeHorizon',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('token', models.PositiveBigIntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='Change',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('project_id', models.CharField(max_length=50)),
+                ('object_type', models.CharField(
+                    choices=[
+                        ('project', 'project'),
+                        ('contributor', 'contributor'),
+                        ('issue', 'issue'),
+                        ('comment', 'comment'),
+                    ],
+                    max_length=11,
+                )),
+                ('object_id', models.CharField(max_length=50)),
+                ('action', models.CharField(
+                    choices=[('create', 'create'), ('update', 'update'), ('delete', 'delete')],
+                    max_length=6,
+                )),
+                ('created_time', models.DateTimeField(auto_now_add=True, verbose_name='date de la modification')),
+            ],
+            options={
+                'indexes': [
+                    models.Index(fields=['project_id', 'id'], name='change_project_idx'),
+                    models.Index(fields=['object_type', 'object_id', 'id'], name='change_object_idx'),
+                ],
+            },
+        ),
+    ]
@@ -1,4 +1,5 @@
-from django.db import models
+from django.db import models, transaction, IntegrityError
+from django.db.models.functions import Greatest
 import uuid
 from django.conf import settings
 from authentication.models import CustomUser
@@ -17,6 +18,39 @@ def get_admin_user():
         return None
 
 
+class ProjectIdCounter(models.Model):
+    """
+    Compteur par préfixe utilisé pour allouer les identifiants de projet.
+
+    `last_value` est le nombre d'identifiants déjà alloués pour le préfixe : 1 correspond au préfixe seul,
+    n au préfixe suivi de `_{n - 1}`.
+    """
+
+    prefix = models.CharField(max_length=50, primary_key=True)
+
+    last_value = models.PositiveBigIntegerField(default=0)
+
+    @classmethod
+    def next_value(cls, prefix, count=1):
+        """
+        Incrémente atomiquement le compteur du préfixe de `count` et retourne sa nouvelle valeur :
+        les valeurs allouées vont de `valeur - count + 1` à `valeur`.
+        """
+        with transaction.atomic():
+            if not cls.objects.filter(prefix=prefix).update(last_value=models.F('last_value') + count):
+                try:
+                    with transaction.atomic():
+                        cls.objects.create(prefix=prefix, last_value=count)
+                    return count
+                except IntegrityError:
+                    # Un autre processus vient de créer le compteur.
+                    cls.objects.filter(prefix=prefix).update(last_value=models.F('last_value') + count)
+            return cls.objects.values_list('last_value', flat=True).get(prefix=prefix)
+
+    def __str__(self):
+        return f"{self.prefix} ({self.last_value})"
+
+
 class Project(models.Model):
     """
     Modèle représentant un projet.
@@ -64,24 +98,49 @@ class Project(models.Model):
         help_text='Contributeurs du projet'
     )
 
+    # Compteurs dénormalisés, tenus à jour par les signaux (voir project.counters).
+    issue_count = models.IntegerField(default=0, editable=False, verbose_name="nombre d'issues")
+
+    open_issue_count = models.IntegerField(default=0, editable=False, verbose_name="nombre d'issues ouvertes")
+
+    contributor_count = models.IntegerField(default=0, editable=False, verbose_name="nombre de contributeurs")
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['created_time', 'project_id'], name='project_created_idx'),
+        ]
+
+    @staticmethod
+    def base_project_id(name):
+        initials = ''.join([word[0].upper() for word in name.split()])
+        return f"project_{initials}"
+
+    @staticmethod
+    def format_project_id(base_id, value):
+        if value == 1:
+            return base_id
+        return f"{base_id}_{value - 1}"
+
     def generate_project_id(self):
         """
         Génère un identifiant unique pour le projet basé sur ses initiales.
+        Le suffixe est alloué par le compteur du préfixe, en temps constant.
         """
-        initials = ''.join([word[0].upper() for word in self.name.split()])
-        base_id = f"project_{initials}"
-        similar_ids = Project.objects.filter(project_id__startswith=base_id).values_list('project_id', flat=True)
-
-        if not similar_ids:
-            return base_id
+        base_id = self.base_project_id(self.name)
+        return self.format_project_id(base_id, ProjectIdCounter.next_value(base_id))
 
-        suffix = 1
-        new_id = f"{base_id}_{suffix}"
-        while new_id in similar_ids:
-            suffix += 1
-            new_id = f"{base_id}_{suffix}"
-
-        return new_id
+    @classmethod
+    def allocate_project_ids(cls, projects):
+        """
+        Attribue un project_id aux projets d'un bulk_create, avec une incrémentation du compteur par préfixe.
+        """
+        by_prefix = {}
+        for project in projects:
+            by_prefix.setdefault(cls.base_project_id(project.name), []).append(project)
+        for base_id, group in by_prefix.items():
+            last_value = ProjectIdCounter.next_value(base_id, len(group))
+            for value, project in enumerate(group, start=last_value - len(group) + 1):
+                project.project_id = cls.format_project_id(base_id, value)
 
     def save(self, *args, **kwargs):
         """
@@ -110,6 +169,10 @@ class Contributor(models.Model):
 
     class Meta:
         unique_together = ('project', 'contributor')
+        indexes = [
+            # Projets d'un utilisateur : l'index unique (project, contributor) ne sert pas ce sens de lecture.
+            models.Index(fields=['contributor', 'project'], name='contributor_user_project_idx'),
+        ]
 
     def __str__(self):
         return f"{self.contributor.username} - {self.project.name}"
@@ -138,6 +201,9 @@ class Issue(models.Model):
         ("FINISHED", "finished"),
     ]
 
+    # Statuts comptés dans Project.open_issue_count.
+    OPEN_STATUSES = ("TO_DO", "IN_PROGRESS")
+
     author = models.ForeignKey(
         to=settings.AUTH_USER_MODEL,
         on_delete=models.SET(get_admin_user),
@@ -201,6 +267,39 @@ class Issue(models.Model):
         verbose_name="date de création"
     )
 
+    updated_time = models.DateTimeField(
+        auto_now=True,
+        verbose_name="date de mise à jour"
+    )
+
+    finished_time = models.DateTimeField(
+        null=True,
+        blank=True,
+        editable=False,
+        verbose_name="date de passage à FINISHED"
+    )
+
+    comment_count = models.IntegerField(
+        default=0,
+        editable=False,
+        verbose_name="nombre de commentaires"
+    )
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['project', 'created_time', 'issue_id'], name='issue_project_created_idx'),
+            models.Index(fields=['project', 'status', 'priority'], name='issue_project_status_idx'),
+            models.Index(fields=['project', 'tag'], name='issue_project_tag_idx'),
+            models.Index(fields=['project', 'assigned_to'], name='issue_project_assignee_idx'),
+            # Issues de l'utilisateur (/api/me/issues/), dans l'ordre de la pagination par curseur.
+            models.Index(fields=['author', 'created_time', 'issue_id'], name='issue_author_created_idx'),
+            models.Index(fields=['assigned_to', 'created_time', 'issue_id'], name='issue_assignee_created_idx'),
+        ]
+
+    @property
+    def is_open(self):
+        return self.status in self.OPEN_STATUSES
+
     def __str__(self):
         return f"{self.title} ({self.get_status_display()})"
 
@@ -221,9 +320,17 @@ class Comment(models.Model):
         verbose_name="created time"
     )
 
+    updated_time = models.DateTimeField(
+        auto_now=True,
+        verbose_name="updated time"
+    )
+
+    # Pas de CASCADE : les receivers de suppression des commentaires (cache, compteurs, journal) empêchent la
+    # suppression rapide, et le collecteur retiendrait les commentaires de l'utilisateur supprimé avant que
+    # reassign_user_projects_issues_comments ne les réaffecte. SET ne modifie que ceux qui restent à lui.
     author = models.ForeignKey(
         settings.AUTH_USER_MODEL,
-        on_delete=models.CASCADE,
+        on_delete=models.SET(get_admin_user),
         related_name="comment_authors"
     )
 
@@ -246,5 +353,75 @@ class Comment(models.Model):
         help_text="Issue associated with comment"
     )
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['issue', 'created_time', 'id'], name='comment_issue_created_idx'),
+            models.Index(fields=['author', 'created_time', 'id'], name='comment_author_created_idx'),
+        ]
+
     def __str__(self):
         return f"{self.name} | {self.issue}"
+
+
+class Change(models.Model):
+    """
+    Entrée du journal des modifications d'un projet (project.changes), en ajout seul.
+
+    L'identifiant auto-incrémenté sert de jeton de synchronisation : un client demande les entrées postérieures
+    au dernier jeton reçu. `object_id` est l'identifiant public de l'objet (project_id, contributor_id, issue_id
+    ou comment_id) ; le projet n'est pas une clé étrangère pour que les suppressions restent journalisées.
+    """
+
+    CREATE = 'create'
+    UPDATE = 'update'
+    DELETE = 'delete'
+    ACTIONS = [(CREATE, 'create'), (UPDATE, 'update'), (DELETE, 'delete')]
+
+    OBJECT_TYPES = [
+        ('project', 'project'),
+        ('contributor', 'contributor'),
+        ('issue', 'issue'),
+        ('comment', 'comment'),
+    ]
+
+    project_id = models.CharField(max_length=50)
+
+    object_type = models.CharField(max_length=11, choices=OBJECT_TYPES)
+
+    object_id = models.CharField(max_length=50)
+
+    action = models.CharField(max_length=6, choices=ACTIONS)
+
+    created_time = models.DateTimeField(auto_now_add=True, verbose_name='date de la modification')
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['project_id', 'id'], name='change_project_idx'),
+            # Compactage : recherche des entrées plus récentes pour le même objet.
+            models.Index(fields=['object_type', 'object_id', 'id'], name='change_object_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.id} {self.action} {self.object_type} {self.object_id}"
+
+
+class ChangeHorizon(models.Model):
+    """
+    Jeton le plus récent supprimé par la rétention du journal des modifications (une seule ligne) :
+    un client dont le jeton est plus ancien doit refaire une synchronisation complète.
+    """
+
+    token = models.PositiveBigIntegerField(default=0)
+
+    @classmethod
+    def current(cls):
+        return cls.objects.values_list('token', flat=True).first() or 0
+
+    @classmethod
+    def advance(cls, token):
+        with transaction.atomic():
+            if not cls.objects.filter(pk=1).update(token=Greatest('token', token)):
+                cls.objects.create(pk=1, token=token)
+
+    def __str__(self):
+        return str(self.token)
@@ -0,0 +1,149 @@
+import json
+from django.core.exceptions import ValidationError
+from django.core.paginator import InvalidPage
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import Cursor, CursorPagination, PageNumberPagination
+
+
+def reverse_ordering(ordering):
+    return tuple(name[1:] if name.startswith('-') else f'-{name}' for name in ordering)
+
+
+def keyset_after(ordering, values):
+    """
+    Condition « après `values` dans l'ordre `ordering` », comparaison lexicographique de tuples :
+    (a, b) après (x, y) pour ('-a', '-b') s'écrit a < x OU (a = x ET b < y).
+    """
+    condition = Q()
+    equal = {}
+    for name, value in zip(ordering, values):
+        field = name.lstrip('-')
+        condition |= Q(**equal, **{f"{field}__{'lt' if name.startswith('-') else 'gt'}": value})
+        equal[field] = value
+    return condition
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Pagination par curseur : l'ordre de la vue (OrderingFilter, sinon `ordering`) est complété par la clé
+    primaire, et le curseur porte les valeurs de tous ses champs pour le dernier élément de la page. La page
+    suivante est lue par comparaison de tuples, par exemple (created_time, pk) < (t, p) : une requête par page,
+    sans COUNT(*) ni OFFSET, même lorsque de nombreuses lignes partagent la même date de création.
+    """
+    ordering = ('-created_time', '-pk')
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        if not {'pk', queryset.model._meta.pk.name} & {name.lstrip('-') for name in ordering}:
+            ordering += ('-pk' if ordering[-1].startswith('-') else 'pk',)
+        return ordering
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.fields = [
+            queryset.model._meta.pk if name.lstrip('-') == 'pk' else queryset.model._meta.get_field(name.lstrip('-'))
+            for name in self.ordering
+        ]
+        self.cursor = self.decode_cursor(request)
+        reverse = self.cursor is not None and self.cursor.reverse
+        position = self.decode_position(self.cursor.position) if self.cursor is not None else None
+
+        ordering = reverse_ordering(self.ordering) if reverse else self.ordering
+        queryset = queryset.order_by(*ordering)
+        if position is not None:
+            queryset = queryset.filter(keyset_after(ordering, position))
+
+        # Un élément de plus que la page indique s'il en reste au-delà.
+        results = list(queryset[:self.page_size + 1])
+        has_following = len(results) > self.page_size
+        self.page = results[:self.page_size]
+        if reverse:
+            self.page.reverse()
+            self.has_next, self.has_previous = position is not None, has_following
+        else:
+            self.has_next, self.has_previous = has_following, position is not None
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+        return self.page
+
+    def encode_position(self, instance):
+        return json.dumps([field.value_to_string(instance) for field in self.fields])
+
+    def decode_position(self, position):
+        if position is None:
+            return None
+        try:
+            values = json.loads(position)
+            if not isinstance(values, list) or len(values) != len(self.fields):
+                raise ValueError
+            return [field.to_python(value) for field, value in zip(self.fields, values)]
+        except (TypeError, ValueError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        position = self.encode_position(self.page[-1]) if self.page else self.cursor.position
+        return self.encode_cursor(Cursor(offset=0, reverse=False, position=position))
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        position = self.encode_position(self.page[0]) if self.page else self.cursor.position
+        return self.encode_cursor(Cursor(offset=0, reverse=True, position=position))
+
+
+class OptInKeysetPaginationMixin:
+    """
+    Mixin de vue : pagination par numéro de page par défaut, pagination par curseur
+    avec `?pagination=cursor` (ou dès qu'un `cursor` est fourni).
+    """
+    keyset_pagination_class = KeysetPagination
+
+    def use_keyset_pagination(self):
+        query_params = self.request.query_params
+        return query_params.get('pagination') == 'cursor' or 'cursor' in query_params
+
+    @property
+    def paginator(self):
+        if not hasattr(self, '_paginator'):
+            if self.use_keyset_pagination():
+                self._paginator = self.keyset_pagination_class()
+            elif self.pagination_class is None:
+                self._paginator = None
+            else:
+                self._paginator = self.pagination_class()
+        return self._paginator
+
+
+class AsyncPageNumberPagination(PageNumberPagination):
+    """
+    Pagination par numéro de page pour les vues asynchrones : le COUNT(*) et la page sont lus
+    avec l'ORM asynchrone, les liens et le format de réponse restent ceux de PageNumberPagination.
+    """
+
+    async def apaginate_queryset(self, queryset, request):
+        self.request = request
+        paginator = self.django_paginator_class(queryset, self.get_page_size(request))
+        # Le nombre de lignes est fourni au Paginator pour qu'il ne lance pas de requête synchrone.
+        paginator.count = await queryset.acount()
+        page_number = self.get_page_number(request, paginator)
+        try:
+            self.page = paginator.page(page_number)
+        except InvalidPage as exc:
+            raise NotFound(self.invalid_page_message.format(page_number=page_number, message=str(exc)))
+        self.page.object_list = [obj async for obj in self.page.object_list]
+        return self.page.object_list
+
+    def get_paginated_data(self, data):
+        return self.get_paginated_response(data).data
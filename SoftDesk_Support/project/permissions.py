@@ -1,6 +1,6 @@
 from rest_framework import permissions
 from project.models import Project, Issue, Comment, Contributor
-from django.shortcuts import get_object_or_404
+from .membership import get_membership, aget_membership
 
 
 class IsAuthor(permissions.BasePermission):
@@ -10,13 +10,12 @@ class IsAuthor(permissions.BasePermission):
     def has_permission(self, request, view):
         project_id = view.kwargs.get('project_id')
         if project_id:
-            project = get_object_or_404(Project, project_id=project_id)
-            return request.user == project.author
+            return get_membership(request, project_id).is_author
         return False
 
     def has_object_permission(self, request, view, obj):
-        if hasattr(obj, 'author'):
-            return request.user == obj.author
+        if hasattr(obj, 'author_id'):
+            return request.user.id is not None and request.user.id == obj.author_id
         return False
 
 
@@ -24,31 +23,26 @@ class IsContributor(permissions.BasePermission):
     """
     Permission pour permettre l'accès si l'utilisateur est un contributeur du projet associé.
     """
-    def _get_project_from_obj(self, obj):
+    def _get_project_id_from_obj(self, obj):
         if isinstance(obj, Project):
-            return obj
-        if isinstance(obj, Contributor):
-            return obj.project
-        elif isinstance(obj, Issue):
-            return obj.project
+            return obj.project_id
+        if isinstance(obj, (Contributor, Issue)):
+            return obj.project_id
         elif isinstance(obj, Comment):
-            return obj.issue.project
+            return obj.issue.project_id
         return None
 
     def has_permission(self, request, view):
         # This method checks if the user is a contributor for the project related to the view
         project_id = view.kwargs.get('project_id')
         if project_id:
-            project = get_object_or_404(Project, project_id=project_id)
-            return project.contributors.filter(id=request.user.id).exists() or request.user == project.author
+            return get_membership(request, project_id).is_member
         return False
 
     def has_object_permission(self, request, view, obj):
         # This method checks if the user is a contributor for the specific object
-        project = self._get_project_from_obj(obj)
-        if project and (project.contributors.filter(id=request.user.id).exists() or request.user == project.author):
-            return True
-        return False
+        project_id = self._get_project_id_from_obj(obj)
+        return bool(project_id) and get_membership(request, project_id).is_member
 
 
 class IsAuthenticated(permissions.BasePermission):
@@ -57,3 +51,32 @@ class IsAuthenticated(permissions.BasePermission):
     """
     def has_permission(self, request, view):
         return request.user.is_authenticated
+
+
+class AsyncIsAuthenticated:
+    """
+    Permission asynchrone (vues ASGI) : accès aux utilisateurs authentifiés.
+    """
+    async def has_permission(self, request, view):
+        return request.user.is_authenticated
+
+
+class AsyncIsContributor:
+    """
+    Permission asynchrone (vues ASGI) : accès à l'auteur et aux contributeurs du projet de l'URL.
+    """
+    async def has_permission(self, request, view):
+        project_id = view.kwargs.get('project_id')
+        if project_id:
+            return (await aget_membership(request, project_id)).is_member
+        return False
+
+
+class AsyncIsContributorOrAdmin(AsyncIsContributor):
+    """
+    Permission asynchrone (vues ASGI) : comme AsyncIsContributor, ouverte en plus aux administrateurs.
+    """
+    async def has_permission(self, request, view):
+        if request.user.is_authenticated and request.user.is_staff:
+            return True
+        return await super().has_permission(request, view)
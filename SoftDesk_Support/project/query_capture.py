@@ -0,0 +1,55 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+# Observateurs des requêtes SQL du contexte courant (requête HTTP, bloc de test) : objets dotés d'une méthode
+# record(sql, duration_ms). Partagés par l'instrumentation (project.instrumentation) et le détecteur
+# (project.query_detector) : une seule mesure par requête SQL, quel que soit le nombre d'observateurs.
+_observers = ContextVar('query_observers', default=())
+
+
+def current_observers():
+    return _observers.get()
+
+
+def capture_query(execute, sql, params, many, context):
+    """
+    Wrapper d'exécution SQL installé sur chaque connexion : ne mesure que si un observateur est actif.
+    """
+    observers = _observers.get()
+    if not observers:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        duration_ms = (time.perf_counter() - start) * 1000
+        for observer in observers:
+            observer.record(sql, duration_ms)
+
+
+def install_query_capture(connection):
+    if capture_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(capture_query)
+
+
+@receiver(connection_created)
+def capture_connection(sender, connection, **kwargs):
+    install_query_capture(connection)
+
+
+@contextmanager
+def observe_queries(observer):
+    """
+    Transmet à `observer` les requêtes SQL exécutées dans le bloc, en plus des observateurs déjà actifs.
+    """
+    for connection in connections.all(initialized_only=True):
+        install_query_capture(connection)
+    token = _observers.set(_observers.get() + (observer,))
+    try:
+        yield observer
+    finally:
+        _observers.reset(token)
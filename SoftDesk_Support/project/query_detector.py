@@ -0,0 +1,226 @@
+import logging
+import re
+import sys
+from collections import Counter
+from contextlib import contextmanager
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.dispatch import Signal
+from rest_framework.fields import Field
+from rest_framework.views import APIView
+from .query_capture import observe_queries
+
+logger = logging.getLogger('project.query_detector')
+
+DEFAULTS = {
+    'ENABLED': False,
+    'N_PLUS_ONE_THRESHOLD': 3,
+    'SLOW_QUERY_MS': 100,
+}
+
+# Envoyé à la fin de chaque requête HTTP inspectée, avec le rapport (`report`).
+query_report_ready = Signal()
+
+_IGNORED_STATEMENTS = ('SAVEPOINT', 'RELEASE SAVEPOINT', 'ROLLBACK TO SAVEPOINT', 'BEGIN', 'COMMIT')
+_IN_LIST = re.compile(r'IN \((?:%s, )*%s\)')
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r'\b\d+\b')
+_SPACES = re.compile(r'\s+')
+_MAX_FRAMES = 80
+
+
+def detector_settings():
+    return {**DEFAULTS, **getattr(settings, 'QUERY_DETECTOR', {})}
+
+
+def normalize_sql(sql):
+    """
+    Réduit une requête SQL à sa forme : littéraux et listes IN remplacés, espaces normalisés.
+    """
+    sql = _SPACES.sub(' ', sql.strip())
+    sql = _IN_LIST.sub('IN (...)', sql)
+    sql = _STRING.sub('?', sql)
+    return _NUMBER.sub('?', sql)
+
+
+def query_origin():
+    """
+    Retourne l'élément de code à l'origine de la requête en cours : champ de serializer, classe de permission
+    ou, à défaut, méthode de la vue.
+    """
+    frame = sys._getframe(2)
+    view_origin = None
+    for _ in range(_MAX_FRAMES):
+        if frame is None:
+            break
+        owner = frame.f_locals.get('self')
+        if isinstance(owner, Field) and owner.field_name:
+            return f'{type(owner.parent).__name__}.{owner.field_name}'
+        if owner is not None and callable(getattr(owner, 'has_permission', None)) and not isinstance(owner, APIView):
+            return f'{type(owner).__name__}.{frame.f_code.co_name}'
+        if view_origin is None and isinstance(owner, APIView):
+            view_origin = f'{type(owner).__name__}.{frame.f_code.co_name}'
+        frame = frame.f_back
+    return view_origin or '?'
+
+
+class QueryShape:
+    """
+    Exécutions d'une même forme de requête au cours d'une requête HTTP.
+    """
+
+    def __init__(self, sql):
+        self.sql = sql
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.origins = Counter()
+
+    def record(self, duration_ms, origin):
+        self.count += 1
+        self.total_ms += duration_ms
+        self.max_ms = max(self.max_ms, duration_ms)
+        self.origins[origin] += 1
+
+
+class QueryReport:
+    """
+    Requêtes SQL exécutées pendant une requête HTTP (ou un bloc `detect_queries`), regroupées par forme.
+    """
+
+    def __init__(self, label, n_plus_one_threshold, slow_query_ms):
+        self.label = label
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self.slow_query_ms = slow_query_ms
+        self.shapes = {}
+
+    def record(self, sql, duration_ms):
+        if sql.lstrip().upper().startswith(_IGNORED_STATEMENTS):
+            return
+        shape_sql = normalize_sql(sql)
+        shape = self.shapes.get(shape_sql)
+        if shape is None:
+            shape = self.shapes[shape_sql] = QueryShape(shape_sql)
+        shape.record(duration_ms, query_origin())
+
+    @property
+    def query_count(self):
+        return sum(shape.count for shape in self.shapes.values())
+
+    @property
+    def repeated(self):
+        """
+        Formes exécutées au moins N_PLUS_ONE_THRESHOLD fois : typiquement une requête par ligne (N+1).
+        """
+        return [shape for shape in self.shapes.values() if shape.count >= self.n_plus_one_threshold]
+
+    @property
+    def slow(self):
+        return [shape for shape in self.shapes.values() if shape.max_ms >= self.slow_query_ms]
+
+    def has_problems(self):
+        return bool(self.repeated or self.slow)
+
+    def format(self):
+        lines = [f'{self.label} : {self.query_count} requêtes SQL, {len(self.shapes)} formes']
+        for title, shapes in (('N+1', self.repeated), ('Lente', self.slow)):
+            for shape in shapes:
+                origins = ', '.join(f'{origin} ×{count}' for origin, count in shape.origins.most_common())
+                lines.append(
+                    f'  [{title}] ×{shape.count}, {shape.total_ms:.1f} ms (max {shape.max_ms:.1f} ms) '
+                    f'depuis {origins}\n      {shape.sql}'
+                )
+        return '\n'.join(lines)
+
+
+@contextmanager
+def detect_queries(label=''):
+    """
+    Regroupe par forme les requêtes SQL exécutées dans le bloc, et retourne le rapport.
+    """
+    options = detector_settings()
+    with observe_queries(QueryReport(label, options['N_PLUS_ONE_THRESHOLD'], options['SLOW_QUERY_MS'])) as report:
+        yield report
+
+
+class QueryDetectorMiddleware:
+    """
+    Inspecte les requêtes SQL de chaque requête HTTP lorsque QUERY_DETECTOR['ENABLED'] est vrai :
+    les formes répétées (N+1) et les requêtes lentes sont journalisées sur le logger `project.query_detector`.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        if not detector_settings()['ENABLED']:
+            return self.get_response(request)
+        with detect_queries(f'{request.method} {request.path}') as report:
+            response = self.get_response(request)
+        self.report(request, report)
+        return response
+
+    async def __acall__(self, request):
+        if not detector_settings()['ENABLED']:
+            return await self.get_response(request)
+        with detect_queries(f'{request.method} {request.path}') as report:
+            response = await self.get_response(request)
+        self.report(request, report)
+        return response
+
+    def report(self, request, report):
+        match = getattr(request, 'resolver_match', None)
+        if match is not None and match.url_name:
+            report.label = f'{report.label} ({match.url_name})'
+        if report.has_problems():
+            logger.warning(report.format())
+        query_report_ready.send(sender=self.__class__, request=request, report=report)
+
+
+class QueryDetectorTestMixin:
+    """
+    Mixin de test : les requêtes du client de test passent par le détecteur, et le test échoue
+    si l'une d'elles présente une forme répétée (N+1) ou une requête lente.
+
+    `query_detector_settings` complète QUERY_DETECTOR pour la classe de test ; `allow_query_problems()`
+    tolère les problèmes d'un bloc.
+    """
+    query_detector_settings = {}
+
+    def setUp(self):
+        override = self.settings(QUERY_DETECTOR={
+            **getattr(settings, 'QUERY_DETECTOR', {}), 'ENABLED': True, **self.query_detector_settings,
+        })
+        override.enable()
+        self.addCleanup(override.disable)
+        self.query_reports = []
+        self._allow_query_problems = False
+        query_report_ready.connect(self._collect_query_report)
+        self.addCleanup(query_report_ready.disconnect, self._collect_query_report)
+        self.addCleanup(self.assertNoQueryProblems)
+        super().setUp()
+
+    def _collect_query_report(self, sender, report, **kwargs):
+        if not self._allow_query_problems:
+            self.query_reports.append(report)
+
+    @contextmanager
+    def allow_query_problems(self):
+        self._allow_query_problems = True
+        try:
+            yield
+        finally:
+            self._allow_query_problems = False
+
+    def assertNoQueryProblems(self):
+        problems = [report.format() for report in self.query_reports if report.has_problems()]
+        if problems:
+            self.fail('Problèmes de requêtes SQL détectés :\n' + '\n'.join(problems))
@@ -0,0 +1,281 @@
+import hashlib
+import os
+import pickle
+import shutil
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.db import transaction
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+from rest_framework.response import Response
+
+
+# Valeur par défaut de `timeout` dans set() : durée de vie configurée pour le backend.
+DEFAULT_TIMEOUT = object()
+
+
+class BaseResponseCache:
+    """
+    Cache de réponses borné, dont les entrées sont regroupées par portée (un projet) pour l'invalidation.
+
+    `timeout` est la durée de vie des entrées en secondes (None : jusqu'à invalidation ou éviction). Il borne
+    la durée pendant laquelle un autre processus, dont le cache n'est pas invalidé, sert une réponse périmée.
+    """
+
+    def __init__(self, max_entries=1000, timeout=None):
+        self.max_entries = max_entries
+        self.timeout = timeout
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._stats_lock = threading.Lock()
+
+    def _count(self, hit):
+        with self._stats_lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def get_expiry(self, timeout=DEFAULT_TIMEOUT):
+        """
+        Date d'expiration (horloge time.time()) d'une entrée écrite maintenant, ou None si elle n'expire pas.
+        """
+        timeout = self.timeout if timeout is DEFAULT_TIMEOUT else timeout
+        return time.time() + timeout if timeout is not None else None
+
+    @staticmethod
+    def expired(expiry):
+        return expiry is not None and expiry <= time.time()
+
+    def get(self, scope, key):
+        raise NotImplementedError
+
+    def set(self, scope, key, value, timeout=DEFAULT_TIMEOUT):
+        raise NotImplementedError
+
+    def invalidate(self, scope):
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+    def __len__(self):
+        raise NotImplementedError
+
+    def stats(self):
+        return {
+            'backend': type(self).__name__,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'entries': len(self),
+            'max_entries': self.max_entries,
+        }
+
+
+class LocMemResponseCache(BaseResponseCache):
+    """
+    Cache en mémoire du processus, avec éviction LRU. Les valeurs sont stockées sérialisées (pickle),
+    comme le cache locmem de Django, pour que chaque lecture renvoie une copie indépendante.
+    Chaque processus a son propre cache : avec plusieurs processus, seul `timeout` borne la durée pendant
+    laquelle les autres servent une réponse invalidée ailleurs.
+    """
+
+    def __init__(self, max_entries=1000, timeout=None):
+        super().__init__(max_entries, timeout)
+        self._entries = OrderedDict()
+        self._scopes = {}
+        self._lock = threading.Lock()
+
+    def get(self, scope, key):
+        with self._lock:
+            entry = self._entries.get((scope, key))
+            if entry is not None and self.expired(entry[0]):
+                del self._entries[(scope, key)]
+                self._scopes[scope].discard(key)
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end((scope, key))
+        self._count(entry is not None)
+        return pickle.loads(entry[1]) if entry is not None else None
+
+    def set(self, scope, key, value, timeout=DEFAULT_TIMEOUT):
+        value = (self.get_expiry(timeout), pickle.dumps(value, pickle.HIGHEST_PROTOCOL))
+        with self._lock:
+            self._entries[(scope, key)] = value
+            self._entries.move_to_end((scope, key))
+            self._scopes.setdefault(scope, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                (old_scope, old_key), _ = self._entries.popitem(last=False)
+                self._scopes[old_scope].discard(old_key)
+                self.evictions += 1
+
+    def invalidate(self, scope):
+        with self._lock:
+            for key in self._scopes.pop(scope, ()):
+                self._entries.pop((scope, key), None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._scopes.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class FileResponseCache(BaseResponseCache):
+    """
+    Cache sur disque partagé par les processus d'une même machine : un répertoire par portée,
+    un fichier par entrée. L'éviction supprime les fichiers les moins récemment lus (date de modification).
+    """
+
+    def __init__(self, location, max_entries=1000, timeout=None):
+        super().__init__(max_entries, timeout)
+        self.location = str(location)
+        os.makedirs(self.location, exist_ok=True)
+
+    def _scope_dir(self, scope):
+        return os.path.join(self.location, hashlib.md5(str(scope).encode()).hexdigest())
+
+    def _path(self, scope, key):
+        return os.path.join(self._scope_dir(scope), hashlib.md5(key.encode()).hexdigest())
+
+    def _files(self):
+        for scope_dir in os.scandir(self.location):
+            if scope_dir.is_dir():
+                yield from (
+                    entry for entry in os.scandir(scope_dir.path)
+                    if entry.is_file() and not entry.name.endswith('.tmp')
+                )
+
+    def get(self, scope, key):
+        path = self._path(scope, key)
+        try:
+            with open(path, 'rb') as file:
+                expiry, value = pickle.load(file)
+            if self.expired(expiry):
+                os.remove(path)
+                value = None
+            else:
+                os.utime(path)
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError, TypeError, ValueError):
+            value = None
+        self._count(value is not None)
+        return value
+
+    def set(self, scope, key, value, timeout=DEFAULT_TIMEOUT):
+        scope_dir = self._scope_dir(scope)
+        try:
+            os.makedirs(scope_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=scope_dir, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as file:
+                pickle.dump((self.get_expiry(timeout), value), file, pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self._path(scope, key))
+        except OSError:
+            # La portée a été invalidée pendant l'écriture : l'entrée est simplement abandonnée.
+            return
+        self._cull()
+
+    def _cull(self):
+        files = list(self._files())
+        if len(files) <= self.max_entries:
+            return
+        # Éviction par lot jusqu'à 90 % de la capacité, pour ne pas parcourir le répertoire à chaque écriture.
+        files.sort(key=lambda entry: entry.stat().st_mtime)
+        for entry in files[:len(files) - int(self.max_entries * 0.9)]:
+            try:
+                os.remove(entry.path)
+                self.evictions += 1
+            except FileNotFoundError:
+                pass
+
+    def invalidate(self, scope):
+        shutil.rmtree(self._scope_dir(scope), ignore_errors=True)
+
+    def clear(self):
+        for entry in os.scandir(self.location):
+            shutil.rmtree(entry.path, ignore_errors=True)
+
+    def __len__(self):
+        return sum(1 for _ in self._files())
+
+
+_response_cache = None
+
+
+def get_response_cache():
+    """
+    Retourne le cache de réponses configuré par le réglage RESPONSE_CACHE, ou None s'il est désactivé.
+    """
+    global _response_cache
+    config = getattr(settings, 'RESPONSE_CACHE', None)
+    if not config:
+        return None
+    if _response_cache is None:
+        _response_cache = import_string(config['BACKEND'])(**config.get('OPTIONS', {}))
+    return _response_cache
+
+
+@receiver(setting_changed)
+def reset_response_cache(setting, **kwargs):
+    global _response_cache
+    if setting == 'RESPONSE_CACHE':
+        _response_cache = None
+
+
+def invalidate_response_cache(scope):
+    """
+    Invalide les réponses d'un projet, immédiatement puis à la validation de la transaction en cours,
+    pour écarter les réponses mises en cache entre-temps par une lecture concurrente.
+    """
+    cache = get_response_cache()
+    if cache is None:
+        return
+    cache.invalidate(scope)
+    transaction.on_commit(lambda: cache.invalidate(scope))
+
+
+class CachedResponseMixin:
+    """
+    Mixin de vue : met en cache les données de `list` et `retrieve`,
+    par (nom d'URL, chemin complet, rôle de l'utilisateur) dans la portée renvoyée par `get_cache_scope()`.
+    """
+
+    def get_cache_scope(self):
+        return None
+
+    def get_cache_role(self):
+        return ''
+
+    def get_cache_timeout(self):
+        """
+        Durée de vie des réponses de la vue ; par défaut celle du backend.
+        """
+        return DEFAULT_TIMEOUT
+
+    def cached_response(self, request, handler, *args, **kwargs):
+        cache = get_response_cache()
+        scope = self.get_cache_scope() if cache is not None else None
+        if scope is None:
+            return handler(request, *args, **kwargs)
+
+        key = '|'.join([request.resolver_match.url_name or '', request.get_full_path(), self.get_cache_role()])
+        data = cache.get(scope, key)
+        if data is not None:
+            return Response(data)
+        response = handler(request, *args, **kwargs)
+        if response.status_code == 200:
+            cache.set(scope, key, response.data, timeout=self.get_cache_timeout())
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(request, super().list, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(request, super().retrieve, *args, **kwargs)
@@ -0,0 +1,171 @@
+import html
+import re
+import uuid
+from django.db import connection
+from django.db.models import Q
+from .models import Project, Issue, Comment
+
+# Index plein texte SQLite FTS5 à contenu externe : le texte reste dans project_issue / project_comment,
+# l'index inversé est maintenu par des triggers SQL (y compris pour bulk_create et update()).
+FTS_TABLES = {
+    'project_issue_fts': ('project_issue', 'issue_id', ('title', 'description')),
+    'project_comment_fts': ('project_comment', 'id', ('name', 'description')),
+}
+
+HIGHLIGHT_START = '<mark>'
+HIGHLIGHT_END = '</mark>'
+SNIPPET_TOKENS = 12
+# Marqueurs non imprimables émis par FTS5 autour des termes trouvés : le texte est échappé en HTML en Python,
+# puis seuls ces marqueurs deviennent des balises <mark>.
+_MARK_START = '\x02'
+_MARK_END = '\x03'
+
+
+def fts_available(conn=connection):
+    return conn.vendor == 'sqlite'
+
+
+def _fts_tables_exist(cursor):
+    placeholders = ', '.join(['%s'] * len(FTS_TABLES))
+    cursor.execute(
+        f"SELECT COUNT(*) FROM sqlite_master WHERE type = 'table' AND name IN ({placeholders})",
+        list(FTS_TABLES),
+    )
+    return cursor.fetchone()[0] == len(FTS_TABLES)
+
+
+def install_search_triggers(conn=connection):
+    """
+    Crée (si besoin) les triggers qui synchronisent l'index FTS5 avec les tables sources.
+
+    Appelée après chaque migration : SQLite supprime les triggers lorsqu'une migration reconstruit une table.
+    """
+    if not fts_available(conn):
+        return
+    with conn.cursor() as cursor:
+        if not _fts_tables_exist(cursor):
+            return
+        for fts_table, (source, rowid, columns) in FTS_TABLES.items():
+            names = ', '.join(columns)
+            new_values = ', '.join(f'new.{column}' for column in columns)
+            old_values = ', '.join(f'old.{column}' for column in columns)
+            insert = f"INSERT INTO {fts_table}(rowid, {names}) VALUES (new.{rowid}, {new_values});"
+            delete = (
+                f"INSERT INTO {fts_table}({fts_table}, rowid, {names}) "
+                f"VALUES ('delete', old.{rowid}, {old_values});"
+            )
+            cursor.execute(f"CREATE TRIGGER IF NOT EXISTS {fts_table}_ai AFTER INSERT ON {source} BEGIN {insert} END")
+            cursor.execute(f"CREATE TRIGGER IF NOT EXISTS {fts_table}_ad AFTER DELETE ON {source} BEGIN {delete} END")
+            cursor.execute(
+                f"CREATE TRIGGER IF NOT EXISTS {fts_table}_au AFTER UPDATE OF {names} ON {source} "
+                f"BEGIN {delete} {insert} END"
+            )
+
+
+def search_terms(query):
+    """
+    Découpe la saisie de l'utilisateur en mots ; chaque mot est recherché comme préfixe.
+    """
+    return re.findall(r'\w+', query or '')
+
+
+def _fts_match(terms):
+    return ' '.join(f'"{term}"*' for term in terms)
+
+
+def render_highlight(text):
+    """
+    Échappe en HTML le texte saisi par les utilisateurs, puis remplace les marqueurs de FTS5 par <mark>.
+    """
+    if text is None:
+        return None
+    text = html.escape(text)
+    return text.replace(_MARK_START, HIGHLIGHT_START).replace(_MARK_END, HIGHLIGHT_END)
+
+
+def _accessible_projects_sql():
+    return (
+        "SELECT project_id FROM project_project WHERE author_id = %s "
+        "UNION SELECT project_id FROM project_contributor WHERE contributor_id = %s"
+    )
+
+
+def _search_fts(user, terms, limit):
+    match = _fts_match(terms)
+    issue_sql = (
+        "SELECT 'issue', i.project_id, i.issue_id, NULL, "
+        "highlight(project_issue_fts, 0, %s, %s), "
+        f"snippet(project_issue_fts, 1, %s, %s, '…', {SNIPPET_TOKENS}), "
+        "project_issue_fts.rank "
+        "FROM project_issue_fts JOIN project_issue i ON i.issue_id = project_issue_fts.rowid "
+        f"WHERE project_issue_fts MATCH %s AND i.project_id IN ({_accessible_projects_sql()}) "
+        "ORDER BY project_issue_fts.rank LIMIT %s"
+    )
+    comment_sql = (
+        "SELECT 'comment', i.project_id, c.issue_id, c.comment_id, "
+        "highlight(project_comment_fts, 0, %s, %s), "
+        f"snippet(project_comment_fts, 1, %s, %s, '…', {SNIPPET_TOKENS}), "
+        "project_comment_fts.rank "
+        "FROM project_comment_fts JOIN project_comment c ON c.id = project_comment_fts.rowid "
+        "JOIN project_issue i ON i.issue_id = c.issue_id "
+        f"WHERE project_comment_fts MATCH %s AND i.project_id IN ({_accessible_projects_sql()}) "
+        "ORDER BY project_comment_fts.rank LIMIT %s"
+    )
+    rows = []
+    with connection.cursor() as cursor:
+        for sql in (issue_sql, comment_sql):
+            cursor.execute(sql, [*(_MARK_START, _MARK_END) * 2, match, user.id, user.id, limit])
+            rows.extend(cursor.fetchall())
+    # bm25 : plus le rang est négatif, plus le résultat est pertinent.
+    rows.sort(key=lambda row: row[6])
+    return [
+        {
+            'type': kind,
+            'project_id': project_id,
+            'issue_id': issue_id,
+            'comment_id': str(uuid.UUID(comment_id)) if comment_id else None,
+            'title': render_highlight(title),
+            'snippet': render_highlight(snippet),
+            'score': -rank,
+        }
+        for kind, project_id, issue_id, comment_id, title, snippet, rank in rows[:limit]
+    ]
+
+
+def _search_fallback(user, terms, limit):
+    """
+    Recherche par icontains pour les bases sans FTS5 : ni classement ni mise en évidence, mais le même format
+    (texte échappé en HTML).
+    """
+    projects = Project.objects.filter(Q(author=user) | Q(contributors=user)).values('project_id')
+    issue_filter, comment_filter = Q(), Q()
+    for term in terms:
+        issue_filter &= Q(title__icontains=term) | Q(description__icontains=term)
+        comment_filter &= Q(name__icontains=term) | Q(description__icontains=term)
+    issues = Issue.objects.filter(issue_filter, project_id__in=projects).values(
+        'project_id', 'issue_id', 'title', 'description')[:limit]
+    comments = Comment.objects.filter(comment_filter, issue__project_id__in=projects).values(
+        'issue__project_id', 'issue_id', 'comment_id', 'name', 'description')[:limit]
+    results = [
+        {'type': 'issue', 'project_id': issue['project_id'], 'issue_id': issue['issue_id'], 'comment_id': None,
+         'title': html.escape(issue['title']), 'snippet': html.escape(issue['description'][:200]), 'score': None}
+        for issue in issues
+    ] + [
+        {'type': 'comment', 'project_id': comment['issue__project_id'], 'issue_id': comment['issue_id'],
+         'comment_id': str(comment['comment_id']), 'title': html.escape(comment['name']),
+         'snippet': html.escape(comment['description'][:200]), 'score': None}
+        for comment in comments
+    ]
+    return results[:limit]
+
+
+def search(user, query, limit=20):
+    """
+    Recherche dans les issues et commentaires des projets dont l'utilisateur est auteur ou contributeur.
+    """
+    terms = search_terms(query)
+    if not terms:
+        return []
+    if fts_available():
+        return _search_fts(user, terms, limit)
+    return _search_fallback(user, terms, limit)
@@ -1,9 +1,28 @@
 from rest_framework import serializers
 from .models import Project, Issue, Comment, Contributor
 from authentication.models import CustomUser
+from .filters import get_requested_fields
+from .instrumentation import TimedSerializerMixin
 
 
-class CustomUserAuthorContributorSerializer(serializers.ModelSerializer):
+class SparseFieldsetMixin:
+    """
+    Restreint les champs sérialisés en lecture à ceux demandés via `?fields=a,b`.
+    Les champs retirés, y compris les SerializerMethodField, ne sont pas évalués ; un champ inconnu donne 400.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        requested = get_requested_fields(self.context.get('request'))
+        if requested:
+            unknown = requested - set(self.fields)
+            if unknown:
+                raise serializers.ValidationError({'fields': f"Champs inconnus : {', '.join(sorted(unknown))}."})
+            for name in set(self.fields) - requested:
+                self.fields.pop(name)
+
+
+class CustomUserAuthorContributorSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """
     Serializer pour le modèle CustomUser, utilisé pour afficher les informations de l'auteur ou du contributeur.
     """
@@ -14,7 +33,7 @@ class CustomUserAuthorContributorSerializer(serializers.ModelSerializer):
         fields = ['id', 'username']
 
 
-class ProjectListSerializer(serializers.ModelSerializer):
+class ProjectListSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """
     Serializer pour lister les projets.
     """
@@ -28,10 +47,13 @@ class ProjectListSerializer(serializers.ModelSerializer):
             "name",
             "author",
             "contributors",
+            "issue_count",
+            "open_issue_count",
+            "contributor_count",
         ]
 
 
-class ProjectCreateUpdateSerializer(serializers.ModelSerializer):
+class ProjectCreateUpdateSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """
     Serializer pour créer ou modifier un projet.
     """
@@ -40,13 +62,19 @@ class ProjectCreateUpdateSerializer(serializers.ModelSerializer):
         fields = ['name', 'description', 'project_type']
 
 
-class ProjectSerializer(serializers.ModelSerializer):
+class ProjectSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """
     Serializer pour afficher des informations détaillées sur un projet.
+
+    `issue_titles` est un aperçu borné : les ISSUE_TITLES_PREVIEW issues les plus récentes par défaut,
+    ou jusqu'à ISSUE_TITLES_MAX via le paramètre `?issue_titles=<n>`.
     """
+    ISSUE_TITLES_PREVIEW = 10
+    ISSUE_TITLES_MAX = 100
+
     author = CustomUserAuthorContributorSerializer(many=False)
     contributors = CustomUserAuthorContributorSerializer(many=True)
-    issues_count = serializers.SerializerMethodField()
+    issues_count = serializers.IntegerField(source='issue_count', read_only=True)
     issue_titles = serializers.SerializerMethodField()
 
     class Meta:
@@ -60,27 +88,44 @@ class ProjectSerializer(serializers.ModelSerializer):
             "author",
             "contributors",
             'issues_count',
+            'open_issue_count',
+            'contributor_count',
             'issue_titles'
         ]
 
-    def get_issues_count(self, obj):
+    def get_issue_titles_limit(self):
         """
-        Retourne le nombre d'issues pour un projet donné.
+        Retourne le nombre d'issues à inclure dans l'aperçu, borné par ISSUE_TITLES_MAX.
         """
-        return Issue.objects.filter(project=obj).count()
+        request = self.context.get('request')
+        limit = request.query_params.get('issue_titles') if request is not None else None
+        try:
+            limit = int(limit)
+        except (TypeError, ValueError):
+            return self.ISSUE_TITLES_PREVIEW
+        return max(0, min(limit, self.ISSUE_TITLES_MAX))
 
     def get_issue_titles(self, obj):
         """
-        Retourne une liste de dictionnaires contenant l'ID et le titre de chaque issue associée au projet.
+        Retourne une liste de dictionnaires contenant l'ID et le titre des issues les plus récentes du projet.
+        Utilise l'aperçu `issue_titles_preview` lorsqu'il a déjà été chargé (vues asynchrones).
         """
-        issues = Issue.objects.filter(project=obj).values('issue_id', 'title')
-        return list(issues)
+        if hasattr(obj, 'issue_titles_preview'):
+            return obj.issue_titles_preview
+        return list(self.get_issue_titles_queryset(obj))
+
+    def get_issue_titles_queryset(self, obj):
+        return (
+            Issue.objects.filter(project=obj)
+            .order_by('-created_time', '-issue_id')
+            .values('issue_id', 'title')[:self.get_issue_titles_limit()]
+        )
 
 
-class IssueSerializer(serializers.ModelSerializer):
+class IssueSerializer(TimedSerializerMixin, SparseFieldsetMixin, serializers.ModelSerializer):
     """Serializer pour créer une ISSUE."""
     project_id = serializers.PrimaryKeyRelatedField(queryset=Project.objects.all(), source='project', read_only=False)
-    comment_count = serializers.SerializerMethodField()
+    comment_count = serializers.IntegerField(read_only=True)
     comment_titles = serializers.SerializerMethodField()
     author = CustomUserAuthorContributorSerializer(read_only=True)
 
@@ -103,15 +148,55 @@ class IssueSerializer(serializers.ModelSerializer):
 
     read_only_fields = ['project_id', 'author']
 
-    def get_comment_count(self, obj):
-        return Comment.objects.filter(issue=obj).count()
-
     def get_comment_titles(self, obj):
+        """
+        Retourne les noms des commentaires de l'issue, via le préchargement `prefetched_comments` s'il existe.
+        """
+        if hasattr(obj, 'prefetched_comments'):
+            return [comment.name for comment in obj.prefetched_comments]
         comments = Comment.objects.filter(issue=obj).values_list('name', flat=True)
         return list(comments)
 
 
-class CommentSerializer(serializers.ModelSerializer):
+class IssueBulkCreateSerializer(TimedSerializerMixin, serializers.ModelSerializer):
+    """
+    Serializer pour un élément d'une création d'issues en masse.
+
+    `assigned_to` est vérifié contre `context['user_ids']`, chargé en une requête pour tout le lot.
+    """
+    assigned_to = serializers.IntegerField(required=False, allow_null=True)
+
+    class Meta:
+        model = Issue
+        fields = ['title', 'description', 'priority', 'tag', 'status', 'assigned_to']
+
+    def validate_assigned_to(self, value):
+        if value is not None and value not in self.context['user_ids']:
+            raise serializers.ValidationError("Utilisateur inconnu.")
+        return value
+
+
+class IssueBulkUpdateSerializer(TimedSerializerMixin, serializers.Serializer):
+    """
+    Serializer pour un élément d'une modification d'issues en masse (statut, priorité, assignation).
+    """
+    issue_id = serializers.IntegerField()
+    status = serializers.ChoiceField(choices=Issue.STATUS_CHOICES, required=False)
+    priority = serializers.ChoiceField(choices=Issue.PRIORITY_CHOICES, required=False)
+    assigned_to = serializers.IntegerField(required=False, allow_null=True)
+
+    def validate_assigned_to(self, value):
+        if value is not None and value not in self.context['user_ids']:
+            raise serializers.ValidationError("Utilisateur inconnu.")
+        return value
+
+    def validate(self, data):
+        if len(data) == 1:
+            raise serializers.ValidationError("Au moins un champ parmi status, priority, assigned_to est requis.")
+        return data
+
+
+class CommentSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """Serializer pour créer un commentaire."""
 
     issue_id = serializers.PrimaryKeyRelatedField(source='issue', read_only=True)
@@ -128,7 +213,17 @@ class CommentSerializer(serializers.ModelSerializer):
         ]
 
 
-class ContributorSerializer(serializers.ModelSerializer):
+class UserCommentSerializer(CommentSerializer):
+    """
+    Serializer des commentaires de l'utilisateur, tous projets confondus : le projet de l'issue est ajouté.
+    """
+    project_id = serializers.CharField(read_only=True)
+
+    class Meta(CommentSerializer.Meta):
+        fields = CommentSerializer.Meta.fields + ['project_id']
+
+
+class ContributorSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """
     Serializer pour ajouter un contributeur.
     """
@@ -1,7 +1,16 @@
-from django.db.models.signals import pre_delete
+from django.db import connections, transaction
+from django.db.models import OuterRef, Q, QuerySet, Subquery
+from django.db.models.signals import pre_delete, pre_save, post_save, post_delete, post_migrate
+from django.utils import timezone
 from django.dispatch import receiver
 from authentication.models import CustomUser
-from .models import Project, Issue, Comment
+from .models import Project, Issue, Comment, Contributor, Change
+from .changes import change_project_id, changes_recorded, record_change, record_changes
+from .events import publish_changes
+from .counters import adjust_issue_counters, adjust_project_counters
+from .membership import invalidate_membership_cache
+from .search import install_search_triggers
+from .response_cache import get_response_cache, invalidate_response_cache
 
 
 @receiver(pre_delete, sender=CustomUser)
@@ -31,20 +40,276 @@ def reassign_user_projects_issues_comments(sender, instance, **kwargs):
     if not admin_user:
         raise ValueError("Aucun utilisateur administrateur trouvé pour réattribuer les projets.")
 
-    # Réaffecter les projets
-    projects = Project.objects.filter(author=instance)
-    for project in projects:
-        project.author = admin_user
-        project.save()
-
-    # Réaffecter les issues
-    issues = Issue.objects.filter(author=instance)
-    for issue in issues:
-        issue.author = issue.project.author
-        issue.save()
-
-    # Réaffecter les commentaires
-    comments = Comment.objects.filter(author=instance)
-    for comment in comments:
-        comment.author = comment.issue.project.author
-        comment.save()
+    # Mises à jour ensemblistes : le nombre de requêtes ne dépend pas du volume de contenus de l'utilisateur.
+    with transaction.atomic():
+        # Réaffecter les projets
+        projects = Project.objects.filter(author=instance)
+        project_ids = list(projects.values_list('project_id', flat=True))
+        now = timezone.now()
+        projects.update(author=admin_user, updated_time=now)
+
+        # Réaffecter les issues à l'auteur de leur projet
+        issues = Issue.objects.filter(author=instance)
+        issue_keys = list(issues.values_list('project_id', 'issue_id'))
+        issues.update(updated_time=now, author=Subquery(
+            Project.objects.filter(project_id=OuterRef('project_id')).values('author')[:1]
+        ))
+
+        # Réaffecter les commentaires à l'auteur du projet de leur issue
+        comments = Comment.objects.filter(author=instance)
+        comment_keys = list(comments.values_list('issue__project_id', 'comment_id'))
+        comments.update(updated_time=now, author=Subquery(
+            Issue.objects.filter(issue_id=OuterRef('issue_id')).values('project__author')[:1]
+        ))
+
+        # Journal des modifications : les issues assignées sont réaffectées ensuite par on_delete, sans signal.
+        issue_keys += Issue.objects.filter(assigned_to=instance).values_list('project_id', 'issue_id')
+        record_changes('project', [(project_id, project_id) for project_id in project_ids], Change.UPDATE)
+        record_changes('issue', set(issue_keys), Change.UPDATE)
+        record_changes('comment', comment_keys, Change.UPDATE)
+
+    # Les mises à jour en masse n'émettent pas post_save : invalider les rôles et les réponses mis en cache.
+    for project_id in project_ids:
+        invalidate_membership_cache(project_id)
+    response_cache = get_response_cache()
+    if response_cache is not None:
+        response_cache.clear()
+
+
+@receiver(post_save, sender=Contributor)
+@receiver(post_delete, sender=Contributor)
+def invalidate_contributor_membership(sender, instance, **kwargs):
+    """
+    Invalide les rôles mis en cache pour le projet lorsqu'un contributeur est ajouté ou retiré.
+    La date de mise à jour du projet est avancée : la liste des contributeurs fait partie de sa représentation.
+    """
+    invalidate_membership_cache(instance.project_id)
+    Project.objects.filter(project_id=instance.project_id).update(updated_time=timezone.now())
+
+
+@receiver(post_save, sender=Project)
+@receiver(post_delete, sender=Project)
+def invalidate_project_membership(sender, instance, **kwargs):
+    """
+    Invalide les rôles mis en cache pour le projet lorsque son auteur peut avoir changé.
+    """
+    invalidate_membership_cache(instance.project_id)
+
+
+@receiver(post_save, sender=Project)
+@receiver(post_delete, sender=Project)
+@receiver(post_save, sender=Contributor)
+@receiver(post_delete, sender=Contributor)
+@receiver(post_save, sender=Issue)
+@receiver(post_delete, sender=Issue)
+def invalidate_project_responses(sender, instance, **kwargs):
+    """
+    Invalide les réponses mises en cache pour le projet concerné, et pour l'ancien projet d'une issue déplacée.
+    """
+    invalidate_response_cache(instance.pk if sender is Project else instance.project_id)
+    if sender is Issue and moved_from(instance) is not None:
+        invalidate_response_cache(moved_from(instance))
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def invalidate_issue_responses(sender, instance, **kwargs):
+    """
+    Invalide les réponses mises en cache pour le projet de l'issue commentée.
+    """
+    project_id = change_project_id(instance)
+    if project_id:
+        invalidate_response_cache(project_id)
+
+
+@receiver(pre_save, sender=CustomUser)
+def detect_username_change(sender, instance, update_fields=None, **kwargs):
+    """
+    Relit le nom d'utilisateur enregistré : les réponses mises en cache l'incluent (auteurs, assignations).
+    """
+    instance._username_changed = False
+    if instance._state.adding or (update_fields is not None and 'username' not in update_fields):
+        return
+    current = CustomUser.objects.filter(pk=instance.pk).values_list('username', flat=True).first()
+    instance._username_changed = current is not None and current != instance.username
+
+
+@receiver(post_save, sender=CustomUser)
+def invalidate_user_responses(sender, instance, **kwargs):
+    """
+    Quand un nom d'utilisateur change, avance la date de mise à jour (et journalise la modification) des projets
+    et issues dont la représentation l'inclut, pour les ETag des listes et le journal des modifications,
+    puis vide le cache de réponses : il peut figurer dans tous les projets.
+    """
+    if getattr(instance, '_username_changed', False):
+        instance._username_changed = False
+        now = timezone.now()
+        with transaction.atomic():
+            project_ids = list(
+                Project.objects.filter(Q(author=instance) | Q(contributors=instance))
+                .values_list('project_id', flat=True).distinct()
+            )
+            Project.objects.filter(pk__in=project_ids).update(updated_time=now)
+            issue_keys = list(Issue.objects.filter(author=instance).values_list('project_id', 'issue_id'))
+            Issue.objects.filter(pk__in=[issue_id for _, issue_id in issue_keys]).update(updated_time=now)
+            record_changes('project', [(project_id, project_id) for project_id in project_ids], Change.UPDATE)
+            record_changes('issue', issue_keys, Change.UPDATE)
+        response_cache = get_response_cache()
+        if response_cache is not None:
+            response_cache.clear()
+            transaction.on_commit(response_cache.clear)
+
+
+@receiver(pre_save, sender=Issue)
+def remember_counted_issue_state(sender, instance, update_fields=None, **kwargs):
+    """
+    Relit le projet et le statut enregistrés de l'issue modifiée : leurs changements déplacent les compteurs.
+    Date aussi le passage au statut FINISHED (finished_time), effacée si l'issue est rouverte.
+    """
+    instance._counted_state = None
+    instance._previous_project_id = None
+    if instance._state.adding:
+        previous_status = None
+    elif update_fields is not None and not {'project', 'project_id', 'status'} & set(update_fields):
+        return
+    else:
+        instance._counted_state = Issue.objects.filter(pk=instance.pk).values_list('project_id', 'status').first()
+        previous_status = instance._counted_state[1] if instance._counted_state else None
+        # Gardé pour les receivers post_save (cache, journal) : _counted_state est consommé par les compteurs.
+        instance._previous_project_id = instance._counted_state[0] if instance._counted_state else None
+    if instance.status != 'FINISHED':
+        instance.finished_time = None
+    elif previous_status != 'FINISHED' or instance.finished_time is None:
+        instance.finished_time = timezone.now()
+
+
+def moved_from(instance):
+    """
+    Projet d'origine d'une issue que la sauvegarde en cours déplace, None sinon.
+    """
+    previous_project_id = getattr(instance, '_previous_project_id', None)
+    return previous_project_id if previous_project_id not in (None, instance.project_id) else None
+
+
+@receiver(post_save, sender=Issue)
+def count_saved_issue(sender, instance, created, **kwargs):
+    """
+    Met à jour issue_count et open_issue_count à la création, au changement de statut ou de projet.
+    """
+    if created:
+        adjust_project_counters(instance.project_id, issue_count=1, open_issue_count=int(instance.is_open))
+        if instance.finished_time is not None:
+            # auto_now_add date created_time après pre_save : une issue créée FINISHED le serait avant sa création.
+            instance.finished_time = instance.created_time
+            Issue.objects.filter(pk=instance.pk).update(finished_time=instance.created_time)
+        return
+    previous = getattr(instance, '_counted_state', None)
+    if previous is None:
+        return
+    instance._counted_state = None
+    previous_project_id, previous_status = previous
+    was_open = previous_status in Issue.OPEN_STATUSES
+    if previous_project_id != instance.project_id:
+        adjust_project_counters(previous_project_id, issue_count=-1, open_issue_count=-int(was_open))
+        adjust_project_counters(instance.project_id, issue_count=1, open_issue_count=int(instance.is_open))
+    elif was_open != instance.is_open:
+        adjust_project_counters(instance.project_id, open_issue_count=1 if instance.is_open else -1)
+
+
+def deleted_with(origin, *models):
+    """
+    Indique si la suppression est une cascade depuis l'un des modèles : les compteurs portés par l'objet
+    supprimé à l'origine disparaissent avec lui.
+    """
+    model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    return model in models
+
+
+@receiver(post_delete, sender=Issue)
+def count_deleted_issue(sender, instance, origin=None, **kwargs):
+    if not deleted_with(origin, Project):
+        adjust_project_counters(instance.project_id, issue_count=-1, open_issue_count=-int(instance.is_open))
+
+
+@receiver(post_save, sender=Contributor)
+def count_created_contributor(sender, instance, created, **kwargs):
+    if created:
+        adjust_project_counters(instance.project_id, contributor_count=1)
+
+
+@receiver(post_delete, sender=Contributor)
+def count_deleted_contributor(sender, instance, origin=None, **kwargs):
+    if not deleted_with(origin, Project):
+        adjust_project_counters(instance.project_id, contributor_count=-1)
+
+
+@receiver(post_save, sender=Comment)
+def count_created_comment(sender, instance, created, **kwargs):
+    if created:
+        adjust_issue_counters(instance.issue_id, change_project_id(instance), comment_count=1)
+
+
+@receiver(post_delete, sender=Comment)
+def count_deleted_comment(sender, instance, origin=None, **kwargs):
+    if not deleted_with(origin, Project, Issue):
+        adjust_issue_counters(instance.issue_id, change_project_id(instance), comment_count=-1)
+
+
+@receiver(post_save, sender=Project)
+@receiver(post_save, sender=Contributor)
+@receiver(post_save, sender=Issue)
+@receiver(post_save, sender=Comment)
+def record_saved_change(sender, instance, created, **kwargs):
+    """
+    Journalise la création ou la modification dans le journal des modifications du projet (project.changes).
+    Une issue déplacée est supprimée du journal de son ancien projet et créée, avec ses commentaires,
+    dans celui du nouveau.
+    """
+    previous_project_id = moved_from(instance) if sender is Issue else None
+    if previous_project_id is None:
+        record_change(instance, Change.CREATE if created else Change.UPDATE)
+        return
+    record_change(instance, Change.DELETE, project_id=previous_project_id)
+    record_change(instance, Change.CREATE)
+    record_changes('comment', [(instance.project_id, comment_id)
+                               for comment_id in instance.comments.values_list('comment_id', flat=True)],
+                   Change.CREATE)
+
+
+# Parents dont la suppression emporte l'objet en cascade.
+CASCADE_PARENTS = {
+    Project: (),
+    Contributor: (Project,),
+    Issue: (Project,),
+    Comment: (Project, Issue),
+}
+
+
+@receiver(post_delete, sender=Project)
+@receiver(post_delete, sender=Contributor)
+@receiver(post_delete, sender=Issue)
+@receiver(post_delete, sender=Comment)
+def record_deleted_change(sender, instance, origin=None, **kwargs):
+    """
+    Journalise la suppression. Les objets supprimés en cascade avec leur projet ou leur issue ne le sont pas :
+    la suppression du parent les couvre.
+    """
+    if not deleted_with(origin, *CASCADE_PARENTS[sender]):
+        record_change(instance, Change.DELETE)
+
+
+@receiver(changes_recorded)
+def publish_recorded_changes(sender, entries, **kwargs):
+    """
+    Diffuse aux flux d'événements des projets les modifications d'issues et de commentaires, à la validation.
+    """
+    publish_changes(entries)
+
+
+@receiver(post_migrate)
+def restore_search_triggers(sender, using, **kwargs):
+    """
+    Recrée les triggers de l'index de recherche, supprimés par SQLite lorsqu'une migration reconstruit une table.
+    """
+    if sender.name == 'project':
+        install_search_triggers(connections[using])
@@ -0,0 +1,79 @@
+from datetime import timedelta
+from django.db.models import Count, DurationField, ExpressionWrapper, F, Value
+from django.db.models.functions import Greatest, TruncDate
+from django.utils import timezone
+from .models import Issue
+
+BREAKDOWNS = {
+    'by_status': ('status', Issue.STATUS_CHOICES),
+    'by_priority': ('priority', Issue.PRIORITY_CHOICES),
+    'by_tag': ('tag', Issue.TAG_CHOICES),
+}
+
+
+def time_to_finish():
+    # Borné à 0 : les issues créées FINISHED avant la correction ont un finished_time antérieur à created_time.
+    return Greatest(
+        ExpressionWrapper(F('finished_time') - F('created_time'), output_field=DurationField()),
+        Value(timedelta(0), output_field=DurationField()),
+    )
+
+
+def median_time_to_finish(issues, finished_count):
+    """
+    Médiane de la durée entre création et passage à FINISHED : seules la ou les deux lignes centrales
+    de la série triée sont lues.
+    """
+    if not finished_count:
+        return None
+    durations = list(
+        issues.filter(status='FINISHED', finished_time__isnull=False)
+        .annotate(duration=time_to_finish())
+        .order_by('duration')
+        .values_list('duration', flat=True)[(finished_count - 1) // 2:finished_count // 2 + 1]
+    )
+    return (sum(durations, timedelta()) / len(durations)).total_seconds() if durations else None
+
+
+def project_stats(project_id, days):
+    """
+    Tableau de bord d'un projet : répartition des issues par statut, priorité, catégorie et assignation,
+    créations par jour sur les `days` derniers jours et médiane du temps de résolution (en secondes).
+
+    Les répartitions viennent d'un seul GROUP BY sur les quatre colonnes, les créations par jour d'un second.
+    """
+    issues = Issue.objects.filter(project_id=project_id).order_by()
+    groups = issues.values('status', 'priority', 'tag', 'assigned_to').annotate(
+        count=Count('pk'), timed=Count('finished_time'),
+    )
+
+    stats = {name: {value: 0 for value, _ in choices} for name, (_, choices) in BREAKDOWNS.items()}
+    assignees = {}
+    total = finished_count = 0
+    for group in groups:
+        total += group['count']
+        for name, (field, _) in BREAKDOWNS.items():
+            stats[name][group[field]] = stats[name].get(group[field], 0) + group['count']
+        assignees[group['assigned_to']] = assignees.get(group['assigned_to'], 0) + group['count']
+        if group['status'] == 'FINISHED':
+            finished_count += group['timed']
+
+    since = timezone.now() - timedelta(days=days)
+    per_day = (
+        issues.filter(created_time__gte=since)
+        .annotate(day=TruncDate('created_time'))
+        .values('day')
+        .annotate(count=Count('pk'))
+        .order_by('day')
+    )
+    return {
+        'project_id': project_id,
+        'issue_count': total,
+        **stats,
+        'by_assignee': [
+            {'assigned_to': user_id, 'count': count}
+            for user_id, count in sorted(assignees.items(), key=lambda item: (-item[1], item[0] is None, item[0]))
+        ],
+        'created_per_day': [{'date': row['day'].isoformat(), 'count': row['count']} for row in per_day],
+        'median_time_to_finished': median_time_to_finish(issues, finished_count),
+    }
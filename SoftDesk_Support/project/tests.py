@@ -1,3 +1,1264 @@
-from django.test import TestCase
+import asyncio
+import csv
+import io
+import json
+import tempfile
+import time
+from datetime import timedelta
+from unittest import mock
+from asgiref.sync import async_to_sync, sync_to_async
+from django.db import connection
+from django.db.models import F
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.http import http_date
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+from authentication.models import CustomUser
+from .models import Project, ProjectIdCounter, Contributor, Issue, Comment, Change, ChangeHorizon
+from .counters import reconcile_counters
+from .events import EventHub, LocalBroker, event_message, hub
+from .instrumentation import registry as performance_registry
+from .pagination import KeysetPagination
+from .query_detector import QueryDetectorTestMixin, detect_queries, normalize_sql
+from .response_cache import get_response_cache, invalidate_response_cache, LocMemResponseCache, FileResponseCache
+from .serializers import ProjectSerializer, IssueSerializer
+from .signals import reassign_user_projects_issues_comments
+from .views import ProjectStatsView
 
-# Create your tests here.
+
+def create_user(username, **kwargs):
+    """
+    Crée un utilisateur de test avec une date de naissance valide.
+    """
+    return CustomUser.objects.create_user(
+        username=username,
+        password='password',
+        date_of_birth='1990-01-01',
+        **kwargs
+    )
+
+
+class SoftDeskAPITestCase(QueryDetectorTestMixin, APITestCase):
+    """
+    Classe de base : un auteur, un contributeur et un projet.
+    """
+
+    def setUp(self):
+        super().setUp()
+        response_cache = get_response_cache()
+        if response_cache is not None:
+            response_cache.clear()
+        self.author = create_user('author')
+        self.contributor = create_user('contributor')
+        self.project = Project.objects.create(
+            name='Soft Desk',
+            description='Projet de test',
+            project_type='Backend',
+            author=self.author,
+        )
+        Contributor.objects.create(project=self.project, contributor=self.contributor)
+        self.client.force_authenticate(user=self.author)
+
+    def create_projects(self, count):
+        """
+        Crée `count` projets ayant chacun un contributeur.
+        """
+        for index in range(count):
+            project = Project.objects.create(
+                name=f'Projet {index}',
+                description='Projet de test',
+                project_type='Backend',
+                author=self.author,
+            )
+            Contributor.objects.create(project=project, contributor=self.contributor)
+
+    def create_issues(self, count, project=None):
+        """
+        Crée `count` issues sur le projet (par défaut le projet de test).
+        """
+        Issue.objects.bulk_create([
+            Issue(
+                project=project or self.project,
+                author=self.author,
+                title=f'Issue {index}',
+                description='Issue de test',
+            )
+            for index in range(count)
+        ])
+        # bulk_create n'émet pas post_save.
+        reconcile_counters([(project or self.project).project_id])
+        invalidate_response_cache((project or self.project).project_id)
+
+
+class ProjectListQueryCountTests(SoftDeskAPITestCase):
+    """
+    Le nombre de requêtes de la liste des projets ne dépend pas de la taille de la page.
+    """
+
+    # Validateur ETag + COUNT de pagination + projets/auteurs + contributeurs préchargés.
+    QUERY_BUDGET = 4
+
+    def test_list_query_count_is_constant(self):
+        self.create_projects(10)
+        with self.assertNumQueries(self.QUERY_BUDGET):
+            response = self.client.get(reverse('projects'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['results']), 6)
+        self.assertEqual(response.data['results'][0]['author']['username'], 'author')
+        self.assertEqual(response.data['results'][0]['contributors'][0]['username'], 'contributor')
+
+
+class ProjectDetailIssuesTests(SoftDeskAPITestCase):
+    """
+    Le détail d'un projet compte ses issues par annotation et borne la liste des titres.
+    """
+
+    def get_project(self, **params):
+        return self.client.get(reverse('project', args=[self.project.project_id]), params)
+
+    def test_query_count_does_not_grow_with_issues(self):
+        self.create_issues(1)
+        with CaptureQueriesContext(connection) as few_issues:
+            self.get_project()
+        self.create_issues(50)
+        with CaptureQueriesContext(connection) as many_issues:
+            self.get_project()
+        self.assertEqual(len(few_issues), len(many_issues))
+
+    def test_issue_titles_are_capped(self):
+        self.create_issues(30)
+        response = self.get_project()
+        self.assertEqual(response.data['issues_count'], 30)
+        self.assertEqual(len(response.data['issue_titles']), ProjectSerializer.ISSUE_TITLES_PREVIEW)
+
+        response = self.get_project(issue_titles=1000)
+        self.assertEqual(len(response.data['issue_titles']), 30)
+
+        self.create_issues(ProjectSerializer.ISSUE_TITLES_MAX)
+        response = self.get_project(issue_titles=1000)
+        self.assertEqual(len(response.data['issue_titles']), ProjectSerializer.ISSUE_TITLES_MAX)
+
+
+class IssueListQueryCountTests(SoftDeskAPITestCase):
+    """
+    La liste des issues calcule compteurs et noms des commentaires en un nombre fixe de requêtes.
+    """
+
+    def create_comments(self, count):
+        Comment.objects.bulk_create([
+            Comment(issue=issue, author=self.author, name=f'Commentaire {index}', description='Commentaire de test')
+            for issue in Issue.objects.filter(project=self.project)
+            for index in range(count)
+        ])
+        reconcile_counters([self.project.project_id])
+        invalidate_response_cache(self.project.project_id)
+
+    def get_issues(self):
+        return self.client.get(reverse('issues', args=[self.project.project_id]))
+
+    def test_query_count_does_not_grow_with_page_size(self):
+        self.create_issues(1)
+        self.create_comments(2)
+        with CaptureQueriesContext(connection) as one_issue:
+            self.get_issues()
+        self.create_issues(5)
+        self.create_comments(2)
+        with CaptureQueriesContext(connection) as full_page:
+            response = self.get_issues()
+        self.assertEqual(len(one_issue), len(full_page))
+        self.assertEqual(len(response.data['results']), 6)
+
+    def test_comment_count_and_titles(self):
+        self.create_issues(1)
+        self.create_comments(3)
+        issue = self.get_issues().data['results'][0]
+        self.assertEqual(issue['comment_count'], 3)
+        self.assertEqual(issue['comment_titles'], ['Commentaire 0', 'Commentaire 1', 'Commentaire 2'])
+
+
+class MembershipResolutionTests(SoftDeskAPITestCase):
+    """
+    Le projet et le rôle de l'utilisateur ne sont chargés qu'une fois par requête.
+    """
+
+    def project_queries(self, queries):
+        return [query for query in queries if 'FROM "project_project"' in query['sql']]
+
+    def test_project_loaded_once_per_request(self):
+        self.client.force_authenticate(user=self.contributor)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('issues', args=[self.project.project_id]))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(self.project_queries(queries)), 1)
+
+    def test_unknown_project_returns_404(self):
+        response = self.client.get(reverse('issues', args=['project_UNKNOWN']))
+        self.assertEqual(response.status_code, 404)
+
+    def test_outsider_is_denied(self):
+        self.client.force_authenticate(user=create_user('outsider'))
+        response = self.client.get(reverse('issues', args=[self.project.project_id]))
+        self.assertEqual(response.status_code, 403)
+
+
+@override_settings(MEMBERSHIP_CACHE_TIMEOUT=60)
+class MembershipCacheTests(SoftDeskAPITestCase):
+    """
+    Le cache inter-requêtes des rôles est invalidé lorsque les contributeurs changent.
+    """
+
+    def setUp(self):
+        cache.clear()
+        super().setUp()
+        self.client.force_authenticate(user=self.contributor)
+        self.url = reverse('issues', args=[self.project.project_id])
+
+    def test_cached_role_skips_membership_queries(self):
+        self.client.get(self.url)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse([query for query in queries if 'project_contributor' in query['sql']])
+
+    def test_removed_contributor_loses_access(self):
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+        Contributor.objects.filter(project=self.project, contributor=self.contributor).delete()
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+
+    def test_evicted_version_does_not_revive_stale_roles(self):
+        version_key = f'membership:version:{self.project.project_id}'
+        cache.delete(version_key)
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+        Contributor.objects.filter(project=self.project, contributor=self.contributor).delete()
+        cache.delete(version_key)
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+
+
+class ProjectIdTests(SoftDeskAPITestCase):
+    """
+    Les identifiants de projet sont alloués par un compteur par préfixe.
+    """
+
+    def test_ids_share_prefix_with_increasing_suffix(self):
+        self.assertEqual(self.project.project_id, 'project_SD')
+        ids = [
+            Project.objects.create(name='Soft Desk', description='Projet', project_type='Backend').project_id
+            for _ in range(3)
+        ]
+        self.assertEqual(ids, ['project_SD_1', 'project_SD_2', 'project_SD_3'])
+
+    def test_prefixes_are_independent(self):
+        project = Project.objects.create(name='Soft Desk Android', description='Projet', project_type='Android')
+        self.assertEqual(project.project_id, 'project_SDA')
+        self.assertEqual(ProjectIdCounter.objects.get(prefix='project_SD').last_value, 1)
+
+
+class UserDeletionReassignmentTests(SoftDeskAPITestCase):
+    """
+    La suppression d'un utilisateur réaffecte ses contenus par mises à jour en masse.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.admin = create_user('admin', is_superuser=True, is_staff=True)
+
+    def create_content(self, user, count):
+        for index in range(count):
+            project = Project.objects.create(
+                name=f'Projet {user.username}', description='Projet', project_type='Backend', author=user
+            )
+            issue = Issue.objects.create(project=project, author=user, title='Issue', description='Issue')
+            Comment.objects.create(issue=issue, author=user, name='Commentaire', description='Commentaire')
+            own_issue = Issue.objects.create(project=self.project, author=user, title='Issue', description='Issue')
+            Comment.objects.create(issue=own_issue, author=user, name='Commentaire', description='Commentaire')
+
+    def reassign(self, user):
+        with CaptureQueriesContext(connection) as queries:
+            reassign_user_projects_issues_comments(CustomUser, user)
+        return len(queries)
+
+    def test_query_count_does_not_grow_with_content(self):
+        light_user = create_user('light')
+        heavy_user = create_user('heavy')
+        self.create_content(light_user, 1)
+        self.create_content(heavy_user, 10)
+        self.assertEqual(self.reassign(light_user), self.reassign(heavy_user))
+
+    def test_content_is_reassigned(self):
+        self.create_content(self.contributor, 2)
+        self.contributor.delete()
+        self.assertEqual(Project.objects.filter(author=self.admin).count(), 2)
+        self.assertEqual(Issue.objects.filter(author=self.admin).count(), 2)
+        self.assertEqual(Issue.objects.filter(author=self.author).count(), 2)
+        self.assertEqual(Comment.objects.filter(author=self.admin).count(), 2)
+        self.assertEqual(Comment.objects.filter(author=self.author).count(), 2)
+
+
+class KeysetPaginationTests(SoftDeskAPITestCase):
+    """
+    La pagination par curseur est optionnelle, sans COUNT(*), et la taille de page est plafonnée.
+    """
+
+    def test_cursor_pages_cover_every_issue(self):
+        self.create_issues(15)
+        url = reverse('issues', args=[self.project.project_id])
+        response = self.client.get(url, {'pagination': 'cursor', 'page_size': 4})
+        self.assertNotIn('count', response.data)
+        seen = []
+        while True:
+            seen.extend(issue['issue_id'] for issue in response.data['results'])
+            if not response.data['next']:
+                break
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(response.data['next'])
+            self.assertFalse([query for query in queries if '"__count"' in query['sql']])
+        self.assertEqual(sorted(seen), sorted(Issue.objects.values_list('issue_id', flat=True)))
+        self.assertEqual(len(seen), len(set(seen)))
+
+    def test_ties_on_created_time_are_paged_by_primary_key(self):
+        self.create_issues(7)
+        Issue.objects.update(created_time=timezone.now())
+        url = reverse('issues', args=[self.project.project_id])
+        pages = [self.client.get(url, {'pagination': 'cursor', 'page_size': 3, 'ordering': 'created_time'}).data]
+        while pages[-1]['next']:
+            with CaptureQueriesContext(connection) as queries:
+                pages.append(self.client.get(pages[-1]['next']).data)
+            self.assertFalse([query for query in queries if 'OFFSET' in query['sql']])
+        seen = [issue['issue_id'] for page in pages for issue in page['results']]
+        self.assertEqual(seen, sorted(Issue.objects.values_list('issue_id', flat=True)))
+        previous = self.client.get(pages[-1]['previous']).data
+        self.assertEqual(previous['results'], pages[-2]['results'])
+
+    def test_invalid_cursor_is_404(self):
+        url = reverse('issues', args=[self.project.project_id])
+        self.assertEqual(self.client.get(url, {'cursor': 'cD1bIngiXQ=='}).status_code, 404)
+
+    def test_page_size_is_capped(self):
+        self.create_projects(KeysetPagination.max_page_size + 5)
+        response = self.client.get(reverse('projects'), {'pagination': 'cursor', 'page_size': 1000})
+        self.assertEqual(len(response.data['results']), KeysetPagination.max_page_size)
+
+    def test_page_number_pagination_is_default(self):
+        response = self.client.get(reverse('projects'))
+        self.assertEqual(response.data['count'], 1)
+
+
+class IssueBulkTests(SoftDeskAPITestCase):
+    """
+    Création et modification d'issues en masse, avec un résultat par élément.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.url = reverse('issues-bulk', args=[self.project.project_id])
+
+    def test_bulk_create_json_array(self):
+        items = [{'title': f'Issue {index}', 'description': 'Import'} for index in range(20)]
+        items[0]['assigned_to'] = self.contributor.id
+        with CaptureQueriesContext(connection) as small_batch:
+            self.client.post(self.url, items[:2], format='json')
+        with CaptureQueriesContext(connection) as large_batch:
+            response = self.client.post(self.url, items, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(small_batch), len(large_batch))
+        self.assertEqual(Issue.objects.filter(project=self.project).count(), 22)
+        self.assertEqual(Issue.objects.get(issue_id=response.data['results'][0]['issue_id']).assigned_to,
+                         self.contributor)
+
+    def test_bulk_create_ndjson_with_invalid_items(self):
+        body = '\n'.join([
+            '{"title": "Valide", "description": "Import"}',
+            '{"title": "Statut invalide", "description": "Import", "status": "DONE"}',
+            '{"title": "Assignation invalide", "description": "Import", "assigned_to": 999}',
+        ])
+        response = self.client.post(self.url, body, content_type='application/x-ndjson')
+        self.assertEqual(response.status_code, 207)
+        self.assertEqual([result['status'] for result in response.data['results']], [201, 400, 400])
+        self.assertEqual(Issue.objects.filter(project=self.project).count(), 1)
+
+    def test_assigned_to_accepts_numeric_strings(self):
+        response = self.client.post(self.url, [
+            {'title': 'Chaîne', 'description': '-', 'assigned_to': str(self.contributor.id)},
+            {'title': 'Inconnu', 'description': '-', 'assigned_to': 'abc'},
+        ], format='json')
+        self.assertEqual([result['status'] for result in response.data['results']], [201, 400])
+        self.assertEqual(Issue.objects.get(title='Chaîne').assigned_to, self.contributor)
+
+    def test_ndjson_with_invalid_encoding_is_400(self):
+        body = b'{"title": "Valide", "description": "Import"}\n{"title": "\xff", "description": "-"}'
+        response = self.client.post(self.url, body, content_type='application/x-ndjson')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('ligne 2', str(response.data['detail']))
+
+    def test_bulk_update(self):
+        self.create_issues(3)
+        issue_ids = list(Issue.objects.values_list('issue_id', flat=True))
+        foreign = Issue.objects.create(project=self.project, author=self.contributor, title='Autre', description='-')
+        items = [{'issue_id': issue_id, 'status': 'FINISHED'} for issue_id in issue_ids]
+        items += [{'issue_id': foreign.issue_id, 'status': 'FINISHED'}, {'issue_id': 0, 'priority': 'HIGH'}]
+        response = self.client.patch(self.url, items, format='json')
+        self.assertEqual(response.status_code, 207)
+        self.assertEqual([result['status'] for result in response.data['results']], [200, 200, 200, 403, 404])
+        self.assertEqual(Issue.objects.filter(status='FINISHED').count(), 3)
+
+
+class ProjectExportTests(SoftDeskAPITestCase):
+    """
+    L'export en flux restitue chaque issue suivie de ses commentaires.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.create_issues(3)
+        for issue in Issue.objects.order_by('issue_id')[:2]:
+            Comment.objects.create(issue=issue, author=self.author, name=f'Sur {issue.title}', description='-')
+
+    def export(self, export_format):
+        response = self.client.get(reverse('project-export', args=[self.project.project_id, export_format]))
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content).decode()
+
+    def test_ndjson_export(self):
+        records = [json.loads(line) for line in self.export('ndjson').splitlines()]
+        self.assertEqual(
+            [(record['type'], record.get('title') or record.get('name')) for record in records],
+            [('issue', 'Issue 0'), ('comment', 'Sur Issue 0'), ('issue', 'Issue 1'), ('comment', 'Sur Issue 1'),
+             ('issue', 'Issue 2')],
+        )
+
+    def test_csv_export(self):
+        rows = list(csv.DictReader(io.StringIO(self.export('csv'))))
+        self.assertEqual(len(rows), 5)
+        self.assertEqual(rows[1]['type'], 'comment')
+        self.assertEqual(rows[1]['issue_id'], rows[0]['issue_id'])
+
+    def test_outsider_is_denied(self):
+        self.client.force_authenticate(user=create_user('outsider'))
+        response = self.client.get(reverse('project-export', args=[self.project.project_id, 'csv']))
+        self.assertEqual(response.status_code, 403)
+
+
+class SearchTests(SoftDeskAPITestCase):
+    """
+    La recherche plein texte est limitée aux projets accessibles et suit les modifications.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.issue = Issue.objects.create(
+            project=self.project, author=self.author, title='Crash au démarrage', description='Stacktrace jointe'
+        )
+        Comment.objects.create(issue=self.issue, author=self.author, name='Reproduit', description='Crash confirmé')
+        other_project = Project.objects.create(
+            name='Autre', description='Projet privé', project_type='Backend', author=create_user('stranger')
+        )
+        Issue.objects.create(project=other_project, author=other_project.author, title='Crash privé', description='-')
+
+    def search(self, query):
+        return self.client.get(reverse('search'), {'q': query}).data['results']
+
+    def test_results_are_scoped_and_highlighted(self):
+        results = self.search('crash')
+        self.assertEqual({result['type'] for result in results}, {'issue', 'comment'})
+        self.assertTrue(all(result['project_id'] == self.project.project_id for result in results))
+        issue = next(result for result in results if result['type'] == 'issue')
+        self.assertEqual(issue['title'], '<mark>Crash</mark> au démarrage')
+
+    def test_index_follows_updates_and_deletes(self):
+        Issue.objects.filter(pk=self.issue.pk).update(title='Lenteur')
+        self.assertEqual([result['type'] for result in self.search('lenteur')], ['issue'])
+        self.issue.delete()
+        self.assertEqual(self.search('lenteur'), [])
+        self.assertEqual(self.search('crash'), [])
+
+    def test_prefix_and_accents(self):
+        self.assertEqual(len(self.search('demar')), 1)
+
+    def test_user_text_is_html_escaped(self):
+        Issue.objects.create(project=self.project, author=self.author, title='<script>piège</script>',
+                             description='<img src=x onerror=alert(1)> piège')
+        expected_title = '&lt;script&gt;<mark>piège</mark>&lt;/script&gt;'
+        issue = next(result for result in self.search('piege') if result['type'] == 'issue')
+        self.assertEqual(issue['title'], expected_title)
+        self.assertTrue(issue['snippet'].startswith('&lt;img src=x onerror=alert(1)&gt;'))
+        with mock.patch('project.search.fts_available', return_value=False):
+            fallback = next(result for result in self.search('piège') if result['type'] == 'issue')
+        self.assertEqual(fallback['title'], '&lt;script&gt;piège&lt;/script&gt;')
+        self.assertNotIn('<img', fallback['snippet'])
+
+
+class IssueListParametersTests(SoftDeskAPITestCase):
+    """
+    Filtres, tri et sélection des champs de la liste des issues.
+    """
+
+    def setUp(self):
+        super().setUp()
+        for title, status, priority, assignee in [
+            ('A', 'TO_DO', 'HIGH', self.contributor),
+            ('B', 'IN_PROGRESS', 'LOW', None),
+            ('C', 'FINISHED', 'HIGH', self.contributor),
+        ]:
+            Issue.objects.create(project=self.project, author=self.author, title=title, description='-',
+                                 status=status, priority=priority, assigned_to=assignee)
+        self.url = reverse('issues', args=[self.project.project_id])
+
+    def titles(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, 200)
+        return [issue['title'] for issue in response.data['results']]
+
+    def test_filters(self):
+        self.assertEqual(self.titles(status='TO_DO,FINISHED', ordering='title'), ['A', 'C'])
+        self.assertEqual(self.titles(priority='HIGH', assigned_to=self.contributor.id, ordering='title'), ['A', 'C'])
+        self.assertEqual(self.client.get(self.url, {'status': 'DONE'}).status_code, 400)
+
+    def test_ordering(self):
+        self.assertEqual(self.titles(ordering='-title'), ['C', 'B', 'A'])
+        self.assertEqual(self.titles(), ['C', 'B', 'A'])
+
+    def test_sparse_fieldset_skips_comment_queries(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url, {'fields': 'issue_id,title'})
+        self.assertEqual(set(response.data['results'][0]), {'issue_id', 'title'})
+        self.assertFalse([query for query in queries if 'project_comment' in query['sql']])
+
+    def test_unknown_sparse_fields_are_rejected(self):
+        response = self.client.get(self.url, {'fields': 'issue_id,titel,secret'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('secret, titel', str(response.data['fields']))
+        issue_id = Issue.objects.filter(project=self.project).values_list('issue_id', flat=True).first()
+        async_url = reverse('async-issue', args=[self.project.project_id, issue_id])
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(self.author)}')
+        self.assertEqual(self.client.get(async_url, {'fields': 'titel'}).status_code, 400)
+
+
+class ConditionalGetTests(SoftDeskAPITestCase):
+    """
+    Les requêtes conditionnelles reçoivent un 304 sans sérialisation tant que la ressource n'a pas changé.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.create_issues(3)
+        self.url = reverse('issues', args=[self.project.project_id])
+
+    def test_if_none_match_returns_304_without_serializing(self):
+        etag = self.client.get(self.url)['ETag']
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        page_queries = [query for query in queries if 'FROM "project_issue"' in query['sql'] and 'LIMIT' in query['sql']]
+        self.assertFalse(page_queries)
+
+    def test_etag_changes_with_issues_and_comments(self):
+        etags = [self.client.get(self.url)['ETag']]
+        issue = Issue.objects.filter(project=self.project).first()
+        Comment.objects.create(issue=issue, author=self.author, name='Nouveau', description='-')
+        etags.append(self.client.get(self.url)['ETag'])
+        issue.delete()
+        etags.append(self.client.get(self.url)['ETag'])
+        self.assertEqual(len(set(etags)), 3)
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etags[0])
+        self.assertEqual(response.status_code, 200)
+
+    def test_list_validated_by_etag_only(self):
+        response = self.client.get(self.url)
+        self.assertNotIn('Last-Modified', response)
+        Issue.objects.filter(project=self.project).first().delete()
+        response = self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=http_date(time.time() + 60))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['results']), 2)
+
+    def test_username_change_invalidates_list_etags(self):
+        urls = [self.url, reverse('projects')]
+        etags = [self.client.get(url)['ETag'] for url in urls]
+        self.contributor.username = 'renamed'
+        self.contributor.save()
+        self.author.username = 'renamed_author'
+        self.author.save()
+        for url, etag in zip(urls, etags):
+            with self.subTest(url=url):
+                self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_malformed_comment_id_returns_404(self):
+        issue = Issue.objects.filter(project=self.project).first()
+        url = reverse('comment', args=[self.project.project_id, issue.issue_id, 'not-a-uuid'])
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+    def test_if_modified_since_on_project(self):
+        url = reverse('project', args=[self.project.project_id])
+        last_modified = self.client.get(url)['Last-Modified']
+        self.assertEqual(self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified).status_code, 304)
+
+
+class ResponseCacheTests(SoftDeskAPITestCase):
+    """
+    Les réponses du détail des projets et de la liste des issues sont mises en cache et invalidées par les signaux.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.create_issues(2)
+        self.url = reverse('issues', args=[self.project.project_id])
+
+    def test_hit_after_miss(self):
+        stats = get_response_cache().stats()
+        first = self.client.get(self.url)
+        with CaptureQueriesContext(connection) as queries:
+            second = self.client.get(self.url)
+        self.assertEqual(first.data, second.data)
+        self.assertFalse([query for query in queries if 'LIMIT 6' in query['sql']])
+        new_stats = get_response_cache().stats()
+        self.assertEqual(new_stats['misses'] - stats['misses'], 1)
+        self.assertEqual(new_stats['hits'] - stats['hits'], 1)
+
+    def test_comment_invalidates_issue_list(self):
+        self.client.get(self.url)
+        Comment.objects.create(issue=Issue.objects.first(), author=self.author, name='Nouveau', description='-')
+        response = self.client.get(self.url)
+        self.assertEqual(sum(issue['comment_count'] for issue in response.data['results']), 1)
+
+    def test_bulk_create_invalidates_issue_list(self):
+        self.client.get(self.url)
+        self.client.post(reverse('issues-bulk', args=[self.project.project_id]),
+                         [{'title': 'Import', 'description': '-'}], format='json')
+        self.assertEqual(self.client.get(self.url).data['count'], 3)
+
+    def test_moved_issue_invalidates_previous_project(self):
+        self.client.get(self.url)
+        other = Project.objects.create(name='Autre', description='-', project_type='Backend', author=self.author)
+        issue = Issue.objects.filter(project=self.project).first()
+        issue.project = other
+        issue.save()
+        self.assertEqual(self.client.get(self.url).data['count'], 1)
+
+    def test_username_change_invalidates_responses(self):
+        self.client.get(self.url)
+        self.author.username = 'renamed'
+        self.author.save()
+        self.assertTrue(all(issue['author']['username'] == 'renamed'
+                            for issue in self.client.get(self.url).data['results']))
+
+    def test_stats_are_admin_only(self):
+        self.assertEqual(self.client.get(reverse('cache-stats')).status_code, 403)
+        self.client.force_authenticate(user=create_user('staff', is_staff=True))
+        self.assertIn('hits', self.client.get(reverse('cache-stats')).data)
+
+
+class ResponseCacheBackendTests(TestCase):
+    """
+    Éviction LRU et invalidation ciblée des backends de cache de réponses.
+    """
+
+    def check_backend(self, response_cache):
+        response_cache.set('p1', 'a', {'value': 1})
+        response_cache.set('p1', 'b', {'value': 2})
+        self.assertEqual(response_cache.get('p1', 'a'), {'value': 1})
+        response_cache.set('p2', 'c', {'value': 3})
+        self.assertLessEqual(len(response_cache), 2)
+        self.assertIsNone(response_cache.get('p1', 'b'))
+        response_cache.invalidate('p2')
+        self.assertIsNone(response_cache.get('p2', 'c'))
+
+    def test_locmem_backend(self):
+        self.check_backend(LocMemResponseCache(max_entries=2))
+
+    def test_entries_expire_after_timeout(self):
+        with tempfile.TemporaryDirectory() as location:
+            for response_cache in (LocMemResponseCache(timeout=60), FileResponseCache(location, timeout=60)):
+                with self.subTest(backend=type(response_cache).__name__):
+                    response_cache.set('p1', 'a', {'value': 1})
+                    response_cache.set('p1', 'b', {'value': 2}, timeout=0)
+                    self.assertEqual(response_cache.get('p1', 'a'), {'value': 1})
+                    self.assertIsNone(response_cache.get('p1', 'b'))
+
+    def test_file_backend(self):
+        with tempfile.TemporaryDirectory() as location:
+            response_cache = FileResponseCache(location, max_entries=2)
+            response_cache.set('p1', 'a', {'value': 1})
+            time.sleep(0.01)
+            response_cache.set('p1', 'b', {'value': 2})
+            time.sleep(0.01)
+            self.check_backend(response_cache)
+
+
+class AsyncViewsTests(SoftDeskAPITestCase):
+    """
+    Les vues asynchrones renvoient les mêmes données que les vues synchrones, avec les mêmes permissions.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.create_issues(8)
+        self.issue = Issue.objects.filter(project=self.project).order_by('issue_id').first()
+        self.comment = Comment.objects.create(
+            issue=self.issue, author=self.contributor, name='Commentaire', description='Commentaire de test')
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(self.author)}')
+
+    def test_async_views_match_sync_views(self):
+        kwargs = {'project_id': self.project.project_id, 'issue_id': self.issue.issue_id}
+        cases = [
+            ('projects', {}, ''),
+            ('project', {'project_id': self.project.project_id}, '?issue_titles=3'),
+            ('issues', {'project_id': self.project.project_id}, '?status=TO_DO&ordering=title&page=2'),
+            ('issue', kwargs, '?fields=issue_id,title,comment_titles'),
+            ('comments', kwargs, ''),
+            ('comment', {**kwargs, 'comment_id': self.comment.comment_id}, ''),
+        ]
+        for name, url_kwargs, query in cases:
+            with self.subTest(name=name):
+                sync_response = self.client.get(reverse(name, kwargs=url_kwargs) + query)
+                async_response = self.client.get(reverse(f'async-{name}', kwargs=url_kwargs) + query)
+                self.assertEqual(async_response.status_code, 200)
+                # Seuls les liens de pagination diffèrent, par leur préfixe.
+                async_data = json.loads(async_response.content.decode().replace('/api/async/', '/api/'))
+                self.assertEqual(async_data, sync_response.json())
+
+    def test_async_views_check_permissions(self):
+        url = reverse('async-issues', kwargs={'project_id': self.project.project_id})
+        outsider = create_user('outsider')
+
+        self.client.credentials()
+        self.assertEqual(self.client.get(url).status_code, 401)
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer invalide')
+        self.assertEqual(self.client.get(url).status_code, 401)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(outsider)}')
+        self.assertEqual(self.client.get(url).status_code, 403)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(self.contributor)}')
+        self.assertEqual(self.client.get(url).status_code, 200)
+        self.assertEqual(self.client.get(reverse('async-issues', kwargs={'project_id': 'inconnu'})).status_code, 404)
+        self.assertEqual(self.client.get(url + '?status=INCONNU').status_code, 400)
+
+    async def test_async_views_under_asgi_handler(self):
+        url = reverse('async-issue', kwargs={'project_id': self.project.project_id, 'issue_id': self.issue.issue_id})
+        token = AccessToken.for_user(self.author)
+        response = await self.async_client.get(url, headers={'Authorization': f'Bearer {token}'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['comment_titles'], ['Commentaire'])
+
+
+class PerformanceInstrumentationTests(SoftDeskAPITestCase):
+    """
+    Le middleware agrège par nom d'URL durée, requêtes SQL, sérialisation et taille des réponses.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.create_issues(5)
+        performance_registry.reset()
+
+    def test_metrics_are_recorded_per_url_name(self):
+        url = reverse('issues', kwargs={'project_id': self.project.project_id})
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        query_count = len(queries)
+        self.client.get(url + '?page=99')
+
+        stats = performance_registry.snapshot()['issues']
+        self.assertEqual(stats['count'], 2)
+        self.assertEqual(stats['status_codes'], {'200': 1, '404': 1})
+        self.assertEqual(stats['queries']['max'], query_count)
+        self.assertEqual(stats['response_bytes']['max'], len(response.content))
+        self.assertGreater(stats['serializer_ms']['max'], 0)
+        self.assertGreaterEqual(stats['wall_ms']['max'], stats['db_ms']['max'])
+
+    def test_server_timing_header_is_optional(self):
+        url = reverse('project', kwargs={'project_id': self.project.project_id})
+        self.assertNotIn('Server-Timing', self.client.get(url))
+        with self.settings(PERF_INSTRUMENTATION={'SERVER_TIMING': True}):
+            header = self.client.get(url)['Server-Timing']
+        self.assertRegex(header, r'^total;dur=[\d.]+, db;dur=[\d.]+;desc="\d+ queries", serialize;dur=[\d.]+$')
+
+    def test_stats_are_reserved_to_admins(self):
+        self.client.get(reverse('projects'))
+        self.assertEqual(self.client.get(reverse('perf-stats')).status_code, 403)
+
+        self.client.force_authenticate(user=create_user('staff', is_staff=True))
+        response = self.client.get(reverse('perf-stats'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['projects']['count'], 1)
+        self.assertEqual(self.client.delete(reverse('perf-stats')).status_code, 204)
+        self.assertNotIn('projects', performance_registry.snapshot())
+
+
+class QueryDetectorTests(SoftDeskAPITestCase):
+    """
+    Le détecteur regroupe les requêtes par forme et signale les N+1 avec leur origine.
+    """
+
+    def test_normalize_sql(self):
+        self.assertEqual(
+            normalize_sql("SELECT *  FROM t WHERE a = 'x' AND b IN (%s, %s, %s) LIMIT 21"),
+            'SELECT * FROM t WHERE a = ? AND b IN (...) LIMIT ?',
+        )
+
+    def test_per_row_queries_are_reported_with_serializer_field(self):
+        self.create_issues(4)
+        with detect_queries('issues') as report:
+            IssueSerializer(Issue.objects.filter(project=self.project), many=True).data
+        origins = {origin for shape in report.repeated for origin in shape.origins}
+        self.assertEqual(origins, {'IssueSerializer.author', 'IssueSerializer.comment_titles'})
+
+    def test_permission_queries_are_attributed(self):
+        self.client.get(reverse('issues', kwargs={'project_id': self.project.project_id}))
+        report = self.query_reports[-1]
+        self.assertIn('(issues)', report.label)
+        origins = {origin for shape in report.shapes.values() for origin in shape.origins}
+        self.assertIn('IsAuthor.has_permission', origins)
+
+    def test_mixin_fails_on_reported_problems(self):
+        self.create_issues(4)
+        with detect_queries('issues') as report:
+            IssueSerializer(Issue.objects.filter(project=self.project), many=True).data
+        self.query_reports.append(report)
+        with self.assertRaisesRegex(AssertionError, r'\[N\+1\] ×4'):
+            self.assertNoQueryProblems()
+        self.query_reports.clear()
+
+
+class CounterTests(SoftDeskAPITestCase):
+    """
+    Les compteurs dénormalisés suivent créations, suppressions et changements de statut, y compris en masse.
+    """
+
+    def assertCounters(self, issues, open_issues, contributors):
+        self.project.refresh_from_db()
+        self.assertEqual(
+            (self.project.issue_count, self.project.open_issue_count, self.project.contributor_count),
+            (issues, open_issues, contributors),
+        )
+
+    def test_issue_lifecycle(self):
+        issues_url = reverse('issues', args=[self.project.project_id])
+        data = {'title': 'Issue', 'description': '-', 'project_id': self.project.project_id}
+        self.client.post(issues_url, data)
+        self.client.post(issues_url, data)
+        self.assertCounters(2, 2, 1)
+        issue = Issue.objects.filter(project=self.project).first()
+        url = reverse('issue', args=[self.project.project_id, issue.issue_id])
+        self.assertEqual(self.client.put(url, {**data, 'status': 'FINISHED'}).status_code, 200)
+        self.assertCounters(2, 1, 1)
+        self.client.put(url, {**data, 'status': 'FINISHED', 'priority': 'HIGH'})
+        self.assertCounters(2, 1, 1)
+        Comment.objects.create(issue=issue, author=self.author, name='Commentaire', description='-')
+        comment = Comment.objects.create(issue=issue, author=self.author, name='Commentaire', description='-')
+        comment.delete()
+        issue.refresh_from_db()
+        self.assertEqual(issue.comment_count, 1)
+        self.assertEqual(self.client.delete(url).status_code, 204)
+        self.assertCounters(1, 1, 1)
+
+    def test_bulk_endpoints_and_cascades(self):
+        url = reverse('issues-bulk', args=[self.project.project_id])
+        response = self.client.post(url, [{'title': f'Issue {index}', 'description': '-'} for index in range(3)],
+                                    format='json')
+        self.assertCounters(3, 3, 1)
+        issue_ids = [result['issue_id'] for result in response.data['results']]
+        self.client.patch(url, [{'issue_id': issue_id, 'status': 'FINISHED'} for issue_id in issue_ids[:2]],
+                          format='json')
+        self.assertCounters(3, 1, 1)
+        create_user('admin', is_superuser=True)
+        self.contributor.delete()
+        self.assertCounters(3, 1, 0)
+
+    def test_reconcile_command_fixes_drift(self):
+        self.create_issues(2)
+        Project.objects.filter(pk=self.project.pk).update(issue_count=7, open_issue_count=-1)
+        output = io.StringIO()
+        call_command('reconcile_counters', stdout=output)
+        self.assertIn('issue_count               1', output.getvalue())
+        self.assertCounters(2, 2, 1)
+        self.assertFalse(any(reconcile_counters().values()))
+
+    def test_projects_sorted_by_activity(self):
+        self.create_projects(2)
+        busy = Project.objects.exclude(pk=self.project.pk).first()
+        self.create_issues(3, project=busy)
+        response = self.client.get(reverse('projects'), {'ordering': '-open_issue_count'})
+        self.assertEqual(response.data['results'][0]['project_id'], busy.project_id)
+        self.assertEqual(response.data['results'][0]['open_issue_count'], 3)
+
+
+class ProjectStatsTests(SoftDeskAPITestCase):
+    """
+    Statistiques d'un projet : répartitions et médiane par agrégats, mises en cache jusqu'au changement des issues.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.url = reverse('project-stats', args=[self.project.project_id])
+
+    def create_issue(self, **kwargs):
+        return Issue.objects.create(
+            project=self.project, author=self.author, title='Issue', description='-', **kwargs
+        )
+
+    def test_breakdowns_and_median(self):
+        self.create_issue(priority='HIGH', assigned_to=self.contributor)
+        self.create_issue(status='IN_PROGRESS', tag='FEATURE', assigned_to=self.contributor)
+        created = timezone.now() - timedelta(days=10)
+        for days in (1, 2, 6):
+            issue = self.create_issue(status='FINISHED')
+            Issue.objects.filter(pk=issue.pk).update(created_time=created, finished_time=created + timedelta(days))
+        invalidate_response_cache(self.project.project_id)
+
+        data = self.client.get(self.url).data
+        self.assertEqual(data['issue_count'], 5)
+        self.assertEqual(data['by_status'], {'TO_DO': 1, 'IN_PROGRESS': 1, 'FINISHED': 3})
+        self.assertEqual(data['by_priority'], {'LOW': 0, 'MEDIUM': 4, 'HIGH': 1})
+        self.assertEqual(data['by_tag'], {'BUG': 4, 'FEATURE': 1, 'TASK': 0})
+        self.assertEqual(data['by_assignee'], [
+            {'assigned_to': None, 'count': 3}, {'assigned_to': self.contributor.id, 'count': 2},
+        ])
+        self.assertEqual(data['created_per_day'], [
+            {'date': created.date().isoformat(), 'count': 3}, {'date': timezone.now().date().isoformat(), 'count': 2},
+        ])
+        self.assertEqual(self.client.get(self.url, {'days': 5}).data['created_per_day'], [
+            {'date': timezone.now().date().isoformat(), 'count': 2},
+        ])
+        self.assertEqual(data['median_time_to_finished'], timedelta(days=2).total_seconds())
+
+    def test_stats_are_cached_until_issues_change(self):
+        self.create_issue()
+        with CaptureQueriesContext(connection) as first:
+            self.assertEqual(self.client.get(self.url).data['issue_count'], 1)
+        statistics = [query for query in first.captured_queries if 'GROUP BY' in query['sql']]
+        self.assertEqual(len(statistics), 2)
+        with CaptureQueriesContext(connection) as cached:
+            self.client.get(self.url)
+        self.assertFalse([query for query in cached.captured_queries if 'project_issue' in query['sql']])
+        self.create_issue()
+        self.assertEqual(self.client.get(self.url).data['issue_count'], 2)
+
+    def test_finished_time_follows_status(self):
+        issue = self.create_issue()
+        self.assertIsNone(issue.finished_time)
+        issue.status = 'FINISHED'
+        issue.save()
+        finished_time = issue.finished_time
+        self.assertIsNotNone(finished_time)
+        issue.priority = 'HIGH'
+        issue.save()
+        self.assertEqual(issue.finished_time, finished_time)
+        issue.status = 'TO_DO'
+        issue.save()
+        self.assertIsNone(issue.finished_time)
+
+        self.client.patch(reverse('issues-bulk', args=[self.project.project_id]),
+                          [{'issue_id': issue.issue_id, 'status': 'FINISHED'}], format='json')
+        issue.refresh_from_db()
+        self.assertIsNotNone(issue.finished_time)
+
+    def test_issue_created_finished_is_finished_at_creation(self):
+        self.create_issue(status='FINISHED')
+        self.client.post(reverse('issues-bulk', args=[self.project.project_id]), [
+            {'title': 'Import', 'description': '-', 'status': 'FINISHED'},
+            {'title': 'Import', 'description': '-'},
+        ], format='json')
+        for issue in Issue.objects.filter(status='FINISHED'):
+            self.assertEqual(issue.finished_time, issue.created_time)
+        self.assertEqual(self.client.get(self.url).data['median_time_to_finished'], 0)
+
+        # Données antérieures : la durée est bornée à 0.
+        Issue.objects.filter(status='FINISHED').update(finished_time=F('created_time') - timedelta(seconds=1))
+        invalidate_response_cache(self.project.project_id)
+        self.assertEqual(self.client.get(self.url).data['median_time_to_finished'], 0)
+
+    def test_stats_expire(self):
+        self.create_issue()
+        self.client.get(self.url)
+        # Écriture sans signal : seule l'expiration de l'entrée la fait apparaître.
+        Issue.objects.filter(project=self.project).update(priority='HIGH')
+        self.assertEqual(self.client.get(self.url).data['by_priority']['HIGH'], 0)
+        later = time.time() + ProjectStatsView.CACHE_TIMEOUT + 1
+        with mock.patch('project.response_cache.time.time', return_value=later):
+            self.assertEqual(self.client.get(self.url).data['by_priority']['HIGH'], 1)
+
+    def test_unknown_project_is_404_for_admins(self):
+        self.client.force_authenticate(user=create_user('staff', is_staff=True))
+        self.assertEqual(self.client.get(reverse('project-stats', args=['inconnu'])).status_code, 404)
+
+    def test_outsider_is_rejected(self):
+        self.client.force_authenticate(user=create_user('outsider'))
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+
+
+class UserFeedTests(SoftDeskAPITestCase):
+    """
+    /api/me/issues/ et /api/me/comments/ : une requête paginée par curseur, quel que soit le nombre de projets.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_authenticate(user=self.contributor)
+
+    def create_issue(self, project, author, **kwargs):
+        return Issue.objects.create(project=project, author=author, title='Issue', description='-', **kwargs)
+
+    def test_issues_assigned_or_authored_in_member_projects(self):
+        assigned = self.create_issue(self.project, self.author, assigned_to=self.contributor)
+        authored = self.create_issue(self.project, self.contributor)
+        self.create_issue(self.project, self.author)
+        other = Project.objects.create(name='Other', description='-', project_type='Backend', author=self.author)
+        # L'utilisateur n'est pas membre de ce projet : l'issue qui lui est assignée n'est pas listée.
+        self.create_issue(other, self.author, assigned_to=self.contributor)
+
+        response = self.client.get(reverse('my-issues'))
+        self.assertEqual([issue['issue_id'] for issue in response.data['results']],
+                         [authored.issue_id, assigned.issue_id])
+        response = self.client.get(reverse('my-issues'), {'role': 'assigned'})
+        self.assertEqual([issue['issue_id'] for issue in response.data['results']], [assigned.issue_id])
+        self.assertEqual(self.client.get(reverse('my-issues'), {'role': 'owner'}).status_code, 400)
+
+    def test_query_count_does_not_grow_with_projects(self):
+        def feed_queries():
+            with CaptureQueriesContext(connection) as queries:
+                self.assertEqual(self.client.get(reverse('my-issues'), {'fields': 'issue_id,title'}).status_code, 200)
+            return len(queries)
+
+        self.create_issue(self.project, self.contributor)
+        few = feed_queries()
+        for index in range(5):
+            project = Project.objects.create(name=f'Projet {index}', description='-', project_type='Backend',
+                                             author=self.author)
+            Contributor.objects.create(project=project, contributor=self.contributor)
+            self.create_issue(project, self.author, assigned_to=self.contributor)
+        self.assertEqual(few, feed_queries())
+
+    def test_keyset_pagination(self):
+        for _ in range(8):
+            self.create_issue(self.project, self.contributor)
+        first = self.client.get(reverse('my-issues'), {'page_size': 5})
+        self.assertEqual(len(first.data['results']), 5)
+        second = self.client.get(first.data['next'])
+        self.assertEqual(len(second.data['results']), 3)
+        self.assertIsNone(second.data['next'])
+
+    def test_comments_with_project(self):
+        issue = self.create_issue(self.project, self.author)
+        Comment.objects.create(issue=issue, author=self.contributor, name='Mien', description='-')
+        Comment.objects.create(issue=issue, author=self.author, name='Autre', description='-')
+        results = self.client.get(reverse('my-comments')).data['results']
+        self.assertEqual([(comment['name'], comment['project_id']) for comment in results],
+                         [('Mien', self.project.project_id)])
+
+
+class ChangeFeedTests(SoftDeskAPITestCase):
+    """
+    /api/projects/<id>/changes/ : créations, modifications et suppressions depuis un jeton, compactées par objet.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.url = reverse('project-changes', args=[self.project.project_id])
+
+    def changes(self, since):
+        response = self.client.get(self.url, {'since': since})
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_changes_since_token(self):
+        token = self.client.get(self.url).data['next']
+        issue = Issue.objects.create(project=self.project, author=self.author, title='Avant', description='-')
+        issue.title = 'Après'
+        issue.save()
+        comment = Comment.objects.create(issue=issue, author=self.author, name='Note', description='-')
+        Contributor.objects.filter(project=self.project).get().delete()
+
+        data = self.changes(token)
+        self.assertFalse(data['has_more'])
+        self.assertEqual(
+            [(change['type'], change['id'], change['action']) for change in data['changes']],
+            [('issue', issue.issue_id, 'create'), ('comment', comment.comment_id, 'create'),
+             ('project', self.project.project_id, 'update'), ('contributor', self.contributor.id, 'delete')],
+        )
+        self.assertEqual(data['changes'][0]['data']['title'], 'Après')
+        self.assertEqual(data['changes'][0]['data']['comment_count'], 1)
+        self.assertEqual(data['changes'][2]['data']['contributor_count'], 0)
+        self.assertIsNone(data['changes'][3]['data'])
+        self.assertEqual(self.changes(data['next'])['changes'], [])
+
+    def test_issue_deletion_covers_its_comments(self):
+        issue = Issue.objects.create(project=self.project, author=self.author, title='Issue', description='-')
+        Comment.objects.create(issue=issue, author=self.author, name='Note', description='-')
+        token = self.client.get(self.url).data['next']
+        issue.delete()
+        self.assertEqual([(change['type'], change['action']) for change in self.changes(token)['changes']],
+                         [('project', 'update'), ('issue', 'delete')])
+
+    def test_moved_issue_leaves_previous_project_log(self):
+        issue = Issue.objects.create(project=self.project, author=self.author, title='Issue', description='-')
+        comment = Comment.objects.create(issue=issue, author=self.author, name='Note', description='-')
+        other = Project.objects.create(name='Autre', description='-', project_type='Backend', author=self.author)
+        token = self.client.get(self.url).data['next']
+        other_token = self.client.get(reverse('project-changes', args=[other.project_id])).data['next']
+        issue.project = other
+        issue.save()
+        self.assertEqual([(change['type'], change['action']) for change in self.changes(token)['changes']],
+                         [('project', 'update'), ('issue', 'delete')])
+        other_changes = self.client.get(reverse('project-changes', args=[other.project_id]),
+                                        {'since': other_token}).data['changes']
+        self.assertEqual([(change['type'], change['id'], change['action']) for change in other_changes],
+                         [('project', other.project_id, 'update'), ('issue', issue.issue_id, 'create'),
+                          ('comment', comment.comment_id, 'create')])
+
+    def test_bulk_writes_are_logged(self):
+        token = self.client.get(self.url).data['next']
+        bulk_url = reverse('issues-bulk', args=[self.project.project_id])
+        created = self.client.post(bulk_url, [{'title': 'A', 'description': '-'}, {'title': 'B', 'description': '-'}],
+                                   format='json').data['results']
+        self.client.patch(bulk_url, [{'issue_id': created[0]['issue_id'], 'status': 'FINISHED'}], format='json')
+        changes = self.changes(token)['changes']
+        self.assertEqual([(change['id'], change['action']) for change in changes],
+                         [(created[1]['issue_id'], 'create'), (self.project.project_id, 'update'),
+                          (created[0]['issue_id'], 'create')])
+        self.assertEqual(changes[1]['data']['open_issue_count'], 1)
+        self.assertEqual(changes[2]['data']['status'], 'FINISHED')
+
+    def test_compaction_and_retention(self):
+        token = self.client.get(self.url).data['next']
+        issue = Issue.objects.create(project=self.project, author=self.author, title='Issue', description='-')
+        for status in ('IN_PROGRESS', 'FINISHED'):
+            issue.status = status
+            issue.save()
+        before = self.changes(token)['changes']
+        call_command('compact_changes', stdout=io.StringIO())
+        self.assertEqual(Change.objects.filter(object_type='issue', object_id=str(issue.issue_id)).count(), 1)
+        self.assertEqual([(change['id'], change['data']) for change in self.changes(token)['changes']],
+                         [(change['id'], change['data']) for change in before])
+
+        Change.objects.update(created_time=timezone.now() - timedelta(days=31))
+        call_command('compact_changes', days=30, stdout=io.StringIO())
+        self.assertFalse(Change.objects.exists())
+        self.assertEqual(self.client.get(self.url, {'since': token}).status_code, 410)
+        head = self.client.get(self.url).data['next']
+        self.assertEqual(self.changes(head)['changes'], [])
+
+    def test_invalid_token_and_outsider(self):
+        self.assertEqual(self.client.get(self.url, {'since': 'abc'}).status_code, 400)
+        self.client.force_authenticate(user=create_user('outsider'))
+        self.assertEqual(self.client.get(self.url, {'since': 0}).status_code, 403)
+
+
+class EventStreamTests(SoftDeskAPITestCase):
+    """
+    Flux server-sent events d'un projet : événements poussés à la validation, reprise depuis le journal.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.url = reverse('async-project-events', args=[self.project.project_id])
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(self.contributor)}')
+
+    def read_stream(self, response):
+        async def collect():
+            return b''.join([chunk async for chunk in response.streaming_content]).decode()
+        return async_to_sync(collect)()
+
+    def test_replay_since_last_event_id(self):
+        token = Change.objects.latest('id').id
+        issue = Issue.objects.create(project=self.project, author=self.author, title='Issue', description='-')
+        comment = Comment.objects.create(issue=issue, author=self.author, name='Note', description='-')
+        Contributor.objects.create(project=self.project, contributor=create_user('other'))
+
+        response = self.client.get(self.url, {'timeout': 0}, HTTP_LAST_EVENT_ID=str(token))
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        events = [event for event in self.read_stream(response).split('\n\n') if event.startswith('id:')]
+        self.assertEqual([event.split('\n')[1] for event in events], ['event: issue', 'event: comment'])
+        self.assertIn(f'"id": "{comment.comment_id}"', events[1])
+
+    def test_reset_when_token_expired(self):
+        ChangeHorizon.advance(Change.objects.latest('id').id)
+        response = self.client.get(self.url, {'timeout': 0, 'last_event_id': 0})
+        self.assertIn('event: reset', self.read_stream(response))
+        self.assertEqual(self.client.get(self.url, {'last_event_id': 'x'}).status_code, 400)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(create_user("outsider"))}')
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+
+    async def test_events_pushed_on_commit(self):
+        response = await self.async_client.get(
+            self.url, {'timeout': 5}, headers={'Authorization': f'Bearer {AccessToken.for_user(self.contributor)}'}
+        )
+        stream = aiter(response.streaming_content)
+        self.assertTrue((await anext(stream)).startswith(b'retry:'))
+        pending = asyncio.ensure_future(anext(stream))
+
+        def create_issue():
+            with self.captureOnCommitCallbacks(execute=True):
+                return Issue.objects.create(project=self.project, author=self.author, title='Live', description='-')
+
+        issue = await sync_to_async(create_issue)()
+        event = (await asyncio.wait_for(pending, 5)).decode()
+        self.assertIn('event: issue', event)
+        self.assertIn(f'"id": {issue.issue_id}', event)
+        self.assertIn('"action": "create"', event)
+
+    async def test_hub_fan_out_and_slow_subscribers(self):
+        event_hub = EventHub(max_pending=2)
+        subscriptions = [event_hub.subscribe('P') for _ in range(2000)]
+        await asyncio.to_thread(event_hub.dispatch, [event_message('P', 'issue', 1, 'create', 1)])
+        await asyncio.sleep(0)
+        self.assertTrue(all(subscription.qsize() == 1 for subscription in subscriptions))
+
+        for token in (2, 3):
+            event_hub.dispatch([event_message('P', 'issue', 1, 'update', token)])
+            await asyncio.sleep(0)
+        # La file pleine reçoit None et l'abonné est désinscrit : il reprendra depuis le journal.
+        self.assertEqual(len(event_hub), 0)
+        self.assertIsNone([subscriptions[0].get_nowait() for _ in range(3)][-1])
+
+    async def test_local_broker_delivers_through_its_thread(self):
+        subscription = hub.subscribe('P')
+        try:
+            LocalBroker().publish([event_message('P', 'comment', 'abc', 'delete', 7)])
+            message = await asyncio.wait_for(subscription.get(), 5)
+        finally:
+            hub.unsubscribe('P', subscription)
+        self.assertEqual(message, event_message('P', 'comment', 'abc', 'delete', 7))
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class BenchmarkCommandsTests(TestCase):
+    """
+    seed_data génère les volumes demandés ; benchmark_api couvre toutes les URL sans modifier la base.
+    """
+
+    def seed(self, **options):
+        call_command('seed_data', users=6, projects=3, contributors=2, issues=4, comments=2, stdout=io.StringIO(),
+                     **options)
+
+    def test_seed_data_creates_requested_volumes(self):
+        self.seed()
+        self.assertEqual(CustomUser.objects.count(), 6)
+        self.assertEqual(Contributor.objects.count(), 6)
+        self.assertEqual(Issue.objects.count(), 12)
+        self.assertEqual(Comment.objects.count(), 24)
+        # Les identifiants alloués par lot restent cohérents avec les compteurs.
+        project = Project.objects.order_by('project_id').first()
+        duplicate = Project.objects.create(name=project.name, description='Projet', project_type='Backend')
+        self.assertEqual(Project.objects.filter(project_id=duplicate.project_id).count(), 1)
+        # Les compteurs dénormalisés sont calculés avant l'insertion.
+        self.assertFalse(any(reconcile_counters().values()))
+
+    def test_benchmark_covers_every_url_and_rolls_back_writes(self):
+        # La suppression d'un utilisateur réaffecte ses contenus à un administrateur.
+        CustomUser.objects.create_superuser(username='admin', password='password', date_of_birth='1990-01-01')
+        self.seed()
+        models = (CustomUser, Project, Contributor, Issue, Comment)
+        counts = [model.objects.count() for model in models]
+        with tempfile.NamedTemporaryFile(suffix='.json') as output:
+            call_command('benchmark_api', iterations=1, warmup=0, output=output.name, stdout=io.StringIO())
+            report = json.load(output)
+        self.assertEqual(report['meta']['uncovered_urls'], [])
+        self.assertEqual(report['meta']['volumes']['issues'], 12)
+        for name, result in report['results'].items():
+            with self.subTest(scenario=name):
+                self.assertTrue(all(int(code) < 500 for code in result['status_codes']), result['status_codes'])
+                self.assertGreater(result['p50_ms'], 0)
+        self.assertEqual(counts, [model.objects.count() for model in models])
@@ -1,28 +1,67 @@
+from django.db import transaction
+from django.db.models import Case, F, Prefetch, Q, Value, When
+from django.http import Http404, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
-from rest_framework import viewsets, status
+from django.utils import timezone
+from rest_framework import generics, viewsets, status
+from rest_framework.views import APIView
 from rest_framework.response import Response
-from rest_framework.exceptions import PermissionDenied
-from .models import Project, Issue, Comment, Contributor
+from rest_framework.exceptions import PermissionDenied, ValidationError
+from rest_framework.fields import IntegerField
+from rest_framework.filters import OrderingFilter
+from rest_framework.settings import api_settings
+from authentication.models import CustomUser
+from .models import Project, Issue, Comment, Contributor, Change, ChangeHorizon
 from .serializers import (
     ProjectSerializer,
     ProjectCreateUpdateSerializer,
     ProjectListSerializer,
     ContributorSerializer,
     IssueSerializer,
+    IssueBulkCreateSerializer,
+    IssueBulkUpdateSerializer,
     CommentSerializer,
+    UserCommentSerializer,
 )
 from .permissions import IsAuthor, IsContributor, IsAuthenticated
+from .membership import get_membership, member_projects_q
+from .pagination import KeysetPagination, OptInKeysetPaginationMixin
+from .parsers import NDJSONParser
+from .exports import EXPORT_FORMATS, iter_project_records
+from .search import search
+from .stats import project_stats
+from .filters import IssueFilterBackend, get_requested_fields
+from .conditional import ConditionalGetMixin, collection_validator
+from .counters import adjust_project_counters, recount_open_issues
+from .changes import head_token, object_key, parse_object_id, read_changes, record_changes
+from .response_cache import CachedResponseMixin, get_response_cache, invalidate_response_cache
+from .instrumentation import registry as performance_registry
 from authentication.permissions import IsAdmin
 
 
-class ProjectListViewSet(viewsets.ModelViewSet):
+class ProjectListViewSet(ConditionalGetMixin, OptInKeysetPaginationMixin, viewsets.ModelViewSet):
     """
     Permet de voir la liste des Projets existants et d'en créer un nouveau.
     """
     permission_classes = [IsAuthenticated]
+    filter_backends = [OrderingFilter]
+    # Tri par activité sur les compteurs dénormalisés, sans agrégat.
+    ordering_fields = ['created_time', 'updated_time', 'issue_count', 'open_issue_count', 'contributor_count']
+    ordering = ['-created_time']
 
     def get_queryset(self):
-        return Project.objects.all().order_by('-created_time')
+        # Auteur et contributeurs chargés en un nombre fixe de requêtes, quelle que soit la taille de la page.
+        return (
+            Project.objects.all()
+            .select_related('author')
+            .prefetch_related('contributors')
+            .order_by('-created_time')
+        )
+
+    def get_validators(self):
+        if self.action == 'list':
+            return [collection_validator(Project.objects.all())]
+        return None
 
     def get_serializer_class(self):
         if self.action == 'list':
@@ -39,7 +78,7 @@ class ProjectListViewSet(viewsets.ModelViewSet):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-class ProjectDetailViewSet(viewsets.ModelViewSet):
+class ProjectDetailViewSet(ConditionalGetMixin, CachedResponseMixin, viewsets.ModelViewSet):
     """
     Permet de gérer les opérations CRUD sur le modèle Project.
     Create : Créer un projet.
@@ -53,7 +92,28 @@ class ProjectDetailViewSet(viewsets.ModelViewSet):
     lookup_field = 'project_id'
 
     def get_queryset(self):
-        return self.queryset
+        return (
+            self.queryset
+            .select_related('author')
+            .prefetch_related('contributors')
+        )
+
+    def get_validators(self):
+        if self.action == 'retrieve':
+            project_id = self.kwargs.get('project_id')
+            return [
+                collection_validator(Project.objects.filter(project_id=project_id)),
+                collection_validator(Issue.objects.filter(project_id=project_id)),
+            ]
+        return None
+
+    def get_cache_scope(self):
+        return self.kwargs.get('project_id') if self.action == 'retrieve' else None
+
+    def get_cache_role(self):
+        if self.request.user.is_staff:
+            return 'admin'
+        return get_membership(self.request, self.kwargs.get('project_id')).role
 
     def create(self, request, *args, **kwargs):
         serializer = ProjectCreateUpdateSerializer(data=request.data)
@@ -93,20 +153,18 @@ class ContributorViewSet(viewsets.ModelViewSet):
         return Contributor.objects.filter(project_id=project_id)
 
     def perform_create(self, serializer):
-        project_id = self.kwargs.get('project_id')
-        project = get_object_or_404(Project, project_id=project_id)
-        serializer.save(project=project)
+        membership = get_membership(self.request, self.kwargs.get('project_id'))
+        serializer.save(project=membership.project)
 
     def create(self, request, *args, **kwargs):
-        project_id = self.kwargs.get('project_id')
-        project = get_object_or_404(Project, project_id=project_id)
+        membership = get_membership(request, self.kwargs.get('project_id'))
 
-        if request.user != project.author:
+        if not membership.is_author:
             raise PermissionDenied("Seul l'auteur du projet peut ajouter des contributeurs.")
 
         serializer = self.get_serializer(data=request.data)
         if serializer.is_valid():
-            serializer.save(project=project)
+            serializer.save(project=membership.project)
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -119,21 +177,67 @@ class ContributorViewSet(viewsets.ModelViewSet):
         raise PermissionDenied("Seul l'auteur du projet peut supprimer des contributeurs.")
 
 
-class IssueViewSet(viewsets.ModelViewSet):
+def with_issue_read_relations(queryset, requested):
+    """
+    Ajoute au queryset des issues ce qu'IssueSerializer lit, uniquement pour les champs demandés :
+    l'auteur par jointure et un seul préchargement pour les noms des commentaires.
+    """
+    if requested is None or 'author' in requested:
+        queryset = queryset.select_related('author')
+    if requested is None or 'comment_titles' in requested:
+        queryset = queryset.prefetch_related(Prefetch(
+            'comments',
+            queryset=Comment.objects.only('comment_id', 'name', 'issue_id').order_by('created_time', 'pk'),
+            to_attr='prefetched_comments',
+        ))
+    return queryset
+
+
+class IssueViewSet(ConditionalGetMixin, CachedResponseMixin, OptInKeysetPaginationMixin, viewsets.ModelViewSet):
     """
     Gère les opérations CRUD sur le modèle Issue.
     """
     serializer_class = IssueSerializer
     permission_classes = [IsAuthor | IsContributor]
+    parser_classes = list(api_settings.DEFAULT_PARSER_CLASSES) + [NDJSONParser]
+    filter_backends = [IssueFilterBackend, OrderingFilter]
+    ordering_fields = ['created_time', 'issue_id', 'title', 'priority', 'status', 'tag']
+    ordering = ['-created_time', '-issue_id']
     lookup_field = 'issue_id'
+    BULK_MAX_ITEMS = 10_000
+    BULK_CHUNK_SIZE = 500
 
     def get_queryset(self):
         project_id = self.kwargs.get('project_id')
-        return Issue.objects.filter(project_id=project_id)
+        queryset = Issue.objects.filter(project_id=project_id)
+        if self.action in ['list', 'retrieve']:
+            queryset = with_issue_read_relations(queryset, get_requested_fields(self.request))
+        return queryset
 
-    def create(self, request, *args, **kwargs):
+    def get_validators(self):
         project_id = self.kwargs.get('project_id')
-        project = get_object_or_404(Project, project_id=project_id)
+        if self.action == 'list':
+            validators = [collection_validator(Issue.objects.filter(project_id=project_id))]
+            requested = get_requested_fields(self.request)
+            if requested is None or requested & {'comment_count', 'comment_titles'}:
+                validators.append(collection_validator(Comment.objects.filter(issue__project_id=project_id)))
+            return validators
+        if self.action == 'retrieve':
+            issue_id = self.kwargs.get('issue_id')
+            return [
+                collection_validator(Issue.objects.filter(project_id=project_id, issue_id=issue_id)),
+                collection_validator(Comment.objects.filter(issue_id=issue_id)),
+            ]
+        return None
+
+    def get_cache_scope(self):
+        return self.kwargs.get('project_id') if self.action == 'list' else None
+
+    def get_cache_role(self):
+        return get_membership(self.request, self.kwargs.get('project_id')).role
+
+    def create(self, request, *args, **kwargs):
+        project = get_membership(request, self.kwargs.get('project_id')).project
 
         serializer = self.get_serializer(data=request.data)
         if serializer.is_valid():
@@ -141,6 +245,157 @@ class IssueViewSet(viewsets.ModelViewSet):
             return Response({"message": "L'Issue a été créée avec succès."}, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+    def get_bulk_items(self, request):
+        """
+        Retourne les éléments d'un corps de requête en masse (tableau JSON ou NDJSON).
+        """
+        items = request.data
+        if not isinstance(items, list) or not items:
+            raise ValidationError("Le corps doit être un tableau JSON ou un flux NDJSON non vide.")
+        if len(items) > self.BULK_MAX_ITEMS:
+            raise ValidationError(f"Un lot ne peut pas dépasser {self.BULK_MAX_ITEMS} éléments.")
+        return items
+
+    def get_bulk_context(self, items):
+        """
+        Contexte de validation partagé par tout le lot : les utilisateurs assignables sont chargés en une requête.
+        """
+        # Même conversion que le champ assigned_to des serializers du lot ("5" vaut 5).
+        assigned_to = IntegerField()
+        user_ids = set()
+        for item in items:
+            if isinstance(item, dict) and item.get('assigned_to') is not None:
+                try:
+                    user_ids.add(assigned_to.to_internal_value(item['assigned_to']))
+                except ValidationError:
+                    pass
+        context = self.get_serializer_context()
+        context['user_ids'] = set(CustomUser.objects.filter(id__in=user_ids).values_list('id', flat=True))
+        return context
+
+    def validate_bulk_items(self, serializer_class, items):
+        """
+        Valide chaque élément avec une même instance de serializer.
+        Retourne les données valides indexées et les résultats d'erreur par élément.
+        """
+        serializer = serializer_class(context=self.get_bulk_context(items))
+        valid, results = [], [None] * len(items)
+        for index, item in enumerate(items):
+            try:
+                valid.append((index, serializer.run_validation(item)))
+            except ValidationError as exc:
+                results[index] = {'index': index, 'status': status.HTTP_400_BAD_REQUEST, 'errors': exc.detail}
+        return valid, results
+
+    def bulk_response(self, results, success_status):
+        """
+        Réponse 2xx si tous les éléments ont réussi, 400 si aucun, 207 sinon.
+        """
+        succeeded = sum(1 for result in results if result['status'] == success_status)
+        if succeeded == len(results):
+            response_status = success_status
+        elif not succeeded:
+            response_status = status.HTTP_400_BAD_REQUEST
+        else:
+            response_status = status.HTTP_207_MULTI_STATUS
+        return Response({'results': results}, status=response_status)
+
+    def bulk_create(self, request, *args, **kwargs):
+        """
+        Crée un lot d'issues : validation en une passe puis insertion par bulk_create en paquets.
+        """
+        project = get_membership(request, self.kwargs.get('project_id')).project
+        items = self.get_bulk_items(request)
+        valid, results = self.validate_bulk_items(IssueBulkCreateSerializer, items)
+
+        now = timezone.now()
+        issues = [
+            Issue(
+                project=project,
+                author=request.user,
+                assigned_to_id=data.pop('assigned_to', None),
+                finished_time=now if data.get('status') == 'FINISHED' else None,
+                **data
+            )
+            for _, data in valid
+        ]
+        with transaction.atomic():
+            Issue.objects.bulk_create(issues, batch_size=self.BULK_CHUNK_SIZE)
+            # Comme count_saved_issue : les issues créées FINISHED le sont à leur date de création.
+            finished = [issue for issue in issues if issue.finished_time is not None]
+            if finished:
+                Issue.objects.filter(pk__in=[issue.pk for issue in finished]).update(finished_time=F('created_time'))
+                for issue in finished:
+                    issue.finished_time = issue.created_time
+            # bulk_create n'émet pas post_save.
+            adjust_project_counters(
+                project.project_id,
+                issue_count=len(issues),
+                open_issue_count=sum(issue.is_open for issue in issues),
+            )
+            record_changes(
+                'issue', [(project.project_id, issue.issue_id) for issue in issues], Change.CREATE,
+                batch_size=self.BULK_CHUNK_SIZE,
+            )
+            invalidate_response_cache(project.project_id)
+
+        for (index, _), issue in zip(valid, issues):
+            results[index] = {'index': index, 'status': status.HTTP_201_CREATED, 'issue_id': issue.issue_id}
+        return self.bulk_response(results, status.HTTP_201_CREATED)
+
+    def bulk_update(self, request, *args, **kwargs):
+        """
+        Modifie statut, priorité ou assignation d'un lot d'issues.
+        Les éléments portant les mêmes modifications sont appliqués par un seul UPDATE.
+        """
+        items = self.get_bulk_items(request)
+        valid, results = self.validate_bulk_items(IssueBulkUpdateSerializer, items)
+
+        issue_ids = [data['issue_id'] for _, data in valid]
+        authors = dict(
+            Issue.objects.filter(project_id=self.kwargs.get('project_id'), issue_id__in=issue_ids)
+            .values_list('issue_id', 'author_id')
+        )
+        groups = {}
+        for index, data in valid:
+            issue_id = data.pop('issue_id')
+            if issue_id not in authors:
+                results[index] = {'index': index, 'status': status.HTTP_404_NOT_FOUND, 'issue_id': issue_id}
+            elif authors[issue_id] != request.user.id:
+                results[index] = {'index': index, 'status': status.HTTP_403_FORBIDDEN, 'issue_id': issue_id}
+            else:
+                if 'assigned_to' in data:
+                    data['assigned_to_id'] = data.pop('assigned_to')
+                groups.setdefault(tuple(sorted(data.items())), []).append((index, issue_id))
+
+        now = timezone.now()
+        with transaction.atomic():
+            for changes, members in groups.items():
+                ids = [issue_id for _, issue_id in members]
+                changes = dict(changes)
+                if changes.get('status') == 'FINISHED':
+                    # Les issues déjà terminées gardent leur date de passage à FINISHED.
+                    changes['finished_time'] = Case(When(status='FINISHED', then='finished_time'), default=Value(now))
+                elif 'status' in changes:
+                    changes['finished_time'] = None
+                for start in range(0, len(ids), self.BULK_CHUNK_SIZE):
+                    Issue.objects.filter(issue_id__in=ids[start:start + self.BULK_CHUNK_SIZE]).update(
+                        updated_time=now, **changes
+                    )
+                for index, issue_id in members:
+                    results[index] = {'index': index, 'status': status.HTTP_200_OK, 'issue_id': issue_id}
+            if groups:
+                # update() n'émet pas post_save.
+                project_id = self.kwargs.get('project_id')
+                if any('status' in dict(changes) for changes in groups):
+                    recount_open_issues(project_id)
+                record_changes(
+                    'issue', [(project_id, issue_id) for members in groups.values() for _, issue_id in members],
+                    Change.UPDATE, batch_size=self.BULK_CHUNK_SIZE,
+                )
+                invalidate_response_cache(project_id)
+        return self.bulk_response(results, status.HTTP_200_OK)
+
     def update(self, request, *args, **kwargs):
         instance = self.get_object()
         if request.user == instance.author:
@@ -159,7 +414,7 @@ class IssueViewSet(viewsets.ModelViewSet):
         raise PermissionDenied("Seul l'auteur de l'issue peut la supprimer.")
 
 
-class CommentViewSet(viewsets.ModelViewSet):
+class CommentViewSet(ConditionalGetMixin, OptInKeysetPaginationMixin, viewsets.ModelViewSet):
     """
     Gère les opérations CRUD sur le modèle Comment.
     """
@@ -171,6 +426,16 @@ class CommentViewSet(viewsets.ModelViewSet):
         issue_id = self.kwargs.get('issue_id')
         return self.queryset.filter(issue_id=issue_id)
 
+    def get_validators(self):
+        issue_id = self.kwargs.get('issue_id')
+        if self.action == 'list':
+            return [collection_validator(Comment.objects.filter(issue_id=issue_id))]
+        if self.action == 'retrieve':
+            return [collection_validator(
+                Comment.objects.filter(issue_id=issue_id, comment_id=self.kwargs.get('comment_id'))
+            )]
+        return None
+
     def create(self, request, *args, **kwargs):
         issue_id = self.kwargs.get('issue_id')
         issue = get_object_or_404(Issue, issue_id=issue_id)
@@ -198,3 +463,204 @@ class CommentViewSet(viewsets.ModelViewSet):
             return Response({"message": "Le commentaire a été supprimé avec succès."},
                             status=status.HTTP_204_NO_CONTENT)
         raise PermissionDenied("Seul l'auteur du commentaire peut le supprimer.")
+
+
+class UserIssueListView(generics.ListAPIView):
+    """
+    Issues assignées à l'utilisateur ou créées par lui, dans tous les projets dont il est auteur ou contributeur.
+
+    Une seule requête paginée par curseur, quel que soit le nombre de projets ; `?role=assigned|authored`
+    restreint le lien avec l'utilisateur, et les filtres et champs d'IssueViewSet s'appliquent.
+    """
+    serializer_class = IssueSerializer
+    permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
+    filter_backends = [IssueFilterBackend]
+    ROLES = {
+        'assigned': lambda user: Q(assigned_to=user),
+        'authored': lambda user: Q(author=user),
+    }
+
+    def get_queryset(self):
+        user = self.request.user
+        role = self.request.query_params.get('role')
+        if role is not None and role not in self.ROLES:
+            raise ValidationError({'role': f"Valeurs possibles : {', '.join(self.ROLES)}."})
+        link = self.ROLES[role](user) if role else Q(assigned_to=user) | Q(author=user)
+        queryset = Issue.objects.filter(link).filter(member_projects_q(user))
+        return with_issue_read_relations(queryset, get_requested_fields(self.request))
+
+
+class UserCommentListView(generics.ListAPIView):
+    """
+    Commentaires de l'utilisateur dans tous les projets dont il est auteur ou contributeur, paginés par curseur.
+    """
+    serializer_class = UserCommentSerializer
+    permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
+
+    def get_queryset(self):
+        user = self.request.user
+        return (
+            Comment.objects.filter(author=user)
+            .filter(member_projects_q(user, 'issue__project'))
+            .annotate(project_id=F('issue__project_id'))
+        )
+
+
+class ProjectExportView(APIView):
+    """
+    Exporte en flux les issues d'un projet et leurs commentaires, au format NDJSON ou CSV.
+    """
+    permission_classes = [IsAuthor | IsContributor]
+
+    def get(self, request, project_id, export_format):
+        if export_format not in EXPORT_FORMATS:
+            raise Http404("Format d'export inconnu.")
+        serialize, content_type = EXPORT_FORMATS[export_format]
+        response = StreamingHttpResponse(serialize(iter_project_records(project_id)), content_type=content_type)
+        response['Content-Disposition'] = f'attachment; filename="{project_id}.{export_format}"'
+        return response
+
+
+class ProjectStatsView(CachedResponseMixin, APIView):
+    """
+    Tableau de bord d'un projet, calculé par agrégats groupés et mis en cache jusqu'à la prochaine
+    modification de ses issues, au plus CACHE_TIMEOUT secondes : la fenêtre des créations par jour
+    (`?days=<n>`) est relative à l'heure courante.
+    """
+    permission_classes = [IsAuthor | IsContributor | IsAdmin]
+    DEFAULT_DAYS = 30
+    MAX_DAYS = 365
+    CACHE_TIMEOUT = 300
+
+    def get_cache_scope(self):
+        return self.kwargs.get('project_id')
+
+    def get_cache_timeout(self):
+        return self.CACHE_TIMEOUT
+
+    def get(self, request, project_id):
+        return self.cached_response(request, self.stats, project_id)
+
+    def stats(self, request, project_id):
+        if not Project.objects.filter(pk=project_id).exists():
+            # Les administrateurs passent les permissions sans que le projet soit résolu.
+            raise Http404
+        try:
+            days = int(request.query_params.get('days', self.DEFAULT_DAYS))
+        except ValueError:
+            days = self.DEFAULT_DAYS
+        days = max(1, min(days, self.MAX_DAYS))
+        return Response(project_stats(project_id, days))
+
+
+class ProjectChangesView(APIView):
+    """
+    Modifications d'un projet depuis un jeton (`?since=<jeton>`) : créations et modifications avec l'état actuel
+    de l'objet, suppressions sans données. Sans `since`, seul le jeton courant est retourné : le demander avant
+    un téléchargement complet. Un jeton plus ancien que la rétention du journal donne 410 (resynchronisation).
+    """
+    permission_classes = [IsAuthor | IsContributor | IsAdmin]
+    PAGE_SIZE = 500
+
+    def get(self, request, project_id):
+        since = request.query_params.get('since')
+        if since is None:
+            return Response({'next': head_token(project_id), 'has_more': False, 'changes': []})
+        try:
+            since = int(since)
+        except ValueError:
+            since = -1
+        if since < 0:
+            raise ValidationError({'since': "Jeton invalide."})
+        if since < ChangeHorizon.current():
+            return Response({'detail': "Jeton expiré : une synchronisation complète est nécessaire."},
+                            status=status.HTTP_410_GONE)
+
+        changes, next_token, has_more = read_changes(project_id, since, self.PAGE_SIZE)
+        current = self.serialize_objects(project_id, changes)
+        for change in changes:
+            data = current.get((change['type'], change['id']))
+            if data is None:
+                # Supprimé après la dernière entrée lue, ou avec son issue : la suppression est transmise.
+                change['action'] = Change.DELETE
+            change['data'] = data
+            change['id'] = parse_object_id(change['type'], change['id'])
+        return Response({'next': next_token, 'has_more': has_more, 'changes': changes})
+
+    def get_objects(self, project_id, object_type, ids):
+        if object_type == 'project':
+            return Project.objects.filter(pk=project_id).select_related('author').prefetch_related('contributors')
+        if object_type == 'contributor':
+            return Contributor.objects.filter(project_id=project_id, contributor_id__in=ids).select_related(
+                'contributor'
+            )
+        if object_type == 'issue':
+            return with_issue_read_relations(Issue.objects.filter(project_id=project_id, issue_id__in=ids), None)
+        return Comment.objects.filter(issue__project_id=project_id, comment_id__in=ids)
+
+    def serialize_objects(self, project_id, changes):
+        """
+        État actuel des objets créés ou modifiés, lu en une requête par type d'objet et indexé par (type, id).
+        """
+        serializers = {
+            'project': ProjectSerializer,
+            'contributor': ContributorSerializer,
+            'issue': IssueSerializer,
+            'comment': CommentSerializer,
+        }
+        ids = {}
+        for change in changes:
+            if change['action'] != Change.DELETE:
+                ids.setdefault(change['type'], []).append(change['id'])
+        current = {}
+        for object_type, object_ids in ids.items():
+            # Un seul serializer par type : l'instancier par objet coûterait plus que les requêtes.
+            objects = list(self.get_objects(project_id, object_type, object_ids))
+            data = serializers[object_type](objects, many=True, context={'request': self.request}).data
+            current.update(zip(map(object_key, objects), data))
+        return current
+
+
+class SearchView(APIView):
+    """
+    Recherche plein texte dans les issues et commentaires des projets accessibles à l'utilisateur.
+    """
+    permission_classes = [IsAuthenticated]
+    DEFAULT_LIMIT = 20
+    MAX_LIMIT = 50
+
+    def get(self, request):
+        try:
+            limit = int(request.query_params.get('limit', self.DEFAULT_LIMIT))
+        except ValueError:
+            limit = self.DEFAULT_LIMIT
+        limit = max(1, min(limit, self.MAX_LIMIT))
+        return Response({'results': search(request.user, request.query_params.get('q', ''), limit)})
+
+
+class ResponseCacheStatsView(APIView):
+    """
+    Expose les compteurs du cache de réponses (succès, échecs, évictions, entrées) aux administrateurs.
+    """
+    permission_classes = [IsAdmin]
+
+    def get(self, request):
+        cache = get_response_cache()
+        return Response(cache.stats() if cache is not None else {'backend': None})
+
+
+class PerformanceStatsView(APIView):
+    """
+    Expose aux administrateurs les histogrammes de performance par point de terminaison (PerformanceMiddleware).
+    DELETE remet les compteurs à zéro.
+    """
+    permission_classes = [IsAdmin]
+
+    def get(self, request):
+        return Response(performance_registry.snapshot())
+
+    def delete(self, request):
+        performance_registry.reset()
+        return Response(status=status.HTTP_204_NO_CONTENT)